@@ -0,0 +1,229 @@
+#!/usr/bin/python
+
+"""
+airSuck by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Runs the connectors, the SSR and AIS handlers, the state engines, and the MongoDB dumpers in one process for small installations instead of a supervisor program for each of them. With connPub['transport'] set to "local" they hand each other data through bounded in-process queues, and Redis is only used for the state engine hashes and for publishing to clients outside the process. airSuckSettings picks which pieces run.
+"""
+
+############
+# Imports. #
+############
+
+try:
+    import config
+except:
+    raise IOError("No configuration present. Please copy config/config.py to the airSuck folder and edit it.")
+
+import sys
+import time
+import threading
+import traceback
+from libAirSuck import asLog
+from libAirSuck import asLocalQueue
+from libAirSuck import airSuckUtil
+from libAirSuck import handler1090
+from libAirSuck import handlerAIS
+
+
+##########
+# Config #
+##########
+
+# Pieces we know how to run in the order we start them, so the state engines and MongoDB dumpers are listening before the connectors send anything.
+pieceOrder = ["mongoDump", "stateMongoDump", "ssrStateEngine", "aisStateEngine", "dump1090ConnClt", "aisConnector", "airSuckServer"]
+
+# Settings that turn each piece on or off.
+pieceSettings = {
+    'dump1090ConnClt': config.d1090ConnSettings,
+    'aisConnector': config.aisConnSettings,
+    'airSuckServer': config.airSuckSrvSettings,
+    'ssrStateEngine': config.ssrStateEngine,
+    'aisStateEngine': config.aisStateEngine,
+    'mongoDump': config.connMongo,
+    'stateMongoDump': config.stateMongo
+}
+
+# Handlers shared by the connectors.
+h1090 = None
+hAIS = None
+
+
+############
+# Handlers #
+############
+
+def getH1090():
+    """
+    Get the SSR handler shared by dump1090ConnClt and airSuckServer, setting it up if we don't have one yet. Its deduplicator, parse cache, and publisher are locked, so all of their threads can use it at once.
+    """
+    
+    global h1090
+    
+    if h1090 is None:
+        h1090 = handler1090(config.airSuckSettings['logMode'])
+        h1090.setDebug(config.d1090ConnSettings['debug'])
+    
+    return h1090
+
+def getHAIS():
+    """
+    Get the AIS handler, setting it up if we don't have one yet.
+    """
+    
+    global hAIS
+    
+    if hAIS is None:
+        hAIS = handlerAIS(config.airSuckSettings['logMode'], config.aisConnSettings['aisEnqueue'])
+        hAIS.setDebug(config.aisConnSettings['debug'])
+    
+    return hAIS
+
+
+##########
+# Pieces #
+##########
+
+# Each of these imports its piece, hands it our logger and shared handlers, and returns a list of threads to start. We only import the pieces we run so we don't need pymongo without the MongoDB dumpers.
+
+def startDump1090ConnClt():
+    import dump1090ConnClt
+    
+    dump1090ConnClt.logger = logger
+    dump1090ConnClt.h1090 = getH1090()
+    
+    return [dump1090ConnClt.dataSource(thisName, connData) for thisName, connData in config.d1090ConnSettings['connClientList'].iteritems()]
+
+def startAISConnector():
+    import aisConnector
+    
+    aisConnector.logger = logger
+    aisConnector.hAIS = getHAIS()
+    
+    return [aisConnector.dataSource(thisName, config.aisConnSettings['myName'], connData, config.aisConnSettings['aisEnqueue']) for thisName, connData in config.aisConnSettings['connClientList'].iteritems()]
+
+def startAirSuckServer():
+    import airSuckServer
+    
+    airSuckServer.logger = logger
+    airSuckServer.h1090 = getH1090()
+    
+    return [threading.Thread(target=airSuckServer.airSuckServer().run)]
+
+def startSSRStateEngine():
+    import ssrStateEngine
+    
+    ssrStateEngine.logger = logger
+    
+    return [ssrStateEngine.SubListener([config.connPub['qName']])]
+
+def startAISStateEngine():
+    import aisStateEngine
+    
+    aisStateEngine.logger = logger
+    
+    return [aisStateEngine.SubListener([config.connPub['qName']])]
+
+def startMongoDump():
+    import mongoDump
+    
+    return [threading.Thread(target=mongoDump.run)]
+
+def startStateMongoDump():
+    import stateMongoDump
+    
+    return [threading.Thread(target=stateMongoDump.run)]
+
+pieceStarters = {
+    'dump1090ConnClt': startDump1090ConnClt,
+    'aisConnector': startAISConnector,
+    'airSuckServer': startAirSuckServer,
+    'ssrStateEngine': startSSRStateEngine,
+    'aisStateEngine': startAISStateEngine,
+    'mongoDump': startMongoDump,
+    'stateMongoDump': startStateMongoDump
+}
+
+
+#########
+# Stats #
+#########
+
+def logStats():
+    """
+    Log how many messages are waiting in each local queue and how many each one dropped.
+    """
+    
+    for thisChannel, stats in sorted(asLocalQueue().stats().iteritems()):
+        logger.log("Local queue %s: %s waiting, %s dropped." %(thisChannel, stats[0], stats[1]))
+
+
+#######################
+# Main execution body #
+#######################
+
+# If I've been called for execution...
+if __name__ == "__main__":
+    
+    # Set up the logger.
+    logger = asLog(config.airSuckSettings['logMode'])
+    
+    logger.log("airSuck starting...")
+    
+    # Make sure we know every piece we're asked to run.
+    for thisPiece in config.airSuckSettings['run']:
+        if thisPiece not in pieceStarters:
+            raise ValueError("Valid airSuckSettings run list not specified. Please use any of %s." %", ".join(pieceOrder))
+    
+    if config.connPub['transport'] != "local":
+        logger.log("connPub['transport'] is \"%s\" so the connectors and state engines still talk through Redis." %config.connPub['transport'])
+    
+    # Shut down like we got a keyboard interrupt when supervisor stops us so every handler sends what it's holding.
+    airSuckUtil().interruptOnSigTerm()
+    
+    # Spin up our pieces, keeping track of the threads for each one.
+    pieceThreads = {}
+    
+    for thisPiece in pieceOrder:
+        if thisPiece in config.airSuckSettings['run']:
+            if pieceSettings[thisPiece]['enabled'] == True:
+                logger.log("Starting %s." %thisPiece)
+                
+                pieceThreads[thisPiece] = pieceStarters[thisPiece]()
+                
+                for thisThread in pieceThreads[thisPiece]:
+                    thisThread.daemon = True
+                    thisThread.start()
+            
+            else:
+                logger.log("%s not enabled in config." %thisPiece)
+    
+    try:
+        lastStats = time.time()
+        
+        # Fix bug that prevents keyboard interrupt from killing us, and log stats now and then.
+        while True:
+            time.sleep(10)
+            
+            if (config.airSuckSettings['statsSec'] > 0) and ((time.time() - lastStats) >= config.airSuckSettings['statsSec']):
+                logStats()
+                lastStats = time.time()
+    
+    except KeyboardInterrupt:
+        logger.log("airSuck shutting down.")
+        
+        # Let the MongoDB dumpers store what they're holding.
+        for thisPiece in ["mongoDump", "stateMongoDump"]:
+            if thisPiece in pieceThreads:
+                sys.modules[thisPiece].keepRunning = False
+                
+                for thisThread in pieceThreads[thisPiece]:
+                    thisThread.join(config.airSuckSettings['stopWaitSec'])
+    
+    except:
+        tb = traceback.format_exc()
+        logger.log("Caught unhandled exception.\n%s" %tb)
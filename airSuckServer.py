@@ -33,6 +33,7 @@ import traceback
 from libAirSuck import ssrParse
 from libAirSuck import asLog
 from libAirSuck import handler1090
+from libAirSuck import airSuckUtil
 from pprint import pprint
 
 ########################
@@ -461,6 +462,9 @@ if __name__ == "__main__":
 		# Configure the dump1090 handler's debug mode based on our configured mode.
 		h1090.setDebug(config.airSuckSrvSettings['debug'])
 		
+		# Shut down like we got a keyboard interrupt when supervisor stops us so h1090 sends what it's holding.
+		airSuckUtil().interruptOnSigTerm()
+		
 		# Create our connector object.
 		airSuckSrv = airSuckServer()
 		
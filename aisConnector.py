@@ -30,6 +30,7 @@ from pprint import pprint
 from libAirSuck import aisParse
 from libAirSuck import asLog
 from libAirSuck import handlerAIS
+from libAirSuck import airSuckUtil
 from pprint import pprint
 
 ##########
@@ -420,6 +421,9 @@ if __name__ == "__main__":
 		hAIS = handlerAIS(config.aisConnSettings['logMode'], enqueueOn)
 		hAIS.setDebug(config.aisConnSettings['debug'])
 		
+		# Shut down like we got a keyboard interrupt when supervisor stops us so hAIS sends what it's holding.
+		airSuckUtil().interruptOnSigTerm()
+		
 		# Threading setup
 		threadLock = threading.Lock()
 		threadList = []
@@ -17,7 +17,6 @@ try:
 except:
 	raise IOError("No configuration present. Please copy config/config.py to the airSuck folder and edit it.")
 
-import redis
 import time
 import json
 import threading
@@ -26,6 +25,10 @@ import datetime
 import traceback
 from libAirSuck import airSuckUtil
 from libAirSuck import asLog
+from libAirSuck import asConsumer
+from libAirSuck import asCodec
+from libAirSuck import asRedisPool
+from libAirSuck import asLocalQueue
 from pprint import pprint
 
 
@@ -45,15 +48,24 @@ class SubListener(threading.Thread):
         threading.Thread.__init__(self)
         self.__asu = airSuckUtil()
         
+        # Encodes and decodes queue messages.
+        self.__codec = asCodec(config.statePub['msgFormat'])
+        
         # Redis queues and entities
-        self.__psQ = redis.StrictRedis(host=config.connPub['host'], port=config.connPub['port'])
-        self.__sPsQ = redis.StrictRedis(host=config.statePub['host'], port=config.statePub['port'])
-        self.__sRQ = redis.StrictRedis(host=config.stateRel['host'], port=config.stateRel['port'])
-        self.__redHash = redis.StrictRedis(host=config.aisStateEngine['hashHost'], port=config.aisStateEngine['hashPort'])
+        redisPool = asRedisPool()
+        self.__sPsQ = redisPool.getRedis(config.statePub['host'], config.statePub['port'])
+        self.__sRQ = redisPool.getRedis(config.stateRel['host'], config.stateRel['port'])
+        self.__redHash = redisPool.getRedis(config.aisStateEngine['hashHost'], config.aisStateEngine['hashPort'])
+        
+        # When airSuck.py runs us stateMongoDump is in the same process.
+        self.__localQ = asLocalQueue()
+        
+        # Listen to the connector queue.
+        self.__consumer = asConsumer(channels, config.aisStateEngine['streamGroup'], config.aisStateEngine['streamConsumer'])
         
-        # Subscribe the the connector pub/sub queue.
-        self.__psObj = self.__psQ.pubsub() 
-        self.__psObj.subscribe(channels)
+        # Keep track of how many ring messages we lost since we last logged it.
+        self.__overrunLastTime = time.time()
+        self.__overrunLastCount = 0
         
         # Things we want to just forward to the state engine.
         # incoming name -> state engine name
@@ -307,11 +319,11 @@ class SubListener(threading.Thread):
         Put status data on a queue for processing
         """
         
-        # Debug print instead of dumping data onto another queue.
-        jsonData = json.dumps(statusData)
+        # Encode the data for the state queues.
+        encData = self.__codec.encode(statusData)
         
         # Publish the data on the queue.
-        self.__sPsQ.publish(config.statePub['qName'], jsonData)
+        self.__sPsQ.publish(config.statePub['qName'], encData)
         
         # If we actually want to store the state data in MongoDB...
         if config.stateMongo['enabled'] == True:
@@ -321,8 +333,12 @@ class SubListener(threading.Thread):
                 if popThing in statusData:
                     statusData.pop(popThing, None)
             
-            jsonData = json.dumps(statusData)
-            self.__sRQ.rpush(config.stateRel['qName'], jsonData)
+            encData = self.__codec.encode(statusData)
+            
+            if config.connPub['transport'] == "local":
+                self.__localQ.publish(config.stateRel['qName'], [encData])
+            else:
+                self.__sRQ.rpush(config.stateRel['qName'], encData)
             
         return
 
@@ -331,7 +347,7 @@ class SubListener(threading.Thread):
         aisJson = str(work['data'])
         
         # Get wrapped AIS data.
-        aisWrapped = json.loads(aisJson)
+        aisWrapped = self.__codec.decode(aisJson)
         
         # Make sure we got good data from json.loads
         if (type(aisWrapped) == dict):
@@ -364,9 +380,32 @@ class SubListener(threading.Thread):
                 # Enqueue processed state data.
                 self.enqueueData(self.updateState(aisWrapped['mmsi'], data))
     
+    def __logOverruns(self):
+        """
+        Log how many ring messages per second we lost because we fell behind every connRing['overrunStatsSec'] seconds.
+        """
+        
+        # Are we supposed to log stats? Only rings can overrun.
+        if (config.connPub['transport'] == "ring") and (config.connRing['overrunStatsSec'] > 0):
+            # How long has it been?
+            elapsed = time.time() - self.__overrunLastTime
+            
+            if elapsed >= config.connRing['overrunStatsSec']:
+                # Get the number of messages we lost since last time.
+                overruns = self.__consumer.overrunCount - self.__overrunLastCount
+                
+                logger.log("AIS state engine lost %s ring messages to overruns in %.0f sec (%.2f msgs/sec)." %(overruns, elapsed, overruns / elapsed))
+                
+                # Reset our counters.
+                self.__overrunLastTime = time.time()
+                self.__overrunLastCount = self.__consumer.overrunCount
+    
     def run(self):
-        for work in self.__psObj.listen():
+        for work in self.__consumer.listen():
             self.worker(work)
+            
+            # Log ring overrun stats if it's time.
+            self.__logOverruns()
 
 if __name__ == "__main__":
     # Set up the logger.
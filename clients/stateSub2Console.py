@@ -20,12 +20,13 @@ try:
 except:
 	raise IOError("No configuration present. Please copy config/config.py to the airSuck folder and edit it.")
 
-import redis
 import time
 import json
 import threading
 import traceback
 from pprint import pprint
+from libAirSuck import asCodec
+from libAirSuck import asRedisPool
 
 
 ##############################
@@ -41,11 +42,12 @@ class SubListener(threading.Thread):
         self.redis = r
         self.pubsub = self.redis.pubsub()
         self.pubsub.subscribe(channels)
+        self.__codec = asCodec()
     
     def worker(self, work):
         #Do work on the data returned from the subscriber.
         stateJson = str(work['data'])
-        stateWrapped = json.loads(stateJson)
+        stateWrapped = self.__codec.decode(stateJson)
         
         # Make sure we got good data from json.loads
         if (type(stateWrapped) == dict):
@@ -57,7 +59,7 @@ class SubListener(threading.Thread):
 
 if __name__ == "__main__":
     print("airSuck state queue viewer starting...")
-    r = redis.Redis(host=config.statePub['host'], port=config.statePub['port'])
+    r = asRedisPool().getRedis(config.statePub['host'], config.statePub['port'])
     client = SubListener(r, [config.statePub['qName']])
     # We want the faote of our SubListener instance to be tied to the main thread process.
     client.daemon = True
@@ -20,13 +20,14 @@ try:
 except:
 	raise IOError("No configuration present. Please copy config/config.py to the airSuck folder and edit it.")
 
-import redis
 import time
 import json
 import threading
 import traceback
 from pprint import pprint
 from airSuckUtil import airSuckUtil
+from libAirSuck import asCodec
+from libAirSuck import asRedisPool
 
 #################
 # Configuration #
@@ -45,6 +46,7 @@ class SubListener(threading.Thread):
         self.redis = r
         self.pubsub = self.redis.pubsub()
         self.pubsub.subscribe(channels)
+        self.__codec = asCodec()
         self.asu = airSuckUtil()
         
         # Parameters for locatoins that generate notifications.
@@ -54,7 +56,7 @@ class SubListener(threading.Thread):
     def worker(self, work):
         #Do work on the data returned from the subscriber.
         stateJson = str(work['data'])
-        stateWrapped = json.loads(stateJson)
+        stateWrapped = self.__codec.decode(stateJson)
         
         # Make sure we got good data from json.loads
         if (type(stateWrapped) == dict):
@@ -114,7 +116,7 @@ class SubListener(threading.Thread):
 
 if __name__ == "__main__":
     print("airSuck state queue viewer starting...")
-    r = redis.Redis(host=config.statePub['host'], port=config.statePub['port'])
+    r = asRedisPool().getRedis(config.statePub['host'], config.statePub['port'])
     client = SubListener(r, [config.statePub['qName']])
     # We want the faote of our SubListener instance to be tied to the main thread process.
     client.daemon = True
@@ -20,12 +20,13 @@ try:
 except:
 	raise IOError("No configuration present. Please copy config/config.py to the airSuck folder and edit it.")
 
-import redis
 import time
 import json
 import threading
 import traceback
 from pprint import pprint
+from libAirSuck import asCodec
+from libAirSuck import asRedisPool
 
 
 ##############################
@@ -41,11 +42,12 @@ class SubListener(threading.Thread):
         self.redis = r
         self.pubsub = self.redis.pubsub()
         self.pubsub.subscribe(channels)
+        self.__codec = asCodec()
         
     def worker(self, work):
         #Do work on the data returned from the subscriber.
         adsbJson = str(work['data'])
-        adsbWrapped = json.loads(adsbJson)
+        adsbWrapped = self.__codec.decode(adsbJson)
         
         # Make sure we got good data from json.loads
         if (type(adsbWrapped) == dict):
@@ -58,7 +60,7 @@ class SubListener(threading.Thread):
 
 if __name__ == "__main__":
     print("ADSB subscription queue viewer starting...")
-    r = redis.Redis(host=config.connPub['host'], port=config.connPub['port'])
+    r = asRedisPool().getRedis(config.connPub['host'], config.connPub['port'])
     client = SubListener(r, [config.connPub['qName']])
     # We want the faote of our SubListener instance to be tied to the main thread process.
     client.daemon = True
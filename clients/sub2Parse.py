@@ -20,7 +20,6 @@ try:
 except:
 	raise IOError("No configuration present. Please copy config/config.py to the airSuck folder and edit it.")
 
-import redis
 import time
 import json
 import threading
@@ -28,6 +27,8 @@ import traceback
 import binascii
 from pprint import pprint
 from libAirSuck import ssrParse
+from libAirSuck import asCodec
+from libAirSuck import asRedisPool
 
 
 #################
@@ -52,13 +53,14 @@ class SubListener(threading.Thread):
         self.redis = r
         self.pubsub = self.redis.pubsub()
         self.pubsub.subscribe(channels)
+        self.__codec = asCodec()
     
     def worker(self, work):
         # Do work on the data returned from the subscriber.
         ssrJson = str(work['data'])
         
         # Get wrapped SSR data.
-        ssrWrapped = json.loads(ssrJson)
+        ssrWrapped = self.__codec.decode(ssrJson)
         
         # Make sure we got good data from json.loads
         if (type(ssrWrapped) == dict):
@@ -102,7 +104,7 @@ if __name__ == "__main__":
     print("ADSB subscription queue data parsing test engine starting...")
     
     # Set up Redis queues.
-    r = redis.Redis(host=config.connPub['host'], port=config.connPub['port'])
+    r = asRedisPool().getRedis(config.connPub['host'], config.connPub['port'])
     
     # Start up our ADS-B parser
     client = SubListener(r, [config.connPub['qName']])
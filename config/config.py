@@ -90,7 +90,8 @@ d1090ConnSettings = {
     'clientPingInterval': 10.0, # This is how often we want to "ping" a client so if it doesn't get a ping it knows to reconnect (in seconds).
     'connClientList': { # Array of hosts to connect to when running client connector script.
         "<source name>": { "host": "<hostname or IP>", "port": 30002, "reconnectDelay": 5, "threadTimeout": 30}, # This can contain additional dictionaries.
-        "<another source name>":  { "host": "<hostname or IP>", "port": 30002, "reconnectDelay": 5, "threadTimeout": 120, "srcPos": [33.944128, -118.402787, "manual"]} # Same as above, but we have source position info that enabled CPR local decoding. The srcPos directive is optional.
+        "<another source name>":  { "host": "<hostname or IP>", "port": 30002, "reconnectDelay": 5, "threadTimeout": 120, "srcPos": [33.944128, -118.402787, "manual"]}, # Same as above, but we have source position info that enabled CPR local decoding. The srcPos directive is optional.
+        "<beast source name>":  { "host": "<hostname or IP>", "port": 30005, "format": "beast", "reconnectDelay": 5, "threadTimeout": 30} # Beast binary output from dump1090, which adds the 12 MHz timestamp and signal level. The format directive is optional and defaults to "avr" for the text output on port 30002.
     },
     'debug': False # Debug?
 }
@@ -108,14 +109,30 @@ aisConnSettings = {
     'debug': False # Debug?
 }
 
+# airSuck.py settings - for small installations that want everything in one process instead of a supervisor program for each piece. Each piece also has to be enabled in its own settings, and connPub['transport'] should be "local".
+airSuckSettings = {
+    'logMode': genLogMode, # Use the generic logging mode specified in the quick-and-diry section. This can be changed per application.
+    'run': ["dump1090ConnClt", "aisConnector", "ssrStateEngine", "aisStateEngine", "mongoDump", "stateMongoDump"], # Which pieces do we run? Any of "dump1090ConnClt", "aisConnector", "airSuckServer", "ssrStateEngine", "aisStateEngine", "mongoDump", and "stateMongoDump". The connectors and airSuckServer share one SSR handler and one AIS handler, so they share deduplication too.
+    'statsSec': 300.0, # How often in seconds do we log the local queue depths and dropped messages? 0 = never. Default is 300.0.
+    'stopWaitSec': 10.0 # How long in seconds do we wait for the MongoDB dumpers to store what they're holding when we shut down? Default is 10.0.
+}
+
 # SSR State engine settings
 ssrStateEngine = {
     'logMode': genLogMode, # Use the generic logging mode specified in the quick-and-diry section. This can be changed per application.
     'enabled': True, # Do we want to run the state engine? True = yes, False = no
     'hashTTL': 300, # Expire vehicles that we haven't seen in this number of seconds. Default is 300 sec (5 min)
     'cprExpireSec': 20, # This specifies how old CPR data can be before we reject it as too old to be valid in sec. Default is 20.
+    'cprFirstFix': True, # If we know where the receiver is, decode a single airborne position frame against the receiver's position so new aircraft show up before we have an even/odd pair. Default is True.
+    'cprFirstFixMaxKm': 150.0, # Ignore first fix positions farther than this from the receiver in km. A single frame always decodes to within half a zone (~333 km) of the receiver, so an aircraft farther out than that shows up about 667 km minus its real range away. Keeping this well under 333 km rejects those for aircraft out to 667 km minus this, which is past the radio horizon at cruise altitudes. Default is 150.
+    'cprSurfaceRefCacheSize': 1024, # How many receivers do we remember the 90 degree longitude quadrant for when decoding surface position pairs? Default is 1024.
+    'cprSurfaceMaxKm': 45.0, # Ignore surface positions decoded from a single frame farther than this from the receiver in km. Surface zones are a quarter the size of airborne ones, so these always land within ~83 km of the receiver and anything farther out shows up about 167 km minus its real range away. Default is 45.
     'hashHost': genRedisHost, # This Redis host stores the hash values to keep track of state for SSR data.
     'hashPort': genRedisPort, # The port for the above redis instance.
+    'crcFixBits': 1, # Frames from thin connectors get parsed here. Correct up to this many flipped bits in DF11, DF17, and DF18 frames with bad CRCs like d1090Settings['crcFixBits']. Default is 1.
+    'parseCacheSize': 4096, # How many recently parsed frames from thin connectors do we keep so the same frame from multiple receivers only gets parsed once? 0 = off. Default is 4096.
+    'streamGroup': "ssrStateEngine", # Consumer group we read the connector stream with when connPub['transport'] is "stream" or "both". Default is "ssrStateEngine".
+    'streamConsumer': None, # Name of this worker in the consumer group. Every worker needs a different name. None = use the host name and process ID. Messages a worker didn't finish are picked up by the others after connPub['streamClaimMs'], so the name doesn't need to stay the same when it restarts. Default is None.
     'debug': False # Debug?
 }
 
@@ -126,6 +143,8 @@ aisStateEngine = {
     'hashTTL': 1200, # Expire vehicles that we haven't seen in this number of seconds. Default is 1200 sec (20 min)
     'hashHost': genRedisHost, # This Redis host stores the hash values to keep track of state for SSR data.
     'hashPort': genRedisPort, # The port for the above redis instance.
+    'streamGroup': "aisStateEngine", # Consumer group we read the connector stream with when connPub['transport'] is "stream" or "both". Default is "aisStateEngine".
+    'streamConsumer': None, # Name of this worker in the consumer group. Every worker needs a different name. None = use the host name and process ID. Messages a worker didn't finish are picked up by the others after connPub['streamClaimMs'], so the name doesn't need to stay the same when it restarts. Default is None.
     'debug': False # Debug?
 }
 
@@ -137,16 +156,27 @@ aisStateEngine = {
 # Generic settings for the dump1090 handler. These settings control how the shared dump1090 handler used by the dump1090 connector client and airSuck server work.
 d1090Settings = {
     'dedupeTTLSec': 3, # Time to live for deduplicated frames. This rejects duplicate frames recieved within 3 sec of each other.
+    'dedupeMode': "redis", # How do we dedupe frames? "redis" checks each frame against Redis so every connector process that uses the same Redis host drops the frames the others already sent, "sync" keeps recent frames in memory and shares them with the other processes over Redis every dedupeSyncMs, which is faster but can let a duplicate through in between, and "local" only keeps recent frames in memory, which is fastest but only dedupes within this process. Use "local" only if one process gets all the frames, like airSuck.py running everything. Default is "redis".
+    'dedupeSyncMs': 100.0, # How often in milliseconds do we share recent frames with other processes in "sync" mode? Default is 100.0.
     'dedupeHost': genRedisHost, # This host contains the objects used to deduplicate frames.
-    'dedupePort': genRedisPort # Redis port number for dedupe.
+    'dedupePort': genRedisPort, # Redis port number for dedupe.
+    'crcFixBits': 1, # Correct up to this many flipped bits in DF11, DF17, and DF18 frames with bad CRCs. 0 = off, 1 or 2 bits. DF11 is only corrected for 1 bit.
+    'crcFixStatsSec': 300.0, # How often in seconds do we log how many frames were recovered by CRC correction? 0 = never.
+    'parseCacheSize': 4096, # How many recently parsed frames do we keep so identical frames from multiple receivers only get parsed once? 0 = off.
+    'badCrcHeaderOnly': True, # Only decode the header fields (len, mode, df, frameCrc, cmpCrc, icaoAAHx, icaoAAInt, and fmt) of DF17 and DF18 frames with bad CRCs that crcFixBits couldn't fix. ssrStateEngine drops these frames anyway, but anything else reading the connector queues (like mongoDump.py) no longer gets the rest of their fields. False = decode them fully like older versions did. Default is True.
+    'thinConnector': False # Only send the raw frame and where it came from to the connector queues and let ssrStateEngine parse it. Messages are several times smaller and connectors use less CPU, but anything reading the connector queues other than ssrStateEngine (like mongoDump.py) only sees raw frames. Default is False.
 }
 
 # Generic settings for the AIS handler. These settings control how the shared AIS handler used by the AIS connector client and airSuck server work.
 aisSettings = {
     'fragTTLSec': 1, # Time to live for frame fragments. This clears fragmented frames no recieved within n sec of each other.
+    'fragMode': "local", # Where do we keep fragments while we wait for the rest of a message? "local" keeps them in memory and "redis" keeps them on fragHost. Fragments of a message are matched by the source they came from, so "local" works as long as each source is only handled by one process. Default is "local".
     'fragHost': genRedisHost, # This host contains the objects used to assemble fragemented frames.
     'fragPort': genRedisPort, # Redis port number for hash object redis instance.
+    'defragStatsSec': 300.0, # How often in seconds do we log how many fragments we got, how many messages we assembled from them, and how many we gave up on? 0 = never. Default is 300.0.
     'dedupeTTLSec': 3, # Time to live for deduplicated frames. This rejects duplicate frames recieved within 3 sec of each other.
+    'dedupeMode': "redis", # How do we dedupe AIS payloads? "redis" checks each payload against Redis so every connector process that uses the same Redis host drops the payloads the others already sent, "sync" keeps recent payloads in memory and shares them with the other processes over Redis every dedupeSyncMs, which is faster but can let a duplicate through in between, and "local" only keeps recent payloads in memory, which is fastest but only dedupes within this process. Use "local" only if one process gets all the payloads, like airSuck.py running everything. Default is "redis".
+    'dedupeSyncMs': 100.0, # How often in milliseconds do we share recent payloads with other processes in "sync" mode? Default is 100.0.
     'dedupeHost': genRedisHost, # This host contains the objects used to deduplicate AIS payloads.
     'dedupePort': genRedisPort # Redis port number for dedupe.
 }
@@ -206,11 +236,52 @@ connRel = {
     'qName': "airSuckConnRel" # Queue name.
 }
 
+# Redis connection settings - used by everything that talks to Redis. Every Redis server and database gets one pool of connections shared by the whole process.
+redisConn = {
+    'unixSockets': {}, # Talk to these Redis servers over a Unix domain socket instead of TCP because they're on this machine, as {"host:port": "/path/to/socket"}. For example {"localhost:6379": "/var/run/redis/redis.sock"}. Redis has to have its unixsocket option set. Default is {}.
+    'connectTimeoutSec': 5.0, # How long in seconds do we wait to connect to Redis over TCP? None = forever. Default is 5.0.
+    'timeoutSec': None, # How long in seconds do we wait for Redis to answer a command? Pub/sub listeners wait on their socket for new messages, so this has to be None (forever) or longer than a channel is ever idle. Default is None.
+    'keepAlive': True, # Turn on TCP keepalive so dead connections get noticed. Default is True.
+    'healthCheckSec': 30, # Ping connections that have been idle this many seconds before we use them. Requires redis-py 3.3 or newer. 0 = off. Default is 30.
+    'maxConnections': None # Most connections we open to each Redis server and database. None = no limit. Default is None.
+}
+
 # Connector pub/sub redis queue settings - used by multiple scripts.
 connPub = {
     'host': genRedisHost, # This host hosts the queue.
     'port': genRedisPort, # This is the port number for the instance hodling the queue.
-    'qName': "airSuckConnPub" # Queue name.
+    'qName': "airSuckConnPub", # Queue name.
+    'msgFormat': "json", # How do the connectors encode messages for the connector queues? "json" or "binary". Binary messages are about half the size and are faster to decode, but need the msgpack python module and aren't human readable. Everything that reads these queues understands both. Default is "json".
+    'transport': "pubsub", # How do the connectors pass data to the state engines? "pubsub" uses Redis pub/sub, "stream" uses a Redis stream with a consumer group for each state engine so several workers can share the load and nothing is lost while a state engine restarts, "both" sends data both ways so pub/sub clients like sub2Console.py keep working while the state engines read the stream, "ring" uses shared memory ring buffers set up in connRing, which only works when the connectors and state engines run on the same machine and skips Redis completely, and "local" uses the in-process queues set up in connLocal, which only works when airSuck.py runs everything in one process. Streams require Redis 5.0 and redis-py 3.0 or newer. Default is "pubsub".
+    'streamMaxLen': 100000, # Trim the stream to about this many messages. Default is 100000.
+    'streamBatch': 100, # How many messages do the state engines read and acknowledge at a time from the stream? This also caps the batches ssrStateEngine takes from pub/sub. Default is 100.
+    'streamClaimMs': 60000, # How long in milliseconds can a state engine worker sit on stream messages it read without acknowledging them before another worker in its group claims them? This is also how often workers check, and how long a worker that went away stays in its group. Default is 60000.
+    'streamBlockMs': 1000 # How long in milliseconds do the state engines wait for new messages on the stream or pub/sub before checking again? Default is 1000.
+}
+
+# Connector shared memory ring buffer settings - used when connPub['transport'] is "ring". Every connector process writes its own ring file here and the state engines read all of them.
+connRing = {
+    'dir': "/dev/shm", # Where do the ring files live? This should be a memory backed file system like /dev/shm. Default is "/dev/shm".
+    'slots': 16384, # How many messages does each ring hold? If a state engine falls this far behind it loses messages, which are counted as overruns. Default is 16384.
+    'slotSize': 1024, # How many bytes is each slot? Messages longer than this minus 12 bytes are dropped. Default is 1024.
+    'pollMs': 1.0, # How long in milliseconds do the state engines wait before checking the rings again when they're empty? Default is 1.0.
+    'scanSec': 1.0, # How often in seconds do the state engines look for new rings and get rid of rings from connectors that quit? Default is 1.0.
+    'overrunStatsSec': 300.0 # How often in seconds do the state engines log how many messages they lost to overruns? 0 = never. Default is 300.0.
+}
+
+# In-process queue settings - used when connPub['transport'] is "local". airSuck.py runs the connectors, state engines, and MongoDB dumpers in one process and they hand each other data through these queues instead of the connector queues and state reliable queue in Redis.
+connLocal = {
+    'maxMsgs': 10000, # How many messages can each state engine or MongoDB dumper have waiting? Default is 10000.
+    'blockMs': 50.0, # How long in milliseconds do we wait for room when a queue is full before dropping messages? Dropped messages are counted and logged by airSuck.py. 0 = drop right away. Default is 50.0.
+    'pubExternal': True # Also publish connector data on the connPub Redis pub/sub channel for clients outside the process like sub2Console.py and sub2Dump1090.py? State data always goes to statePub for node/stateNode.js. Default is True.
+}
+
+# Connector output batching settings - used by handler1090 and handlerAIS.
+connPubBatch = {
+    'maxMsgs': 100, # Send messages to the connector reliable and pub/sub queues once we have this many. 1 = send each message right away. Default is 100.
+    'maxMs': 20.0, # Send messages once the oldest one has waited this many milliseconds even if we don't have maxMsgs of them. Default is 20.0.
+    'maxHeld': 100000, # How many messages do we hold on to while Redis is down? Past this we drop the oldest ones and log how many. Default is 100000.
+    'retrySec': 1.0 # How long in seconds do we wait before trying Redis again after a batch fails? Default is 1.0.
 }
 
 # State engine reliable Redis queue settings - used by multiple scripts.
@@ -224,5 +295,6 @@ stateRel = {
 statePub = {
     'host': genRedisHost, # This host hosts the queue.
     'port': genRedisPort, # This is the port number for the instance hodling the queue.
-    'qName': "airSuckStatePub" # Queue name.
+    'qName': "airSuckStatePub", # Queue name.
+    'msgFormat': "json" # How do the state engines encode messages for the state queues? "json" or "binary", like connPub['msgFormat']. node/stateNode.js only understands JSON. Default is "json".
 }
@@ -26,8 +26,10 @@ import traceback
 import socket
 from pprint import pprint
 from libAirSuck import ssrParse
+from libAirSuck import beastParse
 from libAirSuck import asLog
 from libAirSuck import handler1090
+from libAirSuck import airSuckUtil
 
 ##########
 # Config #
@@ -65,6 +67,13 @@ class dataSource(threading.Thread):
 		
 		# This keeps track of the number of seconds since our last connection.
 		self.__lastEntry = 0
+		
+		# Do we have a Beast binary source or an AVR text source?
+		self.__beast = False
+		
+		if 'format' in self.__dump1090Src:
+			if self.__dump1090Src['format'] == "beast":
+				self.__beast = True
 	
 	# Make sure we have data. If we don't throw an exception.
 	def __watchdog(self):
@@ -225,6 +234,37 @@ class dataSource(threading.Thread):
 			# Don't do anything.
 			None
 	
+	def __makeEntry(self):
+		"""
+		Create a data entry dict with the metadata for a frame from this source.
+		"""
+		
+		# Date time string
+		dtsStr = str(datetime.datetime.utcnow())
+		
+		# Create our data entry dict.
+		thisEntry = {}
+		
+		#Make sure we didn't trim microseconds because if we did the mongoDump script gets pissed off.
+		if (len(dtsStr) == 19):
+			dtsStr = dtsStr + ".000000"
+		
+		# Add metadata.
+		thisEntry.update({'dataOrigin': 'dump1090', 'type': 'airSSR', 'dts': dtsStr, 'src': config.d1090ConnSettings['myName'], 'entryPoint': 'dump1090ConnClt', 'clientName': self.__myName})
+		
+		# If we have position data for this source...
+		if 'srcPos' in self.__dump1090Src:
+			# If we have a list...
+			if type(self.__dump1090Src['srcPos']) == list:
+				
+				# If our list has two elements...
+				if len(self.__dump1090Src['srcPos']) == 3:
+					
+					# If we have good position data add it to any outgoing data.
+					thisEntry.update({"srcLat": self.__dump1090Src['srcPos'][0], "srcLon": self.__dump1090Src['srcPos'][1], "srcPosMeta": self.__dump1090Src['srcPos'][2]})
+		
+		return thisEntry
+	
 	def run(self):
 		"""run
 		
@@ -242,48 +282,46 @@ class dataSource(threading.Thread):
 			
 			# Try to read a line from our established socket.
 			try:
-				# Get lines of data from dump1090
-				for thisLine in self.__readLines(self.__dump1090Sock):
-					
-					# Date time string
-					dtsStr = str(datetime.datetime.utcnow())
-					
-					# If we're debugging yet.
-					if config.d1090ConnSettings['debug']:
-						logger.log("Got line %s from %s." %(thisLine, self.__myName))
-					
-					# Create our data entry dict.
-					thisEntry = {}
-					
-					#Make sure we didn't trim microseconds because if we did the mongoDump script gets pissed off.
-					if (len(dtsStr) == 19):
-						dtsStr = dtsStr + ".000000"
-					
-					# Add metadata.
-					thisEntry.update({'dataOrigin': 'dump1090', 'type': 'airSSR', 'dts': dtsStr, 'src': config.d1090ConnSettings['myName'], 'entryPoint': 'dump1090ConnClt', 'data': thisLine, 'clientName': self.__myName})
-					
-					# If we have position data for this source...
-					if 'srcPos' in self.__dump1090Src:
-						# If we have a list...
-						if type(self.__dump1090Src['srcPos']) == list:
-							
-							# If our list has two elements...
-							if len(self.__dump1090Src['srcPos']) == 3:
-								
-								# If we have good position data add it to any outgoing data.
-								thisEntry.update({"srcLat": self.__dump1090Src['srcPos'][0], "srcLon": self.__dump1090Src['srcPos'][1], "srcPosMeta": self.__dump1090Src['srcPos'][2]})
-					
-					# If we're debugging...
-					if config.d1090ConnSettings['debug']:
-						logger.log("%s queueing: %s." %(thisLine, self.__myName))
-					
-					# Try to queue our data.
-					submitted = h1090.handleADSBDict(thisEntry)
-					
-					# If we were able to submit our data
-					if submitted:
-						# Reset our last entry.
-						self.__lastEntry = 0
+				# If we have a Beast binary source...
+				if self.__beast:
+					# Get frames from dump1090.
+					for thisFrame in self.__readBeast(self.__dump1090Sock):
+						
+						# Create our data entry dict with the timestamp and signal level.
+						thisEntry = self.__makeEntry()
+						thisEntry.update({'beastTs': thisFrame[0], 'signalLevel': thisFrame[1]})
+						
+						# Try to queue our data.
+						submitted = h1090.handleBinFrame(thisEntry, thisFrame[2])
+						
+						# If we were able to submit our data
+						if submitted:
+							# Reset our last entry.
+							self.__lastEntry = 0
+				
+				else:
+					# Get lines of data from dump1090
+					for thisLine in self.__readLines(self.__dump1090Sock):
+						
+						# If we're debugging yet.
+						if config.d1090ConnSettings['debug']:
+							logger.log("Got line %s from %s." %(thisLine, self.__myName))
+						
+						# Create our data entry dict.
+						thisEntry = self.__makeEntry()
+						thisEntry.update({'data': thisLine})
+						
+						# If we're debugging...
+						if config.d1090ConnSettings['debug']:
+							logger.log("%s queueing: %s." %(thisLine, self.__myName))
+						
+						# Try to queue our data.
+						submitted = h1090.handleADSBDict(thisEntry)
+						
+						# If we were able to submit our data
+						if submitted:
+							# Reset our last entry.
+							self.__lastEntry = 0
 				
 				# Close the connection.
 				self.__disconnectSource()
@@ -308,6 +346,70 @@ class dataSource(threading.Thread):
 					# Close the connection.
 					self.__disconnectSouce()
 	
+	def __readError(self, e):
+		"""
+		Log an exception we got reading from our socket. If the connection was refused or reset the exception is raised again.
+		"""
+		
+		# See if we have a socket error...
+		if type(e) == socket.error:
+			# If we weren't able to connect, dump a message
+			if e.errno == errno.ECONNREFUSED:
+				#Print some messages
+				logger.log("%s refused connection to %s:%s." %(self.__myName, self.__dump1090Src["host"], self.__dump1090Src["port"]))
+				
+				raise e
+			
+			elif e.errno == errno.ECONNRESET:
+				#Print some messages
+				logger.log("%s reset connection to %s:%s." %(self.__myName, self.__dump1090Src["host"], self.__dump1090Src["port"]))
+				
+				raise e
+			
+			else:
+				# Dafuhq happened!?
+				tb = traceback.format_exc()
+				logger.log("%s choked reading buffer with socket error.\n%s" %(self.__myName, tb))
+		
+		else:
+			tb = traceback.format_exc()
+			logger.log("%s choked reading buffer.\n%s" %(self.__myName, tb))
+	
+	def __readBeast(self, sock, recvBuffer = 4096):
+		"""
+		Read a TCP stream of Beast binary data, yielding a [timestamp, signalLevel, frame] list for each frame. Data is recieved straight into a reusable bytearray and frames are sliced out of it without converting them to hex.
+		"""
+		
+		# Set up our Beast parser and recieve buffer.
+		beast = beastParse()
+		recvBuf = bytearray(recvBuffer)
+		recvView = memoryview(recvBuf)
+		
+		data = True
+		while data:
+			try:
+				byteCount = sock.recv_into(recvBuf)
+				
+				# If we didn't get anything the connection was closed.
+				data = (byteCount > 0)
+				
+				for thisFrame in beast.feed(recvView[0:byteCount]):
+					yield thisFrame
+			
+			except socket.timeout:
+				continue
+			
+			except Exception as e:
+				# Log the error. This raises the exception again if the connection was refused or reset.
+				self.__readError(e)
+				data = False
+			
+			# See if our watchdog is working.
+			if self.__watchdogFail:
+				logger.log("%s watchdog terminating readBeast." %self.__myName)
+				data = False
+				break
+	
 	# Get one line from TCP output, from:
 	# http://synack.me/blog/using-python-tcp-sockets
 	def __readLines(self, sock, recvBuffer = 4096, delim = '\n'):
@@ -329,37 +431,9 @@ class dataSource(threading.Thread):
 				continue
 			
 			except Exception as e:
-				# See if we have a socket error...
-				if type(e) == socket.error:
-					# If we weren't able to connect, dump a message
-					if e.errno == errno.ECONNREFUSED:
-						#Print some messages
-						logger.log("%s refused connection to %s:%s." %(self.__myName, self.__dump1090Src["host"], self.__dump1090Src["port"]))
-						data = False
-						line = ""
-						
-						raise e
-					
-					elif e.errno == errno.ECONNRESET:
-						#Print some messages
-						logger.log("%s reset connection to %s:%s." %(self.__myName, self.__dump1090Src["host"], self.__dump1090Src["port"]))
-						data = False
-						line = ""
-						
-						raise e
-					
-					else:
-						# Dafuhq happened!?
-						tb = traceback.format_exc()
-						logger.log("%s choked reading buffer with socket error.\n%s" %(self.__myName, tb))
-						data = False
-						line = ""
-				
-				else:
-					tb = traceback.format_exc()
-					logger.log("%s choked reading buffer.\n%s" %(self.__myName, tb))
-					data = False
-					line = ""
+				# Log the error. This raises the exception again if the connection was refused or reset.
+				self.__readError(e)
+				data = False
 			
 			# See if our watchdog is working.
 			if self.__watchdogFail:
@@ -372,31 +446,37 @@ class dataSource(threading.Thread):
 # Main execution body #
 #######################
 
-# Set up the logger.
-logger = asLog(config.d1090ConnSettings['logMode'])
-
-# ... and go.
-logger.log("Dump1090 client connector starting...")
-
-# Set up our dump1090 handler.
-h1090 = handler1090(config.d1090ConnSettings['logMode'])
-h1090.setDebug(config.d1090ConnSettings['debug'])
-
-# Threading setup
-threadLock = threading.Lock()
-threadList = []
-
-# Spin up our client threads.
-for thisName, connData in dump1909Srcs.iteritems():
-	logger.log("Spinning up thread for %s." %thisName)
-	client = dataSource(thisName, connData)
-	client.daemon = True
-	client.start()
-	threadList.append(client)
-
-# Fix bug that prevents keyboard interrupt from killing dump1090Connector.py
-while True: time.sleep(10)
-
-# Shut down
-for t in threadList:
-	t.join()
+# If I've been called for execution...
+if __name__ == "__main__":
+	
+	# Set up the logger.
+	logger = asLog(config.d1090ConnSettings['logMode'])
+	
+	# ... and go.
+	logger.log("Dump1090 client connector starting...")
+	
+	# Set up our dump1090 handler.
+	h1090 = handler1090(config.d1090ConnSettings['logMode'])
+	h1090.setDebug(config.d1090ConnSettings['debug'])
+	
+	# Shut down like we got a keyboard interrupt when supervisor stops us so h1090 sends what it's holding.
+	airSuckUtil().interruptOnSigTerm()
+	
+	# Threading setup
+	threadLock = threading.Lock()
+	threadList = []
+	
+	# Spin up our client threads.
+	for thisName, connData in dump1909Srcs.iteritems():
+		logger.log("Spinning up thread for %s." %thisName)
+		client = dataSource(thisName, connData)
+		client.daemon = True
+		client.start()
+		threadList.append(client)
+	
+	# Fix bug that prevents keyboard interrupt from killing dump1090Connector.py
+	while True: time.sleep(10)
+	
+	# Shut down
+	for t in threadList:
+		t.join()
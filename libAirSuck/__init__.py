@@ -9,8 +9,20 @@ This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck)
 from cprMath import cprMath
 from airSuckUtil import airSuckUtil
 from ssrParse import ssrParse
+from ssrParse import ssrFrame
+from ssrParse import ssrLazyFrame
+from beastParse import beastParse
 from aisParse import aisParse
 from asLog import asLog
 from handler1090 import handler1090
 from handlerAIS import handlerAIS
+from aisDefrag import aisDefrag
+from asDedupe import asDedupe
+from asPublisher import asPublisher
+from asConsumer import asConsumer
+from asCodec import asCodec
+from asRedisPool import asRedisPool
+from asRing import asRing
+from asLocalQueue import asLocalQueue
+from ssrBatchDecoder import ssrBatchDecoder
 from ssrReg import ssrReg
\ No newline at end of file
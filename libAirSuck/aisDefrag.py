@@ -0,0 +1,180 @@
+"""
+aisDefrag by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Reassembles multipart AIS payloads from their fragments without a Redis round trip for every fragment. Incomplete messages are kept in an ordered hash table with the one that got a fragment least recently first, so throwing away the ones that have waited longer than the TTL only ever looks at the front of the table.
+"""
+
+###########
+# Imports #
+###########
+
+import hashlib
+import threading
+import time
+import asRedisPool
+from collections import OrderedDict
+
+
+###################
+# aisDefrag class #
+###################
+
+class aisDefrag:
+    #####################
+    # Class constructor #
+    #####################
+    
+    
+    def __init__(self, ttlSec, mode="local", host=None, port=None):
+        """
+        aisDefrag is a class that puts multipart AIS payloads back together.
+        
+        The principal method is addFragment(fragment) which returns the whole payload once we have every fragment of a message, or None if we're still waiting. Fragments of a message that don't all show up within ttlSec seconds of each other are thrown away.
+        
+        The mode can be 'local' to keep fragments in this process, or 'redis' to keep them in a hash on the Redis host like we used to.
+        """
+        
+        # Make sure we have a mode we know about.
+        if mode not in ('local', 'redis'):
+            raise ValueError("Valid defrag mode not specified. Please use 'local' or 'redis'.")
+        
+        self.__ttlSec = ttlSec
+        self.__mode = mode
+        
+        # Messages we're waiting on as key -> [time of the last fragment, {fragment number: payload}], with the one we've waited on longest first.
+        self.__groups = OrderedDict()
+        
+        # The connectors call us from several threads at once.
+        self.__lock = threading.Lock()
+        
+        # How many fragments have we gotten, how many messages have we put together, and how many did we give up on?
+        self.fragmentCount = 0
+        self.assembledCount = 0
+        self.expiredCount = 0
+        
+        # Set up Redis if we need it.
+        if mode == "redis":
+            self.__redis = asRedisPool.asRedisPool().getRedis(host, port)
+    
+    #####################
+    # Fragment handling #
+    #####################
+    
+    def __expire(self, now):
+        """
+        Throw away messages that haven't gotten a fragment within the TTL.
+        """
+        
+        while len(self.__groups) > 0:
+            # The oldest message is always first.
+            key = next(iter(self.__groups))
+            
+            if (now - self.__groups[key][0]) < self.__ttlSec:
+                break
+            
+            del self.__groups[key]
+            self.expiredCount += 1
+    
+    def __addLocal(self, key, fragment, now):
+        """
+        Add fragment to the message at key in memory. Returns the whole payload if we have every fragment.
+        """
+        
+        retVal = None
+        
+        with self.__lock:
+            self.__expire(now)
+            
+            # Pull the message out so it goes back in at the end with the newest time.
+            group = self.__groups.pop(key, None)
+            
+            if group is None:
+                group = [now, {}]
+            
+            group[0] = now
+            group[1][fragment['fragNumber']] = fragment['payload']
+            
+            # If we have as many fragments as we need put them in order.
+            if len(group[1]) >= fragment['fragCount']:
+                payloads = [group[1].get(i) for i in range(1, fragment['fragCount'] + 1)]
+                
+                if None not in payloads:
+                    retVal = "".join(payloads)
+            
+            # Keep waiting if we don't have the whole thing.
+            if retVal is None:
+                self.__groups[key] = group
+        
+        return retVal
+    
+    def __addRedis(self, key, fragment):
+        """
+        Add fragment to the message at key in a Redis hash. Returns the whole payload if we have every fragment.
+        """
+        
+        retVal = None
+        
+        # Set up a hashed version of our key.
+        fHash = "aisFrag-" + hashlib.md5(key).hexdigest()
+        
+        # Create a fragment name.
+        fragName = str(fragment['fragNumber'])
+        
+        # Attempt to get data from our hash table.
+        hashDat = self.__redis.hgetall(fHash)
+        
+        # If we have all the fragments we need...
+        if (len(hashDat) > 0) and (len(hashDat) == (fragment['fragCount'] - 1)):
+            # Push our new fragment into the dict.
+            hashDat.update({fragName: fragment['payload']})
+            
+            # Assemble the stored fragments in order.
+            retVal = "".join([hashDat[str(i)] for i in range(1, fragment['fragCount'] + 1)])
+            
+            # Nuke the hash object.
+            self.__redis.expire(fHash, -1)
+        
+        else:
+            # Since we don't have all the fragments we need add the latest fragment to the list, and set the expiration time.
+            self.__redis.hset(fHash, fragName, fragment['payload'])
+            self.__redis.expire(fHash, self.__ttlSec)
+        
+        return retVal
+    
+    ##################
+    # Public methods #
+    ##################
+    
+    def addFragment(self, fragment, now=None):
+        """
+        Add a decapsulated AIS fragment with src, fragCount, fragNumber, messageID, and payload fields. Fragments belong to the same message if they came from the same src with the same fragCount and messageID. Returns the whole payload once we have every fragment of the message, or None. now can be set to a time.time() style timestamp to use instead of the current time.
+        """
+        
+        self.fragmentCount += 1
+        
+        key = "%s-%s-%s" %(fragment['src'], fragment['fragCount'], fragment['messageID'])
+        
+        if self.__mode == "redis":
+            retVal = self.__addRedis(key, fragment)
+        
+        else:
+            if now is None:
+                now = time.time()
+            
+            retVal = self.__addLocal(key, fragment, now)
+        
+        if retVal is not None:
+            self.assembledCount += 1
+        
+        return retVal
+    
+    def pendingCount(self):
+        """
+        Get the number of incomplete messages we're holding in memory.
+        """
+        
+        return len(self.__groups)
@@ -0,0 +1,188 @@
+"""
+asCodec by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Encodes and decodes the dicts we pass between airSuck processes on Redis queues. Messages are either JSON or a compact binary envelope: a magic byte, a version byte, and a msgpack map where the field names we know are replaced with integer tags and hex frame data is stored as raw bytes. decode() figures out which one it got.
+"""
+
+###########
+# Imports #
+###########
+
+import binascii
+import json
+
+# msgpack is optional. We only need it for binary messages.
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+#################
+# asCodec class #
+#################
+
+class asCodec:
+    # First byte of every binary message. JSON messages always start with "{" so they can't be confused with it.
+    binMagic = "\xa5"
+    
+    # Version of the binary envelope we write.
+    binVersion = 1
+    
+    # Field names for each integer tag, starting at tag 1, by envelope version. Only ever add names to the end of a version's list.
+    __fieldNames = {
+        1: (
+            # Chain of custody.
+            'type', 'entryPoint', 'dataOrigin', 'clientName', 'src', 'dts', 'data', 'mlatData', 'beastTs', 'signalLevel',
+            # SSR frames.
+            'mode', 'df', 'len', 'dataFmt', 'frameCrc', 'cmpCrc', 'icaoAAHx', 'icaoAAInt', 'ca', 'fmt', 'subType', 'aSquawk',
+            'alt', 'altType', 'altDelta', 'airspeed', 'airspeedRef', 'category', 'cc', 'dr', 'emergency', 'evenOdd', 'fs',
+            'fsEmergency', 'gndspeed', 'heading', 'headingAvail', 'headingValid', 'idInfo', 'ids', 'ifrCap', 'iis',
+            'intentFlag', 'nxc', 'rawLat', 'rawLon', 'singleAnt', 'sl', 'srcFlag', 'ss', 'supersonic', 'utcSync', 'vertRate',
+            'vertStat', 'utc',
+            # AIS sentences.
+            'channel', 'fragCount', 'fragNumber', 'messageID', 'isFrag', 'isAssembled', 'padBits', 'sentenceType', 'payload',
+            'payloadType', 'repeatIndicator', 'mmsi', 'mmsiCC', 'mmsiCountry', 'mmsiType', 'navStat', 'turnRt', 'velo',
+            'posAcc', 'lon', 'lat', 'courseOverGnd', 'timestamp', 'maneuverBlueSign', 'raim', 'aisVer', 'imo', 'imoCheck',
+            'callsign', 'vesselName', 'shipType', 'dimToBow', 'dimToStern', 'dimToPort', 'dimToStarboard', 'epfd', 'etaMonth',
+            'etaDay', 'etaHour', 'etaMinute', 'draught', 'destination', 'dte', 'spare', 'seqNo', 'destMmsi', 'retransmit',
+            'dac', 'fid', 'utcYear', 'utcMonth', 'utcDay', 'utcHour', 'utcMinute', 'utcSecond',
+            # State engine data.
+            'addr', 'lastSeen', 'lastClientName', 'lastSrc', 'lastFmt', 'lastChannel', 'locationMeta', 'srcLat', 'srcLon',
+            'srcPosMeta', 'evenLat', 'evenLon', 'evenTs', 'oddLat', 'oddLon', 'oddTs', 'headingMeta', 'veloType', 'veloMeta',
+            'survStat', 'aSquawkMeta', 'emergencyData', 'icaoAACC', 'icaoAACountry', 'navStatMeta', 'epfdMeta', 'shipTypeMeta'
+        )
+    }
+    
+    # Fields that hold hex strings we can store as raw bytes.
+    __hexFields = ('data', 'mlatData')
+    
+    # Name -> tag and tag -> name tables for each version. These are shared by every instance and built by the first one.
+    __nameTags = None
+    __tagNames = None
+    
+    #####################
+    # Class constructor #
+    #####################
+    
+    
+    def __init__(self, msgFormat="json"):
+        """
+        asCodec is a class that encodes and decodes the dicts we pass between processes.
+        
+        The principal methods are encode(dataDict) and decode(msg). msgFormat sets what encode() produces, and can be "json" or "binary". Binary messages need msgpack, and we fall back to JSON without it. decode() handles either format no matter what msgFormat is.
+        """
+        
+        # Make sure we have a format we know about.
+        if msgFormat not in ('json', 'binary'):
+            raise ValueError("Valid message format not specified. Please use 'json' or 'binary'.")
+        
+        self.__binary = (msgFormat == "binary") and (msgpack is not None)
+        
+        # Build our tag tables if nobody has yet.
+        if asCodec.__nameTags is None:
+            nameTags = {}
+            tagNames = {}
+            
+            for version, fieldNames in asCodec.__fieldNames.iteritems():
+                nameTags[version] = dict([[fieldNames[i], i + 1] for i in range(0, len(fieldNames))])
+                tagNames[version] = dict([[i + 1, fieldNames[i]] for i in range(0, len(fieldNames))])
+            
+            asCodec.__tagNames = tagNames
+            asCodec.__nameTags = nameTags
+    
+    ####################
+    # Binary envelopes #
+    ####################
+    
+    def __encodeBinary(self, dataDict):
+        """
+        Encode dataDict as a binary envelope. Known field names become their integer tags. Hex strings in the fields that hold frames are stored as raw bytes under the negative tag.
+        """
+        
+        nameTags = asCodec.__nameTags[asCodec.binVersion]
+        
+        # Swap in the tags for the names we know.
+        tagged = dict([[nameTags.get(thisName, thisName), thisVal] for thisName, thisVal in dataDict.iteritems()])
+        
+        # Store hex frame data as raw bytes.
+        for thisName in asCodec.__hexFields:
+            thisVal = dataDict.get(thisName)
+            
+            if (type(thisVal) in (str, unicode)) and (len(thisVal) % 2 == 0) and (thisVal == thisVal.lower()):
+                try:
+                    rawVal = binascii.unhexlify(thisVal)
+                
+                except (TypeError, ValueError):
+                    # Not really hex.
+                    continue
+                
+                thisTag = nameTags[thisName]
+                del tagged[thisTag]
+                tagged[0 - thisTag] = rawVal
+        
+        return asCodec.binMagic + chr(asCodec.binVersion) + msgpack.packb(tagged, use_bin_type=True)
+    
+    def __decodeBinary(self, msg):
+        """
+        Decode a binary envelope back into a dict with field names.
+        """
+        
+        # Make sure we can.
+        if msgpack is None:
+            raise ImportError("Decoding binary messages requires msgpack.")
+        
+        version = ord(msg[1])
+        
+        if version not in asCodec.__tagNames:
+            raise ValueError("Unsupported binary message version %s." %version)
+        
+        tagNames = asCodec.__tagNames[version]
+        nameTags = asCodec.__nameTags[version]
+        tagged = msgpack.unpackb(msg[2:], raw=False)
+        
+        # Turn raw bytes back into hex strings.
+        for thisName in asCodec.__hexFields:
+            thisTag = 0 - nameTags[thisName]
+            
+            if thisTag in tagged:
+                tagged[0 - thisTag] = binascii.hexlify(tagged.pop(thisTag))
+        
+        # Put the names back. Anything that isn't a tag is already a name.
+        retVal = dict([[tagNames.get(thisTag, thisTag), thisVal] for thisTag, thisVal in tagged.iteritems()])
+        
+        return retVal
+    
+    ##################
+    # Public methods #
+    ##################
+    
+    def encode(self, dataDict):
+        """
+        Encode dataDict in our message format. Returns a string.
+        """
+        
+        if self.__binary:
+            retVal = self.__encodeBinary(dataDict)
+        else:
+            retVal = json.dumps(dataDict)
+        
+        return retVal
+    
+    def decode(self, msg):
+        """
+        Decode a JSON or binary message. Returns whatever the message holds, which should be a dict.
+        """
+        
+        msg = str(msg)
+        
+        if msg[0:1] == asCodec.binMagic:
+            retVal = self.__decodeBinary(msg)
+        else:
+            retVal = json.loads(msg)
+        
+        return retVal
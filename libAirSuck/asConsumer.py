@@ -0,0 +1,377 @@
+"""
+asConsumer by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Reads messages from the connector queue for the state engines using Redis pub/sub, a Redis stream, shared memory ring buffers, or in-process queues depending on connPub['transport']. With a stream each state engine reads through a consumer group, so several workers can split the load and a restarted worker picks up where it left off. With rings every connector process on this machine writes its own ring and each state engine reads all of them. The local queues only work when airSuck.py runs the connectors and state engines in one process.
+"""
+
+###########
+# Imports #
+###########
+
+import sys
+sys.path.append("..")
+
+try:
+    import config
+except:
+    raise IOError("No configuration present. Please copy config/config.py to the airSuck folder and edit it.")
+
+import glob
+import os
+import socket
+import time
+import Queue
+import redis
+import asLocalQueue
+import asRedisPool
+import asRing
+
+
+####################
+# asConsumer class #
+####################
+
+class asConsumer:
+    #####################
+    # Class constructor #
+    #####################
+    
+    
+    def __init__(self, channels, groupName, consumerName=None):
+        """
+        asConsumer is a class that reads messages from the connector queue.
+        
+        The principal method is listen() which yields each message as a dict with the JSON string in 'data' like a Redis pub/sub message. listenBatch() yields lists of those messages instead. channels is a list of pub/sub channels or stream names. groupName is the consumer group we read the stream with, and consumerName tells the workers in a group apart. consumerName defaults to our host name and process ID so several workers on one machine each get their own messages. Messages another worker read but didn't acknowledge within connPub['streamClaimMs'], like when it died, get claimed by whoever checks next.
+        """
+        
+        # Make sure we have a transport we know about.
+        if config.connPub['transport'] not in ('pubsub', 'stream', 'both', 'ring', 'local'):
+            raise ValueError("Valid connPub transport not specified. Please use 'pubsub', 'stream', 'both', 'ring', or 'local'.")
+        
+        self.__channels = channels
+        self.__groupName = groupName
+        
+        if consumerName is None:
+            consumerName = "%s-%s" %(socket.gethostname(), os.getpid())
+        
+        self.__consumerName = consumerName
+        
+        # Redis queue.
+        self.__psQ = asRedisPool.asRedisPool().getRedis(config.connPub['host'], config.connPub['port'])
+        
+        # How many stream messages have we acknowledged, and how many of them did we claim from other workers?
+        self.ackCount = 0
+        self.claimCount = 0
+        
+        # How many ring messages did we lose because we fell behind?
+        self.overrunCount = 0
+    
+    ###################
+    # Stream handling #
+    ###################
+    
+    def __createGroups(self):
+        """
+        Create our consumer group on each stream if it doesn't exist yet. New groups start with new messages.
+        """
+        
+        for thisChannel in self.__channels:
+            try:
+                self.__psQ.xgroup_create(thisChannel, self.__groupName, id="$", mkstream=True)
+            
+            except redis.ResponseError as e:
+                # We already have the group.
+                if not str(e).startswith("BUSYGROUP"):
+                    raise
+    
+    def __nextID(self, msgID):
+        """
+        Get the stream message ID right after msgID.
+        """
+        
+        msTime, seq = str(msgID).split("-")
+        
+        return "%s-%s" %(msTime, int(seq) + 1)
+    
+    def __claimIdle(self):
+        """
+        Yield lists of messages other workers in our group read but didn't acknowledge within connPub['streamClaimMs'], claiming and acknowledging them as we go. Then drop workers from the group that have been gone that long and don't have any messages left, since every restart joins with a new name.
+        """
+        
+        claimMs = int(config.connPub['streamClaimMs'])
+        
+        for thisChannel in self.__channels:
+            startID = "-"
+            
+            while True:
+                pending = self.__psQ.xpending_range(thisChannel, self.__groupName, startID, "+", config.connPub['streamBatch'])
+                
+                if len(pending) == 0:
+                    break
+                
+                claimIDs = [entry['message_id'] for entry in pending if (entry['consumer'] != self.__consumerName) and (entry['time_since_delivered'] >= claimMs)]
+                
+                if len(claimIDs) > 0:
+                    # Claiming checks the idle time again, so we don't take messages another worker just claimed.
+                    messages = self.__psQ.xclaim(thisChannel, self.__groupName, self.__consumerName, claimMs, claimIDs)
+                    
+                    # Messages trimmed from the stream come back empty, and without an ID before Redis 7.
+                    ackIDs = [msgID for msgID, fields in messages if msgID is not None]
+                    batch = [{'type': "message", 'channel': thisChannel, 'data': fields['data']} for msgID, fields in messages if fields]
+                    
+                    if len(batch) > 0:
+                        yield batch
+                    
+                    if len(ackIDs) > 0:
+                        self.__psQ.xack(thisChannel, self.__groupName, *ackIDs)
+                        self.ackCount += len(ackIDs)
+                        self.claimCount += len(ackIDs)
+                
+                if len(pending) < config.connPub['streamBatch']:
+                    break
+                
+                startID = self.__nextID(pending[-1]['message_id'])
+            
+            for consumer in self.__psQ.xinfo_consumers(thisChannel, self.__groupName):
+                if (consumer['name'] != self.__consumerName) and (consumer['pending'] == 0) and (consumer['idle'] >= claimMs):
+                    self.__psQ.xgroup_delconsumer(thisChannel, self.__groupName, consumer['name'])
+    
+    def __listenStream(self):
+        """
+        Yield lists of messages from our streams through our consumer group, acknowledging each batch after we've handled it.
+        """
+        
+        self.__createGroups()
+        
+        # Start with any messages we read before but never acknowledged, then move on to new ones.
+        streamIDs = dict([[thisChannel, "0"] for thisChannel in self.__channels])
+        lastClaim = 0.0
+        
+        while True:
+            # Now and then pick up messages from workers that went away.
+            if (time.time() - lastClaim) >= (config.connPub['streamClaimMs'] / 1000.0):
+                for batch in self.__claimIdle():
+                    yield batch
+                
+                lastClaim = time.time()
+            
+            results = self.__psQ.xreadgroup(self.__groupName, self.__consumerName, streamIDs, count=config.connPub['streamBatch'], block=config.connPub['streamBlockMs'])
+            
+            # Keep track of which streams have old messages left.
+            gotOld = set()
+            
+            for streamName, messages in results:
+                ackIDs = []
+                batch = []
+                
+                for msgID, fields in messages:
+                    ackIDs.append(msgID)
+                    
+                    if streamIDs[streamName] == "0":
+                        gotOld.add(streamName)
+                    
+                    # Messages trimmed from the stream before we got to them come back empty.
+                    if fields:
+                        batch.append({'type': "message", 'channel': streamName, 'data': fields['data']})
+                
+                if len(batch) > 0:
+                    yield batch
+                
+                # Acknowledge the whole batch at once.
+                if len(ackIDs) > 0:
+                    self.__psQ.xack(streamName, self.__groupName, *ackIDs)
+                    self.ackCount += len(ackIDs)
+            
+            # Once we're out of old messages on a stream read new ones.
+            for thisChannel in self.__channels:
+                if (streamIDs[thisChannel] == "0") and (thisChannel not in gotOld):
+                    streamIDs[thisChannel] = ">"
+    
+    ####################
+    # Pub/sub handling #
+    ####################
+    
+    def __listenPubSub(self):
+        """
+        Yield lists of messages from our pub/sub channels. We wait up to streamBlockMs for a message, then take whatever else is already waiting up to streamBatch messages so we never hold a message back to fill a batch.
+        """
+        
+        # Subscribe to the connector pub/sub queue.
+        psObj = self.__psQ.pubsub()
+        psObj.subscribe(self.__channels)
+        
+        blockSec = config.connPub['streamBlockMs'] / 1000.0
+        
+        while True:
+            work = psObj.get_message(timeout=blockSec)
+            
+            if work is None:
+                continue
+            
+            batch = [work]
+            
+            while len(batch) < config.connPub['streamBatch']:
+                work = psObj.get_message()
+                
+                if work is None:
+                    break
+                
+                batch.append(work)
+            
+            yield batch
+    
+    #################
+    # Ring handling #
+    #################
+    
+    def __scanRings(self, rings, deadRings, fromOldest):
+        """
+        Open any rings for our channels that showed up since we last looked, and close the ones whose writer went away once we've read everything in them. rings is a dict of path -> [channel, ring] and deadRings is a set of paths we're done with. New rings are read from the oldest message in them if fromOldest is True, or from the next message written if not.
+        """
+        
+        # Find new rings.
+        for thisChannel in self.__channels:
+            for ringPath in glob.glob(os.path.join(config.connRing['dir'], "%s-*.ring" %thisChannel)):
+                if (ringPath not in rings) and (ringPath not in deadRings):
+                    try:
+                        rings[ringPath] = [thisChannel, asRing.asRing(ringPath, fromOldest=fromOldest)]
+                    
+                    except (IOError, OSError, ValueError):
+                        # The ring went away or isn't a ring.
+                        deadRings.add(ringPath)
+        
+        # Drop rings nobody is writing to any more.
+        for ringPath in rings.keys():
+            thisChannel, ring = rings[ringPath]
+            
+            if not ring.writerAlive():
+                overruns = ring.overrunCount
+                
+                for msg in ring.read(config.connRing['slots']):
+                    yield {'type': "message", 'channel': thisChannel, 'data': msg}
+                
+                self.overrunCount += ring.overrunCount - overruns
+                ring.close()
+                del rings[ringPath]
+                deadRings.add(ringPath)
+    
+    def __listenRing(self):
+        """
+        Yield lists of messages from the rings for our channels, checking for new rings every connRing['scanSec'] seconds. Like pub/sub we start with new messages in the rings that are already there, but rings that show up later are read from the start so we don't miss what a new connector wrote before we found it.
+        """
+        
+        rings = {}
+        deadRings = set()
+        lastScan = 0.0
+        pollSec = config.connRing['pollMs'] / 1000.0
+        
+        while True:
+            if (time.time() - lastScan) >= config.connRing['scanSec']:
+                batch = list(self.__scanRings(rings, deadRings, lastScan > 0.0))
+                lastScan = time.time()
+                
+                if len(batch) > 0:
+                    yield batch
+            
+            gotMsgs = False
+            
+            # Take a batch from each ring so one busy ring can't starve the rest.
+            for thisChannel, ring in rings.values():
+                overruns = ring.overrunCount
+                msgs = ring.read(config.connPub['streamBatch'])
+                self.overrunCount += ring.overrunCount - overruns
+                
+                if len(msgs) > 0:
+                    gotMsgs = True
+                    
+                    yield [{'type': "message", 'channel': thisChannel, 'data': msg} for msg in msgs]
+            
+            # Wait for more if we didn't get anything.
+            if not gotMsgs:
+                time.sleep(pollSec)
+    
+    ##################
+    # Local handling #
+    ##################
+    
+    def __listenLocal(self):
+        """
+        Yield lists of messages from the in-process queues for our channels. We wait for a message, then take whatever else is already waiting up to streamBatch messages. Our queue goes away when we're done with the generator so nobody keeps filling it.
+        """
+        
+        localQ = asLocalQueue.asLocalQueue()
+        subQueue = localQ.subscribe(self.__channels)
+        
+        try:
+            while True:
+                # Waiting without a timeout wakes us up as soon as a message shows up.
+                batch = [subQueue.get()]
+                
+                while len(batch) < config.connPub['streamBatch']:
+                    try:
+                        batch.append(subQueue.get_nowait())
+                    
+                    except Queue.Empty:
+                        break
+                
+                yield batch
+        
+        finally:
+            localQ.unsubscribe(self.__channels, subQueue)
+    
+    ##################
+    # Public methods #
+    ##################
+    
+    def listen(self):
+        """
+        Yield each message we get from the connector queue as a dict with the JSON string in 'data'.
+        """
+        
+        if config.connPub['transport'] == "pubsub":
+            # Subscribe to the connector pub/sub queue.
+            psObj = self.__psQ.pubsub()
+            psObj.subscribe(self.__channels)
+            
+            for work in psObj.listen():
+                yield work
+        
+        elif config.connPub['transport'] == "ring":
+            for batch in self.__listenRing():
+                for work in batch:
+                    yield work
+        
+        elif config.connPub['transport'] == "local":
+            for batch in self.__listenLocal():
+                for work in batch:
+                    yield work
+        
+        else:
+            for batch in self.__listenStream():
+                for work in batch:
+                    yield work
+    
+    def listenBatch(self):
+        """
+        Yield lists of up to connPub['streamBatch'] messages from the connector queue. Each message is a dict with the JSON string in 'data'. Stream messages in a list are acknowledged once we're asked for the next list.
+        """
+        
+        if config.connPub['transport'] == "pubsub":
+            for batch in self.__listenPubSub():
+                yield batch
+        
+        elif config.connPub['transport'] == "ring":
+            for batch in self.__listenRing():
+                yield batch
+        
+        elif config.connPub['transport'] == "local":
+            for batch in self.__listenLocal():
+                yield batch
+        
+        else:
+            for batch in self.__listenStream():
+                yield batch
@@ -0,0 +1,191 @@
+"""
+asDedupe by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Keeps track of frames and payloads we've seen within the last n seconds so the connectors can drop duplicates without a Redis round trip for every frame. We keep the time we recorded each key in a hash table, and the keys are also filed in time buckets that each cover part of the TTL so old keys can be thrown away a bucket at a time as time moves on.
+"""
+
+###########
+# Imports #
+###########
+
+import hashlib
+import threading
+import time
+import uuid
+import asRedisPool
+
+
+##################
+# asDedupe class #
+##################
+
+class asDedupe:
+    #####################
+    # Class constructor #
+    #####################
+    
+    
+    def __init__(self, ttlSec, keyPrefix, mode="local", host=None, port=None, syncMs=100.0, buckets=4):
+        """
+        asDedupe is a class that decides whether we've seen a frame or payload within the last ttlSec seconds.
+        
+        The principal method is seen(key) which returns True if the key was seen recently, and records it if not.
+        
+        The mode can be 'local' to keep everything in this process, 'sync' to also share the keys we've seen with other processes on the same Redis host every syncMs milliseconds, or 'redis' to check and set every key on the Redis host like we used to. keyPrefix keeps Redis keys and sync channels for different types of data apart. Keys are held in memory for at most ttlSec + (ttlSec / buckets) seconds.
+        """
+        
+        # Make sure we have a mode we know about.
+        if mode not in ('local', 'sync', 'redis'):
+            raise ValueError("Valid dedupe mode not specified. Please use 'local', 'sync', or 'redis'.")
+        
+        self.__ttlSec = ttlSec
+        self.__keyPrefix = keyPrefix
+        self.__mode = mode
+        
+        # When did we record each key?
+        self.__keyTimes = {}
+        
+        # How much time does each bucket cover?
+        self.__bucketSec = float(ttlSec) / buckets
+        
+        # We keep one more bucket than we need to cover the TTL so keys never expire early.
+        self.__bucketCount = buckets + 1
+        
+        # Our buckets as [bucket number, list of keys] with the oldest first.
+        self.__buckets = []
+        
+        # The connectors call us from several threads at once.
+        self.__lock = threading.Lock()
+        
+        # How many duplicates have we seen?
+        self.dupeCount = 0
+        
+        # Set up Redis if we need it.
+        if mode != "local":
+            self.__redis = asRedisPool.asRedisPool().getRedis(host, port)
+        
+        # If we're syncing with other processes...
+        if mode == "sync":
+            # Figure out who we are so we can ignore our own keys.
+            self.__myID = uuid.uuid4().hex
+            
+            # Keys we've added since we last synced.
+            self.__pending = []
+            
+            self.__syncSec = syncMs / 1000.0
+            self.__lastSync = 0.0
+            
+            # Listen for the keys the other processes have seen.
+            self.__syncQ = keyPrefix + "dedupeSync"
+            self.__pubSub = self.__redis.pubsub(ignore_subscribe_messages=True)
+            self.__pubSub.subscribe(self.__syncQ)
+    
+    ##################
+    # Key expiration #
+    ##################
+    
+    def __addKey(self, key, now):
+        """
+        Record key as seen at now, throwing away any buckets of keys that are too old.
+        """
+        
+        bucketNum = int(now / self.__bucketSec)
+        
+        # If we need a new bucket...
+        if (len(self.__buckets) == 0) or (self.__buckets[-1][0] != bucketNum):
+            self.__buckets.append([bucketNum, []])
+            
+            # Drop the buckets that are past the TTL.
+            while self.__buckets[0][0] <= (bucketNum - self.__bucketCount):
+                oldBucket = self.__buckets.pop(0)
+                
+                for oldKey in oldBucket[1]:
+                    # Only forget the key if it wasn't recorded again since.
+                    if (oldKey in self.__keyTimes) and (int(self.__keyTimes[oldKey] / self.__bucketSec) == oldBucket[0]):
+                        del self.__keyTimes[oldKey]
+        
+        self.__keyTimes[key] = now
+        self.__buckets[-1][1].append(key)
+    
+    def __sync(self, now):
+        """
+        Send the keys we've added since the last sync to the other processes, and add the keys they've sent us.
+        """
+        
+        # If we have new keys send them all at once with our ID on top.
+        if len(self.__pending) > 0:
+            self.__redis.publish(self.__syncQ, "\n".join([self.__myID] + self.__pending))
+            self.__pending = []
+        
+        # Get everything the other processes sent us.
+        message = self.__pubSub.get_message()
+        
+        while message is not None:
+            if message['type'] == "message":
+                keys = message['data'].split("\n")
+                
+                # Skip our own keys.
+                if keys[0] != self.__myID:
+                    for thisKey in keys[1:]:
+                        self.__addKey(thisKey, now)
+            
+            message = self.__pubSub.get_message()
+        
+        self.__lastSync = now
+    
+    ##################
+    # Public methods #
+    ##################
+    
+    def seen(self, key, now=None):
+        """
+        Returns True if we've seen key within the TTL, and False if not. A key we haven't seen gets recorded so the next one is a duplicate. now can be set to a time.time() style timestamp to use instead of the current time.
+        """
+        
+        # Old-style Redis dedupe.
+        if self.__mode == "redis":
+            # Set up a hashed version of our data.
+            dHash = self.__keyPrefix + hashlib.md5(key).hexdigest()
+            
+            # Set the key and insert lame value if it's not in the redis cache already. Doing both at once means two processes that get the same frame can't both let it through.
+            retVal = not self.__redis.set(dHash, "X", ex=self.__ttlSec, nx=True)
+            
+            if retVal:
+                with self.__lock:
+                    self.dupeCount += 1
+        
+        else:
+            if now is None:
+                now = time.time()
+            
+            with self.__lock:
+                # Sync with other processes if it's time.
+                if (self.__mode == "sync") and ((now - self.__lastSync) >= self.__syncSec):
+                    self.__sync(now)
+                
+                # See if we have a copy of the key within the TTL.
+                keyTime = self.__keyTimes.get(key)
+                retVal = (keyTime is not None) and ((now - keyTime) < self.__ttlSec)
+                
+                if retVal:
+                    self.dupeCount += 1
+                
+                else:
+                    self.__addKey(key, now)
+                    
+                    # Let the other processes know about it next time we sync.
+                    if self.__mode == "sync":
+                        self.__pending.append(key)
+        
+        return retVal
+    
+    def keyCount(self):
+        """
+        Get the number of keys we're holding.
+        """
+        
+        return len(self.__keyTimes)
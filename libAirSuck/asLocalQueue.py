@@ -0,0 +1,124 @@
+"""
+asLocalQueue by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Bounded queues that let the connectors, state engines, and MongoDB dumpers hand each other messages inside one process when airSuck.py runs them together. It works like Redis pub/sub: every subscriber to a channel gets its own queue with every message published on the channel after it subscribed, and messages published on a channel nobody subscribed to go nowhere. When a subscriber's queue is full the publisher waits up to connLocal['blockMs'] for room, then drops what doesn't fit and counts it.
+"""
+
+###########
+# Imports #
+###########
+
+import sys
+sys.path.append("..")
+
+try:
+    import config
+except:
+    raise IOError("No configuration present. Please copy config/config.py to the airSuck folder and edit it.")
+
+import threading
+import Queue
+
+
+######################
+# asLocalQueue class #
+######################
+
+class asLocalQueue:
+    # Subscriber queues shared by every instance as channel -> list of queues, and how many messages each channel dropped because a queue was full.
+    __subscribers = {}
+    __dropCounts = {}
+    __subLock = threading.Lock()
+    
+    #####################
+    # Class constructor #
+    #####################
+    
+    
+    def __init__(self):
+        """
+        asLocalQueue is a class that passes messages between threads in this process.
+        
+        The principal methods are publish(channel, msgList) and subscribe(channels), which returns a Queue.Queue that gets a dict for every message like the ones Redis pub/sub hands out, with the message in 'data'. Every asLocalQueue object in this process sees the same channels.
+        """
+        
+        pass
+    
+    ##################
+    # Public methods #
+    ##################
+    
+    def subscribe(self, channels, maxMsgs=None):
+        """
+        Get a new queue that holds up to maxMsgs messages published on any of the channels in the list channels from now on. maxMsgs defaults to connLocal['maxMsgs'].
+        """
+        
+        if maxMsgs is None:
+            maxMsgs = config.connLocal['maxMsgs']
+        
+        retVal = Queue.Queue(maxMsgs)
+        
+        with asLocalQueue.__subLock:
+            for thisChannel in channels:
+                # Copy the list so publishers going through the old one don't see it change.
+                asLocalQueue.__subscribers[thisChannel] = asLocalQueue.__subscribers.get(thisChannel, []) + [retVal]
+                asLocalQueue.__dropCounts.setdefault(thisChannel, 0)
+        
+        return retVal
+    
+    def unsubscribe(self, channels, subQueue):
+        """
+        Stop putting messages from the channels in the list channels on subQueue.
+        """
+        
+        with asLocalQueue.__subLock:
+            for thisChannel in channels:
+                asLocalQueue.__subscribers[thisChannel] = [thisQueue for thisQueue in asLocalQueue.__subscribers.get(thisChannel, []) if thisQueue is not subQueue]
+    
+    def publish(self, channel, msgList):
+        """
+        Put each message in msgList on the queue of every subscriber to channel. Returns the number of messages dropped because a queue was full.
+        """
+        
+        retVal = 0
+        
+        # Every subscriber gets the same dict for a message, so nobody should change them.
+        works = [{'type': "message", 'channel': channel, 'data': msg} for msg in msgList]
+        
+        for thisQueue in asLocalQueue.__subscribers.get(channel, []):
+            blockSec = config.connLocal['blockMs'] / 1000.0
+            
+            for i in range(0, len(works)):
+                try:
+                    if blockSec > 0:
+                        thisQueue.put(works[i], True, blockSec)
+                    else:
+                        thisQueue.put_nowait(works[i])
+                
+                except Queue.Full:
+                    # Once we've waited for a queue don't wait again for the rest of the batch.
+                    retVal += 1
+                    blockSec = 0
+        
+        if retVal > 0:
+            with asLocalQueue.__subLock:
+                asLocalQueue.__dropCounts[channel] += retVal
+        
+        return retVal
+    
+    def stats(self):
+        """
+        Get a dict of channel -> [messages waiting in each subscriber's queue, messages dropped because a queue was full].
+        """
+        
+        retVal = {}
+        
+        with asLocalQueue.__subLock:
+            for thisChannel, subQueues in asLocalQueue.__subscribers.iteritems():
+                retVal[thisChannel] = [[thisQueue.qsize() for thisQueue in subQueues], asLocalQueue.__dropCounts[thisChannel]]
+        
+        return retVal
@@ -0,0 +1,279 @@
+"""
+asPublisher by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Collects JSON messages from the connector handlers and sends them to the connector reliable and pub/sub queues (or stream) in batches through a Redis pipeline instead of making two Redis round trips for every message. With the ring transport messages for the state engines go to a shared memory ring buffer instead of Redis, and with the local transport they go straight to in-process queues for the state engines and MongoDB dumper running alongside us in airSuck.py without waiting for a batch.
+"""
+
+###########
+# Imports #
+###########
+
+import sys
+sys.path.append("..")
+
+try:
+    import config
+except:
+    raise IOError("No configuration present. Please copy config/config.py to the airSuck folder and edit it.")
+
+import atexit
+import os
+import threading
+import time
+import uuid
+import asLog
+import asLocalQueue
+import asRedisPool
+import asRing
+
+
+#####################
+# asPublisher class #
+#####################
+
+class asPublisher:
+    #####################
+    # Class constructor #
+    #####################
+    
+    
+    def __init__(self, logMode, maxMsgs=None, maxMs=None):
+        """
+        asPublisher is a class that batches messages for the connector queues.
+        
+        The principal method is publish(jsonMsg). Messages get sent once we have maxMsgs of them or the oldest one has waited maxMs milliseconds, whichever comes first. These default to connPubBatch['maxMsgs'] and connPubBatch['maxMs']. Anything we're still holding is sent when flush() or close() is called, and close() is called when the program exits. If Redis is down we hold on to up to connPubBatch['maxHeld'] messages and try again every connPubBatch['retrySec'] seconds. Only flush() and close() raise Redis errors.
+        """
+        
+        # Set up the logger.
+        self.__logger = asLog.asLog(logMode)
+        
+        # Batch limits.
+        if maxMsgs is None:
+            maxMsgs = config.connPubBatch['maxMsgs']
+        
+        if maxMs is None:
+            maxMs = config.connPubBatch['maxMs']
+        
+        self.__maxMsgs = maxMsgs
+        self.__maxSec = maxMs / 1000.0
+        
+        # Make sure we have a transport we know about.
+        if config.connPub['transport'] not in ('pubsub', 'stream', 'both', 'ring', 'local'):
+            raise ValueError("Valid connPub transport not specified. Please use 'pubsub', 'stream', 'both', 'ring', or 'local'.")
+        
+        # Redis queues. If they live in the same place we only need one pipeline.
+        redisPool = asRedisPool.asRedisPool()
+        self.__psQ = redisPool.getRedis(config.connPub['host'], config.connPub['port'])
+        
+        if (config.connRel['host'] == config.connPub['host']) and (config.connRel['port'] == config.connPub['port']):
+            self.__rQ = self.__psQ
+        else:
+            self.__rQ = redisPool.getRedis(config.connRel['host'], config.connRel['port'])
+        
+        # If we're handing messages to the state engines through a ring buffer set up our own ring. We also keep track of how many messages at the start of the batch are already in the ring.
+        self.__ring = None
+        self.__ringSent = 0
+        
+        if config.connPub['transport'] == "ring":
+            ringName = "%s-%s-%s.ring" %(config.connPub['qName'], os.getpid(), uuid.uuid4().hex[0:8])
+            self.__ring = asRing.asRing(os.path.join(config.connRing['dir'], ringName), True, config.connRing['slots'], config.connRing['slotSize'])
+        
+        # If the state engines are in this process use the local queues.
+        self.__localQ = None
+        
+        if config.connPub['transport'] == "local":
+            self.__localQ = asLocalQueue.asLocalQueue()
+        
+        # How many messages did we drop because the local queues were full or we were holding too many while Redis was down?
+        self.dropCount = 0
+        
+        # Messages waiting to go out, and when the oldest one showed up.
+        self.__batch = []
+        self.__batchTime = None
+        
+        # Don't try Redis again before this time after a batch fails.
+        self.__retryTime = 0.0
+        
+        # How many messages and batches have we sent?
+        self.msgCount = 0
+        self.batchCount = 0
+        
+        # The connectors call us from several threads at once.
+        self.__lock = threading.Lock()
+        
+        # Make sure we send everything we have when the program exits.
+        self.__running = True
+        atexit.register(self.close)
+        
+        # Send batches that have waited long enough even if nothing else shows up.
+        self.__timer = threading.Thread(target=self.__timerWorker)
+        self.__timer.daemon = True
+        self.__timer.start()
+    
+    ####################
+    # Batch processing #
+    ####################
+    
+    def __send(self):
+        """
+        Send the messages we're holding through a pipeline. This has to be called with the lock held. If Redis blows up the messages are kept so they go out with the next batch, and the exception is raised again. We keep up to connPubBatch['maxHeld'] messages and drop the oldest ones past that.
+        """
+        
+        # Take the batch we have.
+        batch = self.__batch
+        self.__batch = []
+        self.__batchTime = None
+        
+        if len(batch) > 0:
+            # The ring doesn't need Redis, so it gets each message once even if we have to hang on to the batch for Redis.
+            if self.__ring is not None:
+                for jsonMsg in batch[self.__ringSent:]:
+                    if self.__ring.write(jsonMsg) == False:
+                        self.__logger.log("asPublisher dropped a %s byte message that doesn't fit in a ring slot." %len(jsonMsg))
+                
+                self.__ringSent = 0
+            
+            try:
+                # Build our pipelines.
+                pubPipe = self.__psQ.pipeline(transaction=False)
+                
+                if self.__rQ is self.__psQ:
+                    relPipe = pubPipe
+                else:
+                    relPipe = self.__rQ.pipeline(transaction=False)
+                
+                # If we are configured to use the connector mongoDB forward the traffic to it, unless it's getting it from the local queues.
+                if (config.connMongo['enabled'] == True) and (self.__localQ is None):
+                    relPipe.rpush(config.connRel['qName'], *batch)
+                    
+                    if relPipe is not pubPipe:
+                        relPipe.execute()
+                
+                # Put data on the pub/sub queue and/or stream. With the local queues pub/sub is only for clients outside this process.
+                pubSub = (config.connPub['transport'] in ('pubsub', 'both')) or ((self.__localQ is not None) and (config.connLocal['pubExternal'] == True))
+                
+                for jsonMsg in batch:
+                    if pubSub:
+                        pubPipe.publish(config.connPub['qName'], jsonMsg)
+                    
+                    if config.connPub['transport'] in ('stream', 'both'):
+                        pubPipe.xadd(config.connPub['qName'], {'data': jsonMsg}, maxlen=config.connPub['streamMaxLen'])
+                
+                pubPipe.execute()
+                
+                self.msgCount += len(batch)
+                self.batchCount += 1
+            
+            except:
+                # Hang on to the messages so we don't lose them. The reliable queue might see some of them twice.
+                self.__batch = batch + self.__batch
+                self.__batchTime = time.time()
+                self.__retryTime = time.time() + config.connPubBatch['retrySec']
+                
+                # If we're holding too many drop the oldest ones.
+                dropped = len(self.__batch) - config.connPubBatch['maxHeld']
+                
+                if dropped > 0:
+                    self.__batch = self.__batch[dropped:]
+                    self.dropCount += dropped
+                    self.__logger.log("asPublisher dropped the %s oldest messages it was holding because Redis is down." %dropped)
+                
+                # Everything we're still holding is already in the ring.
+                self.__ringSent = len(self.__batch)
+                
+                raise
+    
+    def __trySend(self):
+        """
+        Send the messages we're holding unless we're waiting to try Redis again, and log it instead of raising if Redis blows up. This has to be called with the lock held.
+        """
+        
+        if time.time() >= self.__retryTime:
+            try:
+                self.__send()
+            
+            except Exception as e:
+                self.__logger.log("asPublisher failed to send a batch, holding %s messages: %s" %(len(self.__batch), e))
+    
+    def __timerWorker(self):
+        """
+        Send batches where the oldest message has waited at least maxMs milliseconds.
+        """
+        
+        # Hang on to these since module globals go away before daemon threads do when python exits.
+        sleep = time.sleep
+        getTime = time.time
+        
+        while True:
+            # Check twice as often as maxMs so nothing waits much longer than that.
+            sleep(self.__maxSec / 2.0)
+            
+            # Stop once we've been closed.
+            if not self.__running:
+                break
+            
+            with self.__lock:
+                if (self.__batchTime is not None) and ((getTime() - self.__batchTime) >= self.__maxSec):
+                    self.__trySend()
+    
+    def __publishLocal(self, jsonMsg):
+        """
+        Put a message on the local queues for the state engines and the connector MongoDB dumper in this process. This has to be called with the lock held.
+        """
+        
+        self.dropCount += self.__localQ.publish(config.connPub['qName'], [jsonMsg])
+        
+        if config.connMongo['enabled'] == True:
+            self.dropCount += self.__localQ.publish(config.connRel['qName'], [jsonMsg])
+    
+    ##################
+    # Public methods #
+    ##################
+    
+    def publish(self, jsonMsg):
+        """
+        Queue up a JSON message for the connector queues, sending the batch if it's full or the oldest message has waited long enough. The local queues don't need round trips to Redis, so they get each message right away and only what goes to Redis waits for a batch. This doesn't raise if Redis is down.
+        """
+        
+        with self.__lock:
+            if self.__localQ is not None:
+                self.__publishLocal(jsonMsg)
+            
+            # With the local queues Redis only gets messages for clients outside this process.
+            if (self.__localQ is None) or (config.connLocal['pubExternal'] == True):
+                self.__batch.append(jsonMsg)
+                
+                if self.__batchTime is None:
+                    self.__batchTime = time.time()
+                
+                # Send the batch if it's time.
+                if (len(self.__batch) >= self.__maxMsgs) or ((time.time() - self.__batchTime) >= self.__maxSec):
+                    self.__trySend()
+    
+    def flush(self):
+        """
+        Send any messages we're holding right now, even if we're waiting to try Redis again. This raises an exception if Redis blows up.
+        """
+        
+        with self.__lock:
+            self.__send()
+    
+    def close(self):
+        """
+        Stop sending batches on our own, send any messages we're holding, and get rid of our ring if we have one.
+        """
+        
+        self.__running = False
+        
+        try:
+            self.flush()
+        
+        finally:
+            if self.__ring is not None:
+                with self.__lock:
+                    self.__ring.close()
+                    self.__ring = None
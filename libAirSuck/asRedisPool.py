@@ -0,0 +1,105 @@
+"""
+asRedisPool by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Hands out Redis clients that share one connection pool per Redis server and database for the whole process, so the handlers, state engines, and every data source thread aren't each holding their own sockets. Redis servers on this machine can be reached over a Unix domain socket, and every connection gets the same timeouts and keepalive settings from redisConn in the config.
+"""
+
+###########
+# Imports #
+###########
+
+import sys
+sys.path.append("..")
+
+try:
+    import config
+except:
+    raise IOError("No configuration present. Please copy config/config.py to the airSuck folder and edit it.")
+
+import threading
+import redis
+
+
+#####################
+# asRedisPool class #
+#####################
+
+class asRedisPool:
+    # Connection pools shared by every instance as (host, port, db) -> pool.
+    __pools = {}
+    __poolLock = threading.Lock()
+    
+    #####################
+    # Class constructor #
+    #####################
+    
+    
+    def __init__(self):
+        """
+        asRedisPool is a class that gets Redis clients on shared connection pools.
+        
+        The principal method is getRedis(host, port, db) which returns a redis.StrictRedis object. Every client for the same host, port, and db in this process shares a pool, no matter which asRedisPool object it came from.
+        """
+        
+        pass
+    
+    #########
+    # Pools #
+    #########
+    
+    def __buildPool(self, host, port, db):
+        """
+        Build a connection pool for host, port, and db using the settings in redisConn.
+        """
+        
+        # Settings we use for both kinds of connection.
+        poolArgs = {'db': db, 'socket_timeout': config.redisConn['timeoutSec']}
+        
+        if config.redisConn['maxConnections'] is not None:
+            poolArgs['max_connections'] = config.redisConn['maxConnections']
+        
+        # Health checks need redis-py 3.3 or newer so only ask for them if we want them.
+        if config.redisConn['healthCheckSec'] > 0:
+            poolArgs['health_check_interval'] = config.redisConn['healthCheckSec']
+        
+        # If the server has a Unix domain socket use it.
+        socketPath = config.redisConn['unixSockets'].get("%s:%s" %(host, port))
+        
+        if socketPath is not None:
+            poolArgs.update({'connection_class': redis.UnixDomainSocketConnection, 'path': socketPath})
+        
+        else:
+            poolArgs.update({'host': host, 'port': port, 'socket_connect_timeout': config.redisConn['connectTimeoutSec'], 'socket_keepalive': config.redisConn['keepAlive']})
+        
+        return redis.ConnectionPool(**poolArgs)
+    
+    ##################
+    # Public methods #
+    ##################
+    
+    def getRedis(self, host, port, db=0):
+        """
+        Get a redis.StrictRedis object for db on the Redis server at host and port that uses our shared pool for that server.
+        """
+        
+        poolKey = (host, port, db)
+        
+        with asRedisPool.__poolLock:
+            pool = asRedisPool.__pools.get(poolKey)
+            
+            if pool is None:
+                pool = self.__buildPool(host, port, db)
+                asRedisPool.__pools[poolKey] = pool
+        
+        return redis.StrictRedis(connection_pool=pool)
+    
+    def poolCount(self):
+        """
+        Get the number of connection pools we have.
+        """
+        
+        return len(asRedisPool.__pools)
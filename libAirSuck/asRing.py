@@ -0,0 +1,200 @@
+"""
+asRing by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+A ring buffer of fixed size message slots in a memory mapped file, so connectors can hand messages to state engines on the same machine without going through Redis. One process writes to each ring and any number of processes can read it, each at their own pace. Nothing is locked: each slot carries the sequence number of the message in it, and a reader that finds a different sequence number before or after copying a message knows the writer lapped it and counts the message as overrun.
+
+The file starts with a 64 byte header: an 8 byte magic string, the slot count and slot size as 32 bit ints, the sequence number of the last message written as a 64 bit int, and the writer's PID as a 32 bit int. Each slot holds a 64 bit sequence number, a 32 bit message length, and the message. Everything is little endian.
+"""
+
+###########
+# Imports #
+###########
+
+import errno
+import mmap
+import os
+import struct
+
+
+################
+# asRing class #
+################
+
+class asRing:
+    # Start of every ring file.
+    ringMagic = "asRing1\0"
+    
+    # Size of the file header and of each slot header.
+    headerSize = 64
+    slotHeaderSize = 12
+    
+    #####################
+    # Class constructor #
+    #####################
+    
+    
+    def __init__(self, path, create=False, slots=None, slotSize=None, fromOldest=False):
+        """
+        asRing is a class that reads or writes a ring buffer in the file at path.
+        
+        The principal methods are write(msg) for the process that creates the ring and read(maxMsgs) for everyone else. If create is True we make a new ring with slots slots of slotSize bytes, each of which holds a message of up to slotSize - 12 bytes. Otherwise we open an existing ring to read it, starting with the next message written, or with the oldest message still in the ring if fromOldest is True.
+        """
+        
+        self.__path = path
+        self.__writer = create
+        
+        # How many messages have we written, how many were too big for a slot, how many have we read, and how many did we lose because the writer lapped us?
+        self.writeCount = 0
+        self.tooBigCount = 0
+        self.readCount = 0
+        self.overrunCount = 0
+        
+        if create:
+            self.__slots = slots
+            self.__slotSize = slotSize
+            
+            # Build the file under another name so readers never see it half done.
+            tmpPath = path + ".tmp"
+            
+            with open(tmpPath, "wb") as ringFile:
+                ringFile.truncate(asRing.headerSize + (slots * slotSize))
+            
+            ringFile = open(tmpPath, "r+b")
+            self.__mm = mmap.mmap(ringFile.fileno(), 0)
+            ringFile.close()
+            
+            self.__mm[0:8] = asRing.ringMagic
+            struct.pack_into("<IIQI", self.__mm, 8, slots, slotSize, 0, os.getpid())
+            
+            os.rename(tmpPath, path)
+            
+            self.__seq = 0
+            self.__pid = os.getpid()
+        
+        else:
+            ringFile = open(path, "rb")
+            self.__mm = mmap.mmap(ringFile.fileno(), 0, access=mmap.ACCESS_READ)
+            ringFile.close()
+            
+            if self.__mm[0:8] != asRing.ringMagic:
+                self.__mm.close()
+                raise ValueError("%s isn't a ring buffer." %path)
+            
+            self.__slots, self.__slotSize, self.__seq, self.__pid = struct.unpack_from("<IIQI", self.__mm, 8)
+            
+            if fromOldest:
+                self.__seq = max(0, self.__seq - self.__slots)
+        
+        self.__maxLen = self.__slotSize - asRing.slotHeaderSize
+    
+    ###################
+    # Slot management #
+    ###################
+    
+    def __slotOffset(self, seq):
+        """
+        Get the offset of the slot for message number seq.
+        """
+        
+        return asRing.headerSize + (((seq - 1) % self.__slots) * self.__slotSize)
+    
+    ##################
+    # Public methods #
+    ##################
+    
+    def write(self, msg):
+        """
+        Write msg to the next slot. Returns False if msg is too big for a slot, True otherwise.
+        """
+        
+        if len(msg) > self.__maxLen:
+            self.tooBigCount += 1
+            
+            return False
+        
+        seq = self.__seq + 1
+        offset = self.__slotOffset(seq)
+        
+        # Mark the slot as being written, fill it, then give it its sequence number and publish it.
+        struct.pack_into("<QI", self.__mm, offset, 0, len(msg))
+        self.__mm[offset + asRing.slotHeaderSize:offset + asRing.slotHeaderSize + len(msg)] = msg
+        struct.pack_into("<Q", self.__mm, offset, seq)
+        struct.pack_into("<Q", self.__mm, 16, seq)
+        
+        self.__seq = seq
+        self.writeCount += 1
+        
+        return True
+    
+    def read(self, maxMsgs):
+        """
+        Read up to maxMsgs messages we haven't read yet. Returns a list of messages, which is empty if there's nothing new.
+        """
+        
+        retVal = []
+        
+        lastSeq = struct.unpack_from("<Q", self.__mm, 16)[0]
+        
+        # If the writer lapped us skip what we lost.
+        if (lastSeq - self.__seq) > self.__slots:
+            self.overrunCount += lastSeq - self.__slots - self.__seq
+            self.__seq = lastSeq - self.__slots
+        
+        while (self.__seq < lastSeq) and (len(retVal) < maxMsgs):
+            seq = self.__seq + 1
+            offset = self.__slotOffset(seq)
+            
+            slotSeq, msgLen = struct.unpack_from("<QI", self.__mm, offset)
+            
+            if (slotSeq == seq) and (msgLen <= self.__maxLen):
+                msg = self.__mm[offset + asRing.slotHeaderSize:offset + asRing.slotHeaderSize + msgLen]
+                
+                # Make sure the writer didn't get to the slot while we were copying it.
+                if struct.unpack_from("<Q", self.__mm, offset)[0] == seq:
+                    retVal.append(msg)
+                
+                else:
+                    self.overrunCount += 1
+            
+            else:
+                self.overrunCount += 1
+            
+            self.__seq = seq
+        
+        self.readCount += len(retVal)
+        
+        return retVal
+    
+    def writerAlive(self):
+        """
+        Returns True if the process that writes to the ring is still running.
+        """
+        
+        retVal = True
+        
+        try:
+            os.kill(self.__pid, 0)
+        
+        except OSError as e:
+            # If it exists but isn't ours it's still running.
+            retVal = (e.errno == errno.EPERM)
+        
+        return retVal
+    
+    def close(self):
+        """
+        Unmap the ring. The writer also removes the file.
+        """
+        
+        self.__mm.close()
+        
+        if self.__writer:
+            try:
+                os.remove(self.__path)
+            
+            except OSError:
+                pass
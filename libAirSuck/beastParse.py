@@ -0,0 +1,159 @@
+"""
+beastParse by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Splits the Mode-S Beast binary protocol (dump1090 port 30005) into individual SSR frames. Each Beast message is 0x1a, a type byte, a 6 byte 12 MHz timestamp, a 1 byte signal level, and the frame itself. Any 0x1a byte after the type byte is escaped by doubling it.
+"""
+
+####################
+# beastParse class #
+####################
+
+class beastParse:
+    #####################
+    # Class constructor #
+    #####################
+    
+    
+    def __init__(self):
+        """
+        beastParse is a class that pulls SSR frames out of a stream of Beast binary data.
+        
+        The principal method is feed(data) with data being the bytes we just recieved.
+        """
+        
+        # Data we've recieved that doesn't make a complete message yet.
+        self.__buffer = bytearray()
+        
+        # Frame length for each message type: 1 = Mode A/C, 2 = Mode S short, 3 = Mode S long.
+        self.__frameLens = {0x31: 2, 0x32: 7, 0x33: 14}
+        
+        # How many bytes did we have to skip to get back in sync?
+        self.skippedBytes = 0
+    
+    #####################
+    # Parsing functions #
+    #####################
+    
+    
+    def __unescape(self, buf, start, msgLen):
+        """
+        Pull msgLen bytes out of buf starting at start, turning escaped 0x1a 0x1a pairs into single 0x1a bytes.
+        
+        Returns a list of [msg, end] where msg is the unescaped bytearray and end is the position after the message. If we run out of data msg and end are None. If we hit a single 0x1a that starts a new message msg is None and end is the position of that 0x1a.
+        """
+        
+        msg = bytearray()
+        bufLen = len(buf)
+        i = start
+        
+        while len(msg) < msgLen:
+            # Did we run out of data?
+            if i >= bufLen:
+                return [None, None]
+            
+            thisByte = buf[i]
+            
+            if thisByte == 0x1a:
+                # We need the next byte to know what we have.
+                if (i + 1) >= bufLen:
+                    return [None, None]
+                
+                # A single 0x1a means the message got cut off.
+                if buf[i + 1] != 0x1a:
+                    return [None, i]
+                
+                i += 2
+            
+            else:
+                i += 1
+            
+            msg.append(thisByte)
+        
+        return [msg, i]
+    
+    def feed(self, data):
+        """
+        Add data recieved from a Beast source to our buffer and pull out every complete message. Partial messages are kept until the rest of the message arrives.
+        
+        Returns a list of [timestamp, signalLevel, frame] lists, where timestamp is the 12 MHz counter value as an int, signalLevel is an int from 0-255, and frame is a bytearray that can be passed to ssrParse.
+        """
+        
+        retVal = []
+        
+        buf = self.__buffer
+        buf.extend(data)
+        bufLen = len(buf)
+        
+        # Where we are in the buffer.
+        pos = 0
+        
+        while True:
+            # Find the start of the next message.
+            start = buf.find(b"\x1a", pos)
+            
+            # If we don't have one we're done with everything in the buffer.
+            if start < 0:
+                self.skippedBytes += bufLen - pos
+                pos = bufLen
+                break
+            
+            self.skippedBytes += start - pos
+            
+            # We need the type byte.
+            if (start + 1) >= bufLen:
+                pos = start
+                break
+            
+            frameLen = self.__frameLens.get(buf[start + 1])
+            
+            # If we don't have a frame type we know, skip ahead. An escaped 0x1a gets skipped as a pair.
+            if frameLen is None:
+                pos = start + 2 if (buf[start + 1] == 0x1a) else start + 1
+                self.skippedBytes += pos - start
+                continue
+            
+            # The message is the timestamp, signal level, and frame.
+            msgStart = start + 2
+            end = msgStart + 7 + frameLen
+            
+            # Wait for the rest of the message.
+            if end > bufLen:
+                pos = start
+                break
+            
+            # Most messages don't have escaped bytes so we can slice the frame right out of the buffer.
+            if buf.find(b"\x1a", msgStart, end) < 0:
+                msg = buf
+            
+            else:
+                msg, end = self.__unescape(buf, msgStart, 7 + frameLen)
+                
+                # Wait for the rest of the message.
+                if end is None:
+                    pos = start
+                    break
+                
+                # Resync on the new message if this one was cut off.
+                if msg is None:
+                    self.skippedBytes += end - start
+                    pos = end
+                    continue
+                
+                msgStart = 0
+            
+            # Get our 48 bit timestamp and signal level.
+            timestamp = (msg[msgStart] << 40) | (msg[msgStart + 1] << 32) | (msg[msgStart + 2] << 24) | (msg[msgStart + 3] << 16) | (msg[msgStart + 4] << 8) | msg[msgStart + 5]
+            signalLevel = msg[msgStart + 6]
+            
+            retVal.append([timestamp, signalLevel, msg[msgStart + 7:msgStart + 7 + frameLen]])
+            
+            pos = end
+        
+        # Drop everything we've handled.
+        del buf[:pos]
+        
+        return retVal
@@ -13,8 +13,15 @@ https://github.com/bistromath/gr-air-modes
 # Imports #
 ###########
 
+import bisect
 import math
 
+# numpy is optional. We only need it for batch operations.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 #################
 # cprMath class #
 #################
@@ -23,9 +30,19 @@ class cprMath():
     """
     cprMath is a class that supports decoding of CPR data into latitude and longitude data.
     """
-
+    
+    # Latitudes where the number of longitude zones changes, shared by every instance. See __buildNLTable().
+    __nlTable = None
+    
+    # The same table as a numpy array for batch decoding.
+    __nlTableArr = None
+    
     def __init__(self):
         self.__latz = 15
+        
+        # Build the NL transition table if we don't have it yet.
+        if cprMath.__nlTable is None:
+            self.__buildNLTable()
 
     def __nz(self, cType):
         return 4 * self.__latz - cType
@@ -56,12 +73,78 @@ class cprMath():
         else:
             return tmp / nzCalc
     
+    def __buildNLTable(self):
+        """
+        Build the table of latitudes where NL changes. Entry i is the lowest latitude where NL is 58 - i, so the last entry is 87 degrees where NL drops to 1. Each latitude starts from the closed form and is refined so the table gives exactly the same result as __nlCalc().
+        """
+        
+        table = []
+        
+        # Constant part of the closed form.
+        nzPart = 1.0 - math.cos(math.pi / (2.0 * self.__latz))
+        
+        for nl in range(59, 2, -1):
+            # Where the closed form says NL drops below nl.
+            transLat = math.degrees(math.acos(math.sqrt(nzPart / (1.0 - math.cos(2.0 * math.pi / nl)))))
+            
+            # Bracket the transition. The closed form is good to well inside a microdegree.
+            lo = transLat - 1e-6
+            hi = transLat + 1e-6
+            
+            # Narrow it down to the first float where the trig version drops below nl.
+            while True:
+                mid = (lo + hi) / 2.0
+                
+                if (mid == lo) or (mid == hi):
+                    break
+                
+                if self.__nlCalc(mid) < nl:
+                    hi = mid
+                else:
+                    lo = mid
+            
+            table.append(hi)
+        
+        # NL is 2 right up to 87 degrees, then it's 1.
+        table.append(87.0)
+        
+        cprMath.__nlTable = table
+        
+        # If we have numpy keep a copy of the table as an array for batch decoding.
+        if numpy is not None:
+            cprMath.__nlTableArr = numpy.array(table, dtype=numpy.float64)
+    
     def __nl(self, declatIn):
+        """
+        Get the number of longitude zones for a given latitude by looking it up in the NL transition table.
+        """
+        
+        return 59.0 - bisect.bisect_right(cprMath.__nlTable, abs(declatIn))
+    
+    def __nlBatch(self, declatIn):
+        """
+        Get the number of longitude zones for each latitude in a numpy array.
+        """
+        
+        return 59.0 - numpy.searchsorted(cprMath.__nlTableArr, numpy.abs(declatIn), side='right')
+    
+    def __nlCalc(self, declatIn):
+        """
+        Compute the number of longitude zones for a given latitude with trig. This is the reference for __nl().
+        """
+        
         if abs(declatIn) >= 87.0:
             return 1.0
         
         return math.floor((2.0 * math.pi) * math.acos(1.0 - (1.0 - math.cos(math.pi / (2.0 * self.__latz))) / math.cos((math.pi / 180.0) * abs(declatIn)) ** 2)** -1)
     
+    def surfaceLonBase(self, myPos):
+        """
+        Get the start of the 90 degree longitude quadrant a receiver at myPos is in, which global surface positions are resolved against. Receivers don't move, so callers decoding lots of surface positions can work this out once per receiver and pass it to cprResolveGlobal().
+        """
+        
+        return 90.0 * math.floor(myPos[1] / 90.0)
+    
     def __dlon(self, declatIn, cType, surface):
         if surface:
             tmp = 90.0
@@ -95,10 +178,11 @@ class cprMath():
         
         return [decodedLat, decodedLon]
 
-    def cprResolveGlobal(self, evenPos, oddPos, mostRecent, myPos = None, surface = None):
+    def cprResolveGlobal(self, evenPos, oddPos, mostRecent, myPos = None, surface = None, lonBase = None):
+        #lonBase is surfaceLonBase(myPos) for surface positions, which we work out if we don't get it.
         #cannot resolve surface positions unambiguously without knowing receiver position
         if surface and myPos is None:
-            raise CPRNoPositionError
+            raise ValueError("Surface positions require a reference position.")
         
         dLatEven = self.__dlat(0, surface)
         dLatOdd  = self.__dlat(1, surface)
@@ -106,10 +190,13 @@ class cprMath():
         evenPos = [float(evenPos[0]), float(evenPos[1])]
         oddPos = [float(oddPos[0]), float(oddPos[1])]
         
-        j = math.floor(((self.__nz(1) * evenPos[0] - self.__nz(0) * oddPos[0]) / 2 ** 17) + 0.5) #latitude index
+        nzEven = self.__nz(0)
+        nzOdd = self.__nz(1)
+        
+        j = math.floor(((nzOdd * evenPos[0] - nzEven * oddPos[0]) / 2 ** 17) + 0.5) #latitude index
         
-        rLatEven = dLatEven * ((j % self.__nz(0)) + evenPos[0] / 2 ** 17)
-        rLatOdd  = dLatOdd  * ((j % self.__nz(1)) + oddPos[0] / 2 ** 17)
+        rLatEven = dLatEven * ((j % nzEven) + evenPos[0] / 2 ** 17)
+        rLatOdd  = dLatOdd  * ((j % nzOdd) + oddPos[0] / 2 ** 17)
         
         #limit to -90, 90
         if rLatEven > 270.0:
@@ -129,17 +216,19 @@ class cprMath():
         
         #disambiguate latitude
         if surface:
-            if myPos[0] < 0:
+            #surface latitudes come out in [0, 90), so use the southern hemisphere if the receiver is closer to it
+            if (rLat - myPos[0]) > 45.0:
                 rLat -= 90
         
-        dl = self.__dlon(rLat, mostRecent, surface)
+        #look NL up once and use it for the longitude zone size too, same as __dlon()
         nlRLat = self.__nl(rLat)
         
-        m = math.floor(((evenPos[1] * (nlRLat - 1) - oddPos[1] * nlRLat) / 2 ** 17) + 0.5) #longitude index
+        if surface:
+            dl = 90.0 / max(nlRLat - mostRecent, 1)
+        else:
+            dl = 360.0 / max(nlRLat - mostRecent, 1)
         
-        #when surface positions straddle a disambiguation boundary (90 degrees),
-        #surface decoding will fail. this might never be a problem in real life, but it'll fail in the
-        #test case. the documentation doesn't mention it.
+        m = math.floor(((evenPos[1] * (nlRLat - 1) - oddPos[1] * nlRLat) / 2 ** 17) + 0.5) #longitude index
         
         if mostRecent == 0:
             encLon = evenPos[1]
@@ -152,15 +241,139 @@ class cprMath():
         #print "evenPos: %x, oddPos: %x, mostRecent: %i" % (evenPos[1], oddPos[1], mostRecent)
         
         if surface:
-            #longitudes need to be resolved to the nearest 90 degree segment to the receiver.
-            wat = myPos[1]
-            if wat < 0:
-                wat += 360
-                zone = lambda lon: 90 * (int(lon) / 90)
-                rLon += (zone(wat) - zone(rLon))
+            #longitudes come out in [0, 90) and need to be resolved to the 90 degree segment nearest the receiver, starting with the one it's in.
+            if lonBase is None:
+                lonBase = self.surfaceLonBase(myPos)
+            
+            rLon += lonBase
+            
+            if (rLon - myPos[1]) > 45.0:
+                rLon -= 90.0
+            elif (rLon - myPos[1]) < -45.0:
+                rLon += 90.0
+            
+            if rLon < -180:
+                rLon += 360.0
         
         #limit to (-180, 180)
         if rLon > 180:
             rLon -= 360.0
         
         return [rLat, rLon]
+    
+    def cprResolveLocalBatch(self, myLat, myLon, encLat, encLon, cType, surface = False):
+        """
+        Decode columns of CPR positions against reference positions, the same way cprResolveLocal() does for one position. encLat, encLon, and cType are array-like with one entry per position. myLat and myLon can be arrays with one reference position per entry, or single values shared by all of them. surface applies to every position.
+        
+        Returns a list of numpy float64 arrays [lat, lon].
+        """
+        
+        # Make sure we have numpy.
+        if numpy is None:
+            raise ImportError("cprResolveLocalBatch() requires numpy.")
+        
+        myLat = numpy.asarray(myLat, dtype=numpy.float64)
+        myLon = numpy.asarray(myLon, dtype=numpy.float64)
+        encLat = numpy.asarray(encLat, dtype=numpy.float64)
+        encLon = numpy.asarray(encLon, dtype=numpy.float64)
+        cType = numpy.asarray(cType, dtype=numpy.int64)
+        
+        if surface:
+            tmp = 90.0
+        else:
+            tmp = 360.0
+        
+        # Latitude, as in __decodeLat().
+        dLat = tmp / (4 * self.__latz - cType)
+        latFrac = encLat / (2 ** 17)
+        j = numpy.floor(myLat / dLat) + numpy.floor(0.5 + (numpy.mod(myLat, dLat) / dLat) - latFrac)
+        decodedLat = dLat * (j + latFrac)
+        
+        # Longitude, as in __decodeLon().
+        dLon = tmp / numpy.maximum(self.__nlBatch(decodedLat) - cType, 1)
+        lonFrac = encLon / (2 ** 17)
+        m = numpy.floor(myLon / dLon) + numpy.floor(0.5 + (numpy.mod(myLon, dLon) / dLon) - lonFrac)
+        decodedLon = dLon * (m + lonFrac)
+        
+        return [decodedLat, decodedLon]
+    
+    def cprResolveGlobalBatch(self, evenLat, evenLon, oddLat, oddLon, mostRecent, myLat = None, myLon = None, surface = False):
+        """
+        Decode columns of even/odd CPR position pairs in one pass, the same way cprResolveGlobal() does for one pair. evenLat, evenLon, oddLat, oddLon, and mostRecent (0 = even, 1 = odd) are array-like with one entry per pair. Surface positions need myLat and myLon, which can be arrays with one reference position per pair or single values shared by all of them. surface applies to every pair.
+        
+        Instead of raising an exception for pairs that straddle a latitude zone boundary, we flag them in a mask. Their lat and lon are NaN.
+        
+        Returns a list of numpy arrays [lat, lon, straddle] where lat and lon are float64 and straddle is bool.
+        """
+        
+        # Make sure we have numpy.
+        if numpy is None:
+            raise ImportError("cprResolveGlobalBatch() requires numpy.")
+        
+        # We can't resolve surface positions unambiguously without knowing the receiver position.
+        if surface and ((myLat is None) or (myLon is None)):
+            raise ValueError("Surface positions require a reference position.")
+        
+        evenLat = numpy.asarray(evenLat, dtype=numpy.float64)
+        evenLon = numpy.asarray(evenLon, dtype=numpy.float64)
+        oddLat = numpy.asarray(oddLat, dtype=numpy.float64)
+        oddLon = numpy.asarray(oddLon, dtype=numpy.float64)
+        mostRecent = numpy.asarray(mostRecent, dtype=numpy.int64)
+        isOdd = (mostRecent != 0)
+        
+        if surface:
+            tmp = 90.0
+        else:
+            tmp = 360.0
+        
+        nzEven = self.__nz(0)
+        nzOdd = self.__nz(1)
+        
+        # Latitude index.
+        j = numpy.floor(((nzOdd * evenLat - nzEven * oddLat) / 2 ** 17) + 0.5)
+        
+        rLatEven = (tmp / nzEven) * (numpy.mod(j, nzEven) + evenLat / 2 ** 17)
+        rLatOdd = (tmp / nzOdd) * (numpy.mod(j, nzOdd) + oddLat / 2 ** 17)
+        
+        # Limit to -90, 90.
+        rLatEven = numpy.where(rLatEven > 270.0, rLatEven - 360.0, rLatEven)
+        rLatOdd = numpy.where(rLatOdd > 270.0, rLatOdd - 360.0, rLatOdd)
+        
+        # Pairs that straddle a transition boundary can't be resolved.
+        straddle = (self.__nlBatch(rLatEven) != self.__nlBatch(rLatOdd))
+        
+        rLat = numpy.where(isOdd, rLatOdd, rLatEven)
+        
+        # Disambiguate surface latitude.
+        if surface:
+            myLat = numpy.asarray(myLat, dtype=numpy.float64)
+            myLon = numpy.asarray(myLon, dtype=numpy.float64)
+            
+            rLat = numpy.where((rLat - myLat) > 45.0, rLat - 90, rLat)
+        
+        nlRLat = self.__nlBatch(rLat)
+        zones = numpy.maximum(nlRLat - mostRecent, 1)
+        dl = tmp / zones
+        
+        # Longitude index.
+        m = numpy.floor(((evenLon * (nlRLat - 1) - oddLon * nlRLat) / 2 ** 17) + 0.5)
+        
+        encLon = numpy.where(isOdd, oddLon, evenLon)
+        
+        rLon = dl * (numpy.mod(m, zones) + encLon / 2.0 ** 17)
+        
+        # Resolve surface longitudes to the 90 degree segment nearest the receiver, the same way cprResolveGlobal() does.
+        if surface:
+            rLon = rLon + (90.0 * numpy.floor(myLon / 90.0))
+            rLon = numpy.where((rLon - myLon) > 45.0, rLon - 90.0, rLon)
+            rLon = numpy.where((rLon - myLon) < -45.0, rLon + 90.0, rLon)
+            rLon = numpy.where(rLon < -180, rLon + 360.0, rLon)
+        
+        # Limit to (-180, 180).
+        rLon = numpy.where(rLon > 180, rLon - 360.0, rLon)
+        
+        # Blank out anything we couldn't resolve.
+        rLat = numpy.where(straddle, numpy.nan, rLat)
+        rLon = numpy.where(straddle, numpy.nan, rLon)
+        
+        return [rLat, rLon, straddle]
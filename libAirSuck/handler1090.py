@@ -22,11 +22,16 @@ except:
 
 import hashlib
 import datetime
+import time
 import redis
 import traceback
 import binascii
 import asLog
+import asDedupe
+import asPublisher
+import asCodec
 import ssrParse
+import ssrBatchDecoder
 import json
 import re
 
@@ -43,16 +48,28 @@ class handler1090:
 		# Set up the logger.
 		self.__logger = asLog.asLog(logMode)
 		
-		# Redis queues and entities
-		self.__rQ = redis.StrictRedis(host=config.connRel['host'], port=config.connRel['port'])
-		self.__psQ = redis.StrictRedis(host=config.connPub['host'], port=config.connPub['port'])
-		self.__dedeupe = redis.StrictRedis(host=config.d1090Settings['dedupeHost'], port=config.d1090Settings['dedupePort'])
+		# Batches our output for the connector queues.
+		self.__publisher = asPublisher.asPublisher(logMode)
+		
+		# Encodes our output.
+		self.__codec = asCodec.asCodec(config.connPub['msgFormat'])
+		
+		# Frame deduplication.
+		self.__dedupe = asDedupe.asDedupe(config.d1090Settings['dedupeTTLSec'], "ssr-", config.d1090Settings['dedupeMode'], config.d1090Settings['dedupeHost'], config.d1090Settings['dedupePort'], config.d1090Settings['dedupeSyncMs'])
 		
 		# Set the debug flag to off by defualt.
 		self.__debugOn = False
 		
-		# Load the SSR parser.
+		# Load the SSR parser and set up CRC error correction.
 		self.__ssrParser = ssrParse.ssrParse()
+		self.__ssrParser.setCrcFixBits(config.d1090Settings['crcFixBits'])
+		
+		# Parses our frames, keeping the ones we've seen recently.
+		self.__decoder = ssrBatchDecoder.ssrBatchDecoder(self.__ssrParser, config.d1090Settings['parseCacheSize'], config.d1090Settings['badCrcHeaderOnly'])
+		
+		# Keep track of how many frames CRC correction recovered since we last logged it.
+		self.__crcFixLastTime = time.time()
+		self.__crcFixLastCount = 0
 		
 		# Compile a regex to verify dump1090 data formatting.
 		self.__regex1090 = re.compile("[@*]([a-fA-F0-9])+;")
@@ -85,18 +102,29 @@ class handler1090:
 		
 		return retVal
 	
-	def __jsonify(self, dataDict):
-		"""		
-		Convert a given dictionary to a JSON string.
+	def __logCrcFixes(self):
+		"""
+		Log how many frames per second we recovered by CRC correction every d1090Settings['crcFixStatsSec'] seconds.
 		"""
 		
-		retVal = json.dumps(dataDict)
-		
-		return retVal
+		# Are we supposed to log stats? Thin connectors don't parse frames so they don't correct any.
+		if (config.d1090Settings['crcFixBits'] > 0) and (config.d1090Settings['crcFixStatsSec'] > 0) and (config.d1090Settings['thinConnector'] == False):
+			# How long has it been?
+			elapsed = time.time() - self.__crcFixLastTime
+			
+			if elapsed >= config.d1090Settings['crcFixStatsSec']:
+				# Get the number of frames we fixed since last time.
+				fixCount = self.__ssrParser.crcFixCount - self.__crcFixLastCount
+				
+				self.__logger.log("handler1090 recovered %s frames with bad CRCs in %.0f sec (%.2f frames/sec)." %(fixCount, elapsed, fixCount / elapsed))
+				
+				# Reset our counters.
+				self.__crcFixLastTime = time.time()
+				self.__crcFixLastCount = self.__ssrParser.crcFixCount
 	
-	def __queueADSB(self, msg, dedupeFlag = True):
+	def __queueADSB(self, msg, binData, dedupeFlag = True):
 		"""
-		Accepts a JSON string and queues it in the Redis database, assuming a duplicate string hasn't been queued within the last n seconds specified in redisQueues['dudeupeTableExp'], and we're not dealing with MLAT data. (dedupeFlag = False prevents dedupliation operations.)
+		Accepts a dict and the frame as a bytearray and queues it in the Redis database as JSON, assuming a duplicate string hasn't been queued within the last n seconds specified in redisQueues['dudeupeTableExp'], and we're not dealing with MLAT data. (dedupeFlag = False prevents dedupliation operations.) The frame is only parsed if we're going to queue it and we aren't a thin connector.
 		"""
 		
 		# Set default return value
@@ -104,25 +132,19 @@ class handler1090:
 		
 		# If we have something in the data field that's longer than 2 chars...
 		if len(msg['data']) >= 4:
-			jsonMsg = self.__jsonify(msg)
-			
 			# Looks like we have arrived.
 			retVal = True
 			
-			# Set up a hashed version of our data.
-			dHash = "ssr-" + hashlib.md5(msg['data']).hexdigest()
-			
-			# See if we already have the key in the redis cache, or if we're supposed to dedupe this frame at all.
-			if ((self.__dedeupe.exists(dHash) == False) or (dedupeFlag == False)):
-				# Set the key and insert lame value.
-				self.__dedeupe.setex(dHash, config.d1090Settings['dedupeTTLSec'], "X")
+			# See if we've seen the frame recently, or if we're supposed to dedupe this frame at all. This records the frame either way.
+			if ((self.__dedupe.seen(msg['data']) == False) or (dedupeFlag == False)):
+				# Now that we know we want the frame add the parsed data, unless the state engine is parsing it for us.
+				if config.d1090Settings['thinConnector'] == False:
+					msg.update(self.__decoder.parseFrame(binData))
 				
-				# If we are configured to use the connector mongoDB forward the traffic to it.
-				if config.connMongo['enabled'] == True:
-					self.__rQ.rpush(config.connRel['qName'], jsonMsg)
+				encMsg = self.__codec.encode(msg)
 				
-				# Put data on the pub/sub queue.
-				self.__psQ.publish(config.connPub['qName'], jsonMsg)
+				# Put data on the connector queues.
+				self.__publisher.publish(encMsg)
 				
 				# If we're debugging
 				if self.__debugOn:
@@ -135,6 +157,13 @@ class handler1090:
 		
 		return retVal
 	
+	def parseStats(self):
+		"""
+		Get parse cache counters as a dict: frames we were asked to parse, and how many of them we actually parsed instead of taking them from the cache.
+		"""
+		
+		return {'frames': self.__decoder.frameCount, 'parsed': self.__decoder.parseCount}
+	
 	def setDebug(self, debugOn):
 		"""
 		Turn debugging on or off.
@@ -149,6 +178,36 @@ class handler1090:
 		
 		return
 	
+	def handleBinFrame(self, jsonMsg, binData):
+		"""
+		Handle an SSR frame we already have as binary data, such as one from a Beast source. jsonMsg should contain the metadata for the frame, and its data field gets set to the frame as a hex string. Returns True if we have valid data that might or might not be queued depending on being deduplicated, and False if not.
+		"""
+		
+		# Set return value with default failure.
+		retVal = False
+		
+		# Make sure we have a Mode A/C or Mode S frame.
+		if len(binData) in (2, 7, 14):
+			# Set the hex data for everything downstream of us.
+			jsonMsg['data'] = self.__ssrParser.formatString(binascii.hexlify(binData))
+			
+			# If we're in debug mode...
+			if self.__debugOn:
+				self.__logger.log("Submitting to queuer: %s" %jsonMsg)
+			
+			# Try to queue up our data.
+			retVal = self.__queueADSB(jsonMsg, binData, True)
+			
+			# Log CRC correction stats if it's time.
+			self.__logCrcFixes()
+		
+		else:
+			# If we're debugging...
+			if self.__debugOn:
+				self.__logger.log("Binary SSR frame had an invalid length of %s bytes." %len(binData))
+		
+		return retVal
+	
 	def handleADSBDict(self, jsonMsg):
 		"""
 		Handle ADS-B JSON data. If we successfully handle the ADS-B JSON data this returns true. If not it returns false. The return value does not reflect the ADS-B being dropped on the queue. It returns true if we have valid data that might or might not be queued depending on being deduplicated.
@@ -171,7 +230,7 @@ class handler1090:
 				thisLine = self.__formatSSRMsg(thisLine)
 				
 				# Split MLAT data from SSR data.
-				lineParts = self.splitMlat(thisLine)
+				lineParts = self.__splitMlat(thisLine)
 				
 				try:
 					# Parse the frame.
@@ -180,15 +239,10 @@ class handler1090:
 				except:
 					# Blank our incoming data and dump an error.
 					binData = ""
-					formattedSSR = ""
-				
-				self.__logger.log("%s got invlaid hex SSR data: %s" %(self.myName, lineParts[1]))
+					self.__logger.log("handler1090 got invlaid hex SSR data: %s" %lineParts[1])
 				
-				# Set MLAT data and SSR data.
+				# Set MLAT data and SSR data. The frame gets parsed when we queue it.
 				jsonMsg.update({'mlatData': lineParts[0], 'data': lineParts[1]})
-				
-				# Add parsed data.
-				jsonMsg.update(self.__ssrParser.ssrParse(binData))
 			
 			else:
 				# This gets fed to the deduplicator.
@@ -204,21 +258,21 @@ class handler1090:
 				except:
 					# Blank our incoming data and dump an error.
 					binData = ""
+					self.__logger.log("handler1090 got invlaid hex SSR data: %s" %formattedSSR)
 					formattedSSR = ""
-					self.__logger.log("%s got invlaid hex SSR data: %s" %(self.myName, formattedSSR))
 				
-				# Properly format the "line"
+				# Properly format the "line". The frame gets parsed when we queue it.
 				jsonMsg.update({'data': formattedSSR})
-				
-				# Parse our data and add it to the stream.
-				jsonMsg.update(self.__ssrParser.ssrParse(binData))
 			
 			# If we're in debug mode...
 			if self.__debugOn:
 				self.__logger.log("Submitting to queuer: %s" %jsonMsg)
 			
 			# Try to queue up our data.
-			retVal = self.__queueADSB(jsonMsg, dedupeFlag)
+			retVal = self.__queueADSB(jsonMsg, binData, dedupeFlag)
+			
+			# Log CRC correction stats if it's time.
+			self.__logCrcFixes()
 		
 		else:
 			# If we're debugging...
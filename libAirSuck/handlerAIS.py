@@ -22,13 +22,16 @@ try:
 except:
     raise IOError("No configuration present. Please copy config/config.py to the airSuck folder and edit it.")
 
-import hashlib
 import datetime
-import redis
+import time
 import traceback
 import binascii
 import json
 import asLog
+import asDedupe
+import asPublisher
+import asCodec
+import aisDefrag
 import aisParse
 import re
 
@@ -46,11 +49,21 @@ class handlerAIS:
         # Set up logger.
         self.__logger = asLog.asLog(logMode)
         
-        # Redis queues and entities
-        self.__rQ = redis.StrictRedis(host=config.connRel['host'], port=config.connRel['port'])
-        self.__psQ = redis.StrictRedis(host=config.connPub['host'], port=config.connPub['port'])
-        self.__frag = redis.StrictRedis(host=config.aisSettings['fragHost'], port=config.aisSettings['fragPort'])
-        self.__dedupe = redis.StrictRedis(host=config.aisSettings['dedupeHost'], port=config.aisSettings['dedupePort'])
+        # Batches our output for the connector queues.
+        self.__publisher = asPublisher.asPublisher(logMode)
+        
+        # Encodes our output.
+        self.__codec = asCodec.asCodec(config.connPub['msgFormat'])
+        
+        # Fragment reassembly.
+        self.__defrag = aisDefrag.aisDefrag(config.aisSettings['fragTTLSec'], config.aisSettings['fragMode'], config.aisSettings['fragHost'], config.aisSettings['fragPort'])
+        
+        # Keep track of the fragment reassembly counters since we last logged them.
+        self.__defragLastTime = time.time()
+        self.__defragLastStats = self.defragStats()
+        
+        # Payload deduplication.
+        self.__dedupe = asDedupe.asDedupe(config.aisSettings['dedupeTTLSec'], "ais-", config.aisSettings['dedupeMode'], config.aisSettings['dedupeHost'], config.aisSettings['dedupePort'], config.aisSettings['dedupeSyncMs'])
         
         # Load AIS parser.
         self.__aisParser = aisParse.aisParse()
@@ -64,20 +77,20 @@ class handlerAIS:
         # Regex to verify AIS data. This regex is from https://github.com/vlfig/ais-decoder/blob/master/src/main/java/org/freeais/ais/AISParser.java
         self.__regexAIS = re.compile("!AIVD[MO]\\,[1-9]{1}\\,[1-9]{1}\\,([0-9]{0,1})\\,[0-3A-B]{1}\\,([0-9\\:\\;\\<\\=\\>\\?\\@A-W\\`a-w]+)\\,[0-5]\\*[A-F0-9]{2}")
     
-    # Convert the message to JSON format
-    def __jsonify(self, dataDict):
+    # Encode the message for the connector queues.
+    def __encode(self, dataDict):
         """
-        Convert a given dictionary to a JSON string.
+        Encode a given dictionary as a JSON or binary string depending on connPub['msgFormat'].
         """
         
         retVal = ""
         
         try:
-            retVal = json.dumps(dataDict)
+            retVal = self.__codec.encode(dataDict)
         
         except Exception as e:
             tb = traceback.format_exc()
-            self.__logger.log("Failed to JSON wrap %s: %s" %(dataDict, tb))
+            self.__logger.log("Failed to encode %s: %s" %(dataDict, tb))
         
         return retVal
     
@@ -87,55 +100,13 @@ class handlerAIS:
         Attempt to assemble AIS data from a number of fragments. Fragment is a decapsulated AIS message fragment.
         """
         
-        # By default assume we don't have an assembled payload
-        isAssembled = False
-        
-        # Set up a hashed version of our data given the host the data arrived on, the fragment count, and the message ID.
-        fHash = "aisFrag-" + hashlib.md5(fragment['src'] + "-" + str(fragment['fragCount']) + '-' + str(fragment['messageID'])).hexdigest()
-        
-        # Create a fragment name.
-        fragName = str(fragment['fragNumber'])
-        
-        # Attempt to get data from our hash table.
-        hashDat = self.__frag.hgetall(fHash)
-        hashDatLen = len(hashDat)
-        
-        # If we already have a fragment...
-        if hashDatLen > 0:
-            # If we have all the fragments we need...
-            if hashDatLen == (fragment['fragCount'] - 1):
-            
-                # Create a holder for our payload
-                payload = ""
-                
-                # Push our new fragment into the dict.
-                hashDat.update({fragName: fragment['payload']})
-                
-                # Assemble the stored fragments in order.
-                for i in range(1, fragment['fragCount'] + 1):
-                    payload = payload + hashDat[str(i)]
-                
-                # Make sure we properly reassign the payload to be the full payload.
-                fragment.update({'payload': payload})
-                
-                # Set assembled flag.
-                isAssembled = True
-            
-            else:
-                # Since we don't have all the fragments we need add the latest fragment to the list.
-                self.__frag.hset(fHash, fragName, fragment['payload'])
-        
-        else:
-            # Create our new hash object.
-            self.__frag.hset(fHash, fragName, fragment['payload'])
+        # Add the fragment to the message it belongs to.
+        payload = self.__defrag.addFragment(fragment)
         
         # If we have an assembled payload clean up some info and queue it.
-        if isAssembled:
-            # Nuke the hash object.
-            self.__frag.expire(fHash, -1)
-            
-            # Update the fragment data.
-            fragment.update({'isAssembled': True, 'isFrag': False, 'data': payload})
+        if payload is not None:
+            # Make sure we properly reassign the payload to be the full payload, and update the fragment data.
+            fragment.update({'payload': payload, 'isAssembled': True, 'isFrag': False, 'data': payload})
             
             # Set the fragment to include parsed data.
             fragment = self.__aisParser.aisParse(fragment)
@@ -145,10 +116,6 @@ class handlerAIS:
             
             # Enqueue our assembled payload.
             self.__queueAIS(fragment)
-        
-        else:
-            # Set the expiration time on the fragmoent hash.
-            self.__frag.expire(fHash, config.aisSettings['fragTTLSec'])   
     
     # Convert the data we want to send to JSON format.
     def __queueAIS(self, msg):
@@ -164,42 +131,63 @@ class handlerAIS:
         if 'payload' in msg:
             enqueueMe.pop('payload')
         
-        # Build a JSON string.
-        jsonMsg = self.__jsonify(enqueueMe)
+        # Build a JSON or binary string.
+        encMsg = self.__encode(enqueueMe)
         
         # If we have something other than an empty string...
-        if jsonMsg != "":
+        if encMsg != "":
             
             # Should we actually enqueue the data?
             if self.__enqueueOn:
-                # Set up a hashed version of our data.
-                dHash = "ais-" + hashlib.md5(enqueueMe['data']).hexdigest()
-                
-                # If we dont' already have a frame like this one OR the frame is a fragment...
-                if (self.__dedupe.exists(dHash) == False) or (enqueueMe['isFrag'] == True):
+                # Make sure we're not handling a fragment. Since some fragments can be short there's a good chance of collision.
+                if enqueueMe['isFrag'] == False:
                     
-                    # Make sure we're not handling a fragment. Since some fragments can be short there's a good chance of collision.
-                    if enqueueMe['isFrag'] == False:
-                        # Set the key and insert lame value.
-                        self.__dedupe.setex(dHash, config.aisSettings['dedupeTTLSec'], "X")
+                    # If we dont' already have a frame like this one...
+                    if self.__dedupe.seen(enqueueMe['data']) == False:
                         
-                        # If we are configured to use the connector mongoDB forward the traffic to it.
-                        if config.connMongo['enabled'] == True:
-                            self.__rQ.rpush(config.connRel['qName'], jsonMsg)
-                            
-                        # Put data on the pub/sub queue.
-                        self.__psQ.publish(config.connPub['qName'], jsonMsg)
+                        # Put data on the connector queues.
+                        self.__publisher.publish(encMsg)
                         
                         # If we're debugging
                         if self.__debugOn:
-                            self.__logger.log("Enqueue: %s" %jsonMsg)
+                            self.__logger.log("Enqueue: %s" %json.dumps(enqueueMe))
             
             else:
-                # Just dump the JSON data as a string.
-                self.__logger.log(jsonMsg)
+                # Just dump the data as a JSON string.
+                self.__logger.log(json.dumps(enqueueMe))
         
         return 
     
+    def defragStats(self):
+        """
+        Get fragment reassembly counters as a dict: fragments we got, messages we assembled, incomplete messages we threw away after fragTTLSec, and incomplete messages we're holding now.
+        """
+        
+        return {'fragments': self.__defrag.fragmentCount, 'assembled': self.__defrag.assembledCount, 'expired': self.__defrag.expiredCount, 'pending': self.__defrag.pendingCount()}
+    
+    def __logDefragStats(self):
+        """
+        Log how many fragments we got, how many messages we assembled, and how many incomplete messages we threw away every aisSettings['defragStatsSec'] seconds.
+        """
+        
+        # Are we supposed to log stats?
+        if config.aisSettings['defragStatsSec'] > 0:
+            # How long has it been?
+            elapsed = time.time() - self.__defragLastTime
+            
+            if elapsed >= config.aisSettings['defragStatsSec']:
+                # Get the counters since last time.
+                stats = self.defragStats()
+                fragments = stats['fragments'] - self.__defragLastStats['fragments']
+                assembled = stats['assembled'] - self.__defragLastStats['assembled']
+                expired = stats['expired'] - self.__defragLastStats['expired']
+                
+                self.__logger.log("handlerAIS got %s fragments in %.0f sec (%.2f fragments/sec), assembled %s messages, expired %s incomplete messages, and is holding %s." %(fragments, elapsed, fragments / elapsed, assembled, expired, stats['pending']))
+                
+                # Reset our counters.
+                self.__defragLastTime = time.time()
+                self.__defragLastStats = stats
+    
     def setDebug(self, debugOn):
         """
         Turn debugging on or off.
@@ -266,6 +254,9 @@ class handlerAIS:
                         self.__logger.log("Error handling AIS data: %s\n%s" %(aisData, tb))
                     
                     raise e
+            
+            # Log fragment reassembly stats if it's time.
+            self.__logDefragStats()
         
         else:
             # if we're debugging...
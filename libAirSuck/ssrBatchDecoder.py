@@ -0,0 +1,140 @@
+"""
+ssrBatchDecoder by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Parses SSR frames for handler1090 and the SSR state engine, remembering recently parsed frames so the same frame heard by several receivers only gets parsed once. In thin connector mode the connectors publish raw frames and the state engine runs each batch it reads from the connector queue through decodeBatch().
+"""
+
+###########
+# Imports #
+###########
+
+import binascii
+import threading
+from collections import OrderedDict
+
+
+#########################
+# ssrBatchDecoder class #
+#########################
+
+class ssrBatchDecoder:
+    #####################
+    # Class constructor #
+    #####################
+    
+    
+    def __init__(self, ssrParser, cacheSize, badCrcHeaderOnly=True):
+        """
+        ssrBatchDecoder is a class that parses SSR frames using the ssrParse object ssrParser, which should already be set up for CRC correction.
+        
+        The principal methods are parseFrame(binData) for one frame and decodeBatch(msgList) for a list of connector messages. We keep up to cacheSize recently parsed frames. 0 = no cache. If badCrcHeaderOnly is True extended squitters with a bad CRC only get their header fields. One ssrBatchDecoder can be shared by several threads, like the dataSource threads using one handler1090.
+        """
+        
+        self.__ssrParser = ssrParser
+        self.__cacheSize = cacheSize
+        self.__badCrcHeaderOnly = badCrcHeaderOnly
+        
+        # Parsed frames we've seen recently, keyed on the frame bytes with the least recently used first.
+        self.__parseCache = OrderedDict()
+        
+        # Lock for the cache and counters since several threads can parse frames at once.
+        self.__lock = threading.Lock()
+        
+        # How many frames were we asked for, and how many did we actually parse?
+        self.frameCount = 0
+        self.parseCount = 0
+    
+    ##################
+    # Public methods #
+    ##################
+    
+    def parseFrame(self, binData):
+        """
+        Parse binData, reusing the result if we parsed the same frame recently. Extended squitters with a bad CRC are dropped by the state engine, so unless we were set up otherwise we only return their header fields (len, mode, df, frameCrc, cmpCrc, icaoAAHx, icaoAAInt, and fmt) instead of decoding the whole frame.
+        
+        Returns a dict of parsed fields which must not be modified. This is safe to call from several threads at once.
+        """
+        
+        # Use the frame bytes as our cache key.
+        frameKey = bytes(binData)
+        
+        with self.__lock:
+            self.frameCount += 1
+            
+            # Pull the frame out of the cache so it goes back in as the most recently used one.
+            retVal = self.__parseCache.pop(frameKey, None)
+            
+            if retVal is None:
+                self.parseCount += 1
+        
+        # Parse outside the lock so other threads can use the cache while we work.
+        if retVal is None:
+            # Parse the frame header.
+            frame = self.__ssrParser.ssrParseLazy(binData)
+            
+            # If we have an extended squitter with a bad CRC...
+            if self.__badCrcHeaderOnly and (frame.mode == "s") and (frame.df in (17, 18)) and (frame.frameCrc != frame.cmpCrc):
+                retVal = frame.headerDict()
+            
+            else:
+                # Decode the rest of the frame.
+                retVal = frame.toDict()
+        
+        # Cache our parsed frame if we're caching.
+        if self.__cacheSize > 0:
+            with self.__lock:
+                self.__parseCache[frameKey] = retVal
+                
+                # Drop the least recently used frame if we have too many.
+                if len(self.__parseCache) > self.__cacheSize:
+                    self.__parseCache.popitem(last = False)
+        
+        return retVal
+    
+    def isThin(self, msg):
+        """
+        Returns True if msg is an SSR message from a thin connector, which has the raw frame in 'data' but hasn't been parsed.
+        """
+        
+        return (type(msg) == dict) and (msg.get('type') == "airSSR") and ('data' in msg) and ('mode' not in msg)
+    
+    def decodeBatch(self, msgList):
+        """
+        Parse the frames in every thin SSR message in msgList and add the parsed fields to each message. Anything else in msgList is left alone, so a batch can hold messages from full and thin connectors. Copies of the same frame in a batch are only parsed once even without a cache.
+        
+        Returns the number of messages we parsed.
+        """
+        
+        retVal = 0
+        
+        # Frames we've parsed in this batch, keyed on the hex data.
+        batchFrames = {}
+        
+        for thisMsg in msgList:
+            if self.isThin(thisMsg):
+                hexData = thisMsg['data']
+                parsed = batchFrames.get(hexData)
+                
+                if parsed is None:
+                    try:
+                        binData = bytearray(binascii.unhexlify(hexData))
+                    
+                    except (TypeError, ValueError):
+                        # Bad hex data parses as an invalid frame.
+                        binData = bytearray()
+                    
+                    parsed = self.parseFrame(binData)
+                    batchFrames[hexData] = parsed
+                
+                else:
+                    with self.__lock:
+                        self.frameCount += 1
+                
+                thisMsg.update(parsed)
+                retVal += 1
+        
+        return retVal
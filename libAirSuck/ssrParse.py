@@ -18,11 +18,37 @@ import binascii
 import math
 import sys
 
+# Python 3 moved intern() to sys.
+try:
+    intern
+except NameError:
+    from sys import intern
+
+# numpy is optional. We only need it for batch operations.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 ##################
 # ssrParse class #
 ##################
 
 class ssrParse:
+    # Altitude lookup tables shared by all instances. These get built by the first instance.
+    __gillham2BinTable = None
+    __bin2GillhamHiTable = None
+    __bin2GillhamLoTable = None
+    __modeA2CTable = None
+    __alt12Table = None
+    __alt13Table = None
+    __gillham2BinArr = None
+    __alt12Arr = None
+    __alt13Arr = None
+    
+    # Pairs of 6-bit ident characters for each 12-bit value, shared by all instances.
+    __ident12Table = None
+    
     #####################
     # Class constructor #
     #####################
@@ -45,9 +71,49 @@ class ssrParse:
         self.__crc24Mask = 0xffffff
         self.__crcTable = self.buildCrcTable()
         
+        # If we have numpy keep a copy of the CRC table as an array for batch CRC computation.
+        if numpy is not None:
+            self.__crcTableArr = numpy.array(self.__crcTable, dtype=numpy.uint32)
+        
         # 6-bit ASCII table.
         self.__ascii6Table = ["@", "A", "B", "C", "D", "E", "F", "G", "H", "I", "J", "K", "L", "M", "N", "O", "P", "Q", "R", "S", "T", "U", "V", "W", "X", "Y", "Z", "[", "/", "]", "^", "_", " ", "!", "\"", "#", "$", "%", "&", "\\", "(", ")", "*", "+", ",", "-", ".", "/", "0", "1", "2", "3", "4", "5", "6", "7", "8", "9", ":", ";", "<", "=", ">", "?"]
 
+        # TIS-B control field descriptions.
+        self.__ctrlText = ["ADS-B ES/NT w/ ICAO AA",
+            "ADS-B ES/NT w/ other addr",
+            "Fine fmt TIS-B",
+            "Coarse fmt TIS-B",
+            "TIS-B mgmt msg",
+            "TIS-B relay of ADS-B msg w/other addr",
+            "ADS-B rebroadcast using DF17 msg fmt",
+            "Reserved"]
+        
+        # Surveillance status table
+        self.__ssTable = ["No alert", "Permanent alert", "Code change", "SPI"]
+        
+        # Build our DF and extended squitter type code dispatch tables.
+        self.__buildHandlerTables()
+        
+        # Build our altitude lookup tables if nobody has yet.
+        if ssrParse.__alt13Table is None:
+            self.__buildAltTables()
+        
+        # Build our 12-bit ident character pair table if nobody has yet.
+        if ssrParse.__ident12Table is None:
+            ssrParse.__ident12Table = [firstChr + secondChr for firstChr in self.__ascii6Table for secondChr in self.__ascii6Table]
+        
+        # Decoded flight IDs keyed on their 48-bit ident field so we hand back the same string object for a repeated ID.
+        self.__idCache = {}
+        self.__idCacheSize = 16384
+        
+        # CRC error correction. How many bit errors do we fix (0 = off), and how many frames have we fixed?
+        self.__crcFixBits = 0
+        self.crcFixCount = 0
+        
+        # Syndrome tables for correcting short (DF11) and long (DF17, DF18) frames.
+        self.__syndromes56 = self.buildSyndromeTable(7, 1)
+        self.__syndromes112 = self.buildSyndromeTable(14, 2)
+    
     ####################
     # Config Functions #
     ####################
@@ -72,6 +138,23 @@ class ssrParse:
             retVal = True
             
         return retVal
+    
+    def setCrcFixBits(self, fixBits):
+        """
+        Sets the maximum number of flipped bits to correct in DF11, DF17, and DF18 frames with bad CRCs. fixBits can be 0 (off), 1, or 2. DF11 frames are only ever corrected for 1 bit. Corrected frames are decoded from the fixed data and have the corrected field set to True. This can be changed during runtime.
+        
+        Returns True for success, False for failure.
+        """
+        
+        # Did it work or not?
+        retVal = False
+        
+        # Set our bit count given a correct parameter.
+        if fixBits in (0, 1, 2):
+            self.__crcFixBits = fixBits
+            retVal = True
+        
+        return retVal
 
     #####################
     # Parsing functions #
@@ -124,6 +207,147 @@ class ssrParse:
         
         return (crc & self.__crc24Mask)
     
+    def buildSyndromeTable(self, frameLen, maxBits):
+        """
+        Create a table of CRC syndromes (frame CRC XOR computed CRC) for every combination of up to maxBits (1 or 2) flipped bits in a frame frameLen bytes long. The DF field is never corrected, and syndromes that could be produced by more than one combination are left out.
+        
+        DF11 replies to interrogators with an II or SI code have that code XORed into the low 7 bits of the CRC, so for 7 byte frames the table is keyed on the syndrome with the low 7 bits masked off.
+        
+        Returns a dictionary of syndrome -> tuple of bit positions, where bit 0 is the MSB of the first byte.
+        """
+        
+        retVal = {}
+        
+        # Syndromes we've seen more than once.
+        ambiguous = set()
+        
+        # Which syndrome bits do we use?
+        syndromeMask = 0xffff80 if (frameLen == 7) else self.__crc24Mask
+        
+        # The CRC is linear, so we get the syndrome of each single bit and XOR them for multiple bits.
+        bitSyndromes = []
+        
+        for thisBit in range(0, frameLen * 8):
+            # Build a frame that only has this bit set.
+            errFrame = bytearray(frameLen)
+            errFrame[thisBit >> 3] = 0x80 >> (thisBit & 7)
+            
+            bitSyndromes.append(self.getCrc(errFrame[0:-3]) ^ ((errFrame[-3] << 16) + (errFrame[-2] << 8) + errFrame[-1]))
+        
+        # Skip the 5 DF bits.
+        candidates = []
+        
+        for firstBit in range(5, frameLen * 8):
+            candidates.append((bitSyndromes[firstBit], (firstBit,)))
+            
+            if maxBits > 1:
+                for secondBit in range(firstBit + 1, frameLen * 8):
+                    candidates.append((bitSyndromes[firstBit] ^ bitSyndromes[secondBit], (firstBit, secondBit)))
+        
+        for syndrome, bits in candidates:
+            syndrome = syndrome & syndromeMask
+            
+            # Errors we can't tell apart from a good frame can't be fixed.
+            if syndrome == 0:
+                continue
+            
+            # If we've already seen this syndrome we can't know which bits to fix.
+            if (syndrome in retVal) or (syndrome in ambiguous):
+                ambiguous.add(syndrome)
+                retVal.pop(syndrome, None)
+            
+            else:
+                retVal[syndrome] = bits
+        
+        return retVal
+    
+    def __fixCrc(self, binData, retVal):
+        """
+        Try to correct flipped bits in a DF11, DF17, or DF18 frame with a bad CRC using our syndrome tables. If we can correct the frame the CRC values in retVal are updated and retVal.corrected is set to True. Corrected DF11 frames keep any II or SI code in their CRC.
+        
+        Returns the corrected frame data, or binData if it couldn't be corrected.
+        """
+        
+        # Pick our syndrome table.
+        if (retVal.df == 11) and (len(binData) == 7):
+            bits = self.__syndromes56.get((retVal.frameCrc ^ retVal.cmpCrc) & 0xffff80)
+        
+        elif ((retVal.df == 17) or (retVal.df == 18)) and (len(binData) == 14):
+            bits = self.__syndromes112.get(retVal.frameCrc ^ retVal.cmpCrc)
+        
+        else:
+            return binData
+        
+        # Did we find the bits to flip?
+        if (bits is None) or (len(bits) > self.__crcFixBits):
+            return binData
+        
+        # Flip the bad bits in a copy of the frame.
+        fixedData = bytearray(binData)
+        
+        for thisBit in bits:
+            fixedData[thisBit >> 3] ^= 0x80 >> (thisBit & 7)
+        
+        # Our CRC values should match now.
+        retVal.frameCrc = (fixedData[-3] << 16) + (fixedData[-2] << 8) + (fixedData[-1])
+        retVal.cmpCrc = self.getCrc(fixedData[0:-3])
+        retVal.corrected = True
+        
+        self.crcFixCount += 1
+        
+        return fixedData
+    
+    def packFrameBatch(self, frames):
+        """
+        Pack a list of binary frames that are all the same length into a 2-D numpy uint8 array with one frame per row, for use with getCrcBatch().
+        
+        Returns a numpy array.
+        """
+        
+        # Make sure we have numpy.
+        if numpy is None:
+            raise ImportError("packFrameBatch() requires numpy.")
+        
+        # Join everything into one buffer and make one row per frame.
+        frameCount = len(frames)
+        retVal = numpy.frombuffer(bytearray().join(frames), dtype=numpy.uint8)
+        
+        # Make sure every frame was the same length.
+        if (frameCount == 0) or ((len(retVal) % frameCount) != 0):
+            raise ValueError("All frames in a batch must be the same length.")
+        
+        return retVal.reshape(frameCount, len(retVal) // frameCount)
+    
+    def getCrcBatch(self, frames):
+        """
+        Compute CRC values for a batch of Mode S frames at once. frames is a 2-D numpy uint8 array with one 7 or 14 byte frame per row. getCrc() remains the reference implementation for single frames.
+        
+        Returns a tuple of numpy uint32 arrays (parity, syndrome) where parity is the CRC computed over each frame like cmpCrc, and syndrome is parity XOR the CRC value the frame carries. A syndrome of 0 means the CRC matches.
+        """
+        
+        # Make sure we have numpy.
+        if numpy is None:
+            raise ImportError("getCrcBatch() requires numpy.")
+        
+        frames = numpy.asarray(frames, dtype=numpy.uint8)
+        
+        # Make sure we have a batch of Mode S frames.
+        if (frames.ndim != 2) or ((frames.shape[1] != 7) and (frames.shape[1] != 14)):
+            raise ValueError("frames must be a 2-D array of 7 or 14 byte frames.")
+        
+        crc = numpy.zeros(frames.shape[0], dtype=numpy.uint32)
+        
+        # Run the table-driven CRC one byte column at a time across all frames.
+        for i in range(0, frames.shape[1] - 3):
+            crc = self.__crcTableArr[((crc >> 16) ^ frames[:, i]) & 0xff] ^ (crc << 8)
+        
+        parity = crc & self.__crc24Mask
+        
+        # Get the CRC value each frame carries.
+        frameCrc = (frames[:, -3].astype(numpy.uint32) << 16) | (frames[:, -2].astype(numpy.uint32) << 8) | frames[:, -1]
+        
+        return (parity, parity ^ frameCrc)
+    
     def formatString(self, subject):
         """
         Properly format a string as either ASCII for Python versions < 3, and as UTF-8 for Python version >= 3.
@@ -238,6 +462,31 @@ class ssrParse:
         
         return retVal
     
+    def __buildAltTables(self):
+        """
+        Build lookup tables for Gillham code and altitude conversions. There are only a few thousand possible inputs for each, so we compute every one of them once and share the tables between all ssrParse instances.
+        """
+        
+        # Gillham code to int, ignoring anything past 13 bits.
+        ssrParse.__gillham2BinTable = [self.__gillham2BinCalc(i) for i in range(0, 0x2000)]
+        
+        # Int to Gillham code. Each hex bit maps to one Gillham bit, so we use one table for each byte.
+        ssrParse.__bin2GillhamHiTable = [self.__bin2GillhamCalc(i << 8) for i in range(0, 0x100)]
+        ssrParse.__bin2GillhamLoTable = [self.__bin2GillhamCalc(i) for i in range(0, 0x100)]
+        
+        # Mode A to mode C. Anything with 0x8000 set is invalid, and bits past 16 are ignored.
+        ssrParse.__modeA2CTable = [self.__modeA2CCalc(i) for i in range(0, 0x8000)]
+        
+        # 12 and 13 bit altitudes.
+        ssrParse.__alt12Table = [self.__decode12BitAltCalc(i) for i in range(0, 0x1000)]
+        ssrParse.__alt13Table = [self.__decode13BitAltCalc(i) for i in range(0, 0x2000)]
+        
+        # If we have numpy keep array versions for parseBatch(). Altitudes we wouldn't set (False or 0) are NaN.
+        if numpy is not None:
+            ssrParse.__gillham2BinArr = numpy.array(ssrParse.__gillham2BinTable, dtype=numpy.int32)
+            ssrParse.__alt12Arr = numpy.array([thisAlt if thisAlt != False else numpy.nan for thisAlt in ssrParse.__alt12Table], dtype=numpy.float64)
+            ssrParse.__alt13Arr = numpy.array([thisAlt if thisAlt != False else numpy.nan for thisAlt in ssrParse.__alt13Table], dtype=numpy.float64)
+    
     def gillham2Bin(self, grayCode):
         """
         Convert Gillham gray code used in 13-bit altitude and mode A/C data to an int.
@@ -245,6 +494,58 @@ class ssrParse:
         This function ignores the X/M bit.
         """
         
+        return ssrParse.__gillham2BinTable[grayCode & 0x1fff]
+    
+    def bin2Gillham(self, data):
+        """
+        Convert a byestream to a Gillham encoded byte. Retruns an integer for success, and False for a failure.
+        
+        This function does not ignore the X/M bit.
+        """
+        
+        retVal = ssrParse.__bin2GillhamHiTable[(data >> 8) & 0xff] | ssrParse.__bin2GillhamLoTable[data & 0xff]
+        
+        # If no bits were set we return False.
+        if retVal == 0:
+            retVal = False
+        
+        return retVal
+    
+    def modeA2C(self, modeAData):
+        """
+        Convert mode A data into mode C data.
+        """
+        
+        # Set a sentinel value.
+        retVal = False
+        
+        # 0x8000 is always illegal.
+        if (modeAData & 0x8000) == 0:
+            retVal = ssrParse.__modeA2CTable[modeAData & 0x7fff]
+        
+        return retVal
+    
+    def decode12BitAlt(self, data):
+        """
+        Decode 12-bit Altitude (in DF9, DF17, etc.)
+        """
+        
+        return ssrParse.__alt12Table[data & 0x0fff]
+    
+    def decode13BitAlt(self, data):
+        """
+        Decode 13-bit Altitude (in DF0, DF4, DF15, DF20, and DF23)
+        """
+        
+        return ssrParse.__alt13Table[data & 0x1fff]
+    
+    def __gillham2BinCalc(self, grayCode):
+        """
+        Convert Gillham gray code used in 13-bit altitude and mode A/C data to an int bit by bit. This is used to build our lookup table and as the reference for gillham2Bin().
+        
+        This function ignores the X/M bit.
+        """
+        
         # Return value
         retVal = 0x0000
         
@@ -295,9 +596,9 @@ class ssrParse:
         
         return retVal
     
-    def bin2Gillham(self, data):
+    def __bin2GillhamCalc(self, data):
         """
-        Convert a byestream to a Gillham encoded byte. Retruns an integer for success, and False for a failure.
+        Convert a byestream to a Gillham encoded byte bit by bit. This is used to build our lookup tables and as the reference for bin2Gillham(). Retruns an integer for success, and False for a failure.
         
         This function does not ignore the X/M bit.
         """
@@ -375,9 +676,9 @@ class ssrParse:
         
         return retVal
     
-    def modeA2C(self, modeAData):
+    def __modeA2CCalc(self, modeAData):
         """
-        Convert mode A data into mode C data.
+        Convert mode A data into mode C data. This is used to build our lookup table and as the reference for modeA2C().
         """
         # I have no idea how this algrithm was devised since I'm not sure how the encoding works for altitude. Cheers.
         # From dump1090's mode_ac.c
@@ -434,9 +735,9 @@ class ssrParse:
             
         return retVal
     
-    def decode12BitAlt(self, data):
+    def __decode12BitAltCalc(self, data):
         """
-        Decode 12-bit Altitude (in DF9, DF17, etc.)
+        Decode 12-bit Altitude (in DF9, DF17, etc.) This is used to build our lookup table and as the reference for decode12BitAlt().
         """
         
         # If we don't have valid altitude data
@@ -454,7 +755,7 @@ class ssrParse:
                 alt = (((data & 0x0fc0) << 1) | (data & 0x003f))
                 
                 # Convert to mode C data.
-                alt = self.modeA2C(self.gillham2Bin(alt))
+                alt = self.__modeA2CCalc(self.__gillham2BinCalc(alt))
                 
                 # If we got a valid altitude back...
                 if alt != False:
@@ -463,9 +764,9 @@ class ssrParse:
         
         return alt
     
-    def decode13BitAlt(self, data):
+    def __decode13BitAltCalc(self, data):
         """
-        Decode 13-bit Altitude (in DF0, DF4, DF15, DF20, and DF23)
+        Decode 13-bit Altitude (in DF0, DF4, DF15, DF20, and DF23) This is used to build our lookup table and as the reference for decode13BitAlt().
         """
         
         # Altitude sentinel value.
@@ -489,7 +790,7 @@ class ssrParse:
             # We have a mode C 100-foot resolution altitude.    
             else:
                 # Try to get an altitude value.
-                alt = self.modeA2C(self.gillham2Bin(data))
+                alt = self.__modeA2CCalc(self.__gillham2BinCalc(data))
                 
                 # Make sure we got something.
                 if alt != False:
@@ -523,19 +824,28 @@ class ssrParse:
     
     def getIDInfo(self, data):
         """
-        Get the 8 character flight ID data from data as a string converted to an int.
+        Get the 8 character flight ID data from data as a string converted to an int. Repeated flight IDs return the same interned string.
         """
         
-        # Set up our retun variable.
-        retVal = ""
+        # See if we've decoded this ID before.
+        retVal = self.__idCache.get(data)
         
-        # For each char...
-        # From bistromath's gr-air-modes code: https://github.com/bistromath/gr-air-modes/blob/master/python/parse.py
-        for i in range(0, 8):
-            retVal += self.decode6BitChr(data >> (42-6*i) & 0x3F)
+        if retVal is None:
+            # Decode two characters at a time from each 12 bits.
+            identTable = ssrParse.__ident12Table
+            retVal = identTable[(data >> 36) & 0xfff] + identTable[(data >> 24) & 0xfff] + identTable[(data >> 12) & 0xfff] + identTable[data & 0xfff]
+            
+            # Strip and intern the flight ID so we only keep one copy.
+            retVal = intern(retVal.strip())
             
+            # Start the cache over if it's full.
+            if len(self.__idCache) >= self.__idCacheSize:
+                self.__idCache.clear()
+            
+            self.__idCache[data] = retVal
+        
         # Retrun the flight ID data
-        return retVal.strip()
+        return retVal
     
     def checkSquawk(self, aSquawk):
         """
@@ -636,755 +946,1180 @@ class ssrParse:
         
         return retVal
     
-    def ssrParse(self, binData):
+    def __setSquawk(self, retVal, sqkBits):
+        """
+        Set the mode A squawk code from the Gillham-encoded bits in sqkBits, and flag the frame if the code is an emergency squawk.
         """
-        Parse SSR data.
         
-        Parse SSR data, looking for fields, etc. from binary data in the string binData.
-        Mode A/C data is only supported for dump1090-style messages which are already decoded into 2-byte hex representations of a mode A squawk code where squawk 1200 = 0x1200.
+        # Set the mode A squawk code data.
+        retVal.aSquawk = self.getModeAStr(sqkBits)
         
-        Please note that when decoding Mode A/C replies, we don't actually know if we're working with a mode A ident reply or mode C altitude reply because we don't know the RADAR pulse spacing from the interrogation. We do our best to see if a squawk could be a mode C reply and decode it both as mode A and C.
+        # Check for emergency squawk codes.
+        sqwkEmergency = self.checkSquawk(retVal.aSquawk)
         
-        This method returns a dictionary of all decode fields.
+        # Check to see if we have some emergency condition
+        if sqwkEmergency != False:
+            retVal.aSquawkEmergency = sqwkEmergency
+            # Set the emergency flag
+            retVal.emergency = True
+    
+    def __setAlt13(self, binData, retVal):
+        """
+        Set the 13-bit altitude from DF0, DF4, DF16, and DF20 if we can decode it.
+        """
         
-        http://www.lll.lu/~edward/edward/adsb/DecodingADSBposition.html
-        http://www.radartutorial.eu/13.ssr/sr25.en.html
+        # Grab our altitude.
+        alt = self.get13BitAlt(binData)
+        
+        # If we got good data
+        if alt != False:
+            #Set our altitude data.
+            retVal.alt = alt
+    
+    def __setSurvFields(self, binData, retVal):
+        """
+        Set the flight status, downlink request, and utility message fields shared by DF4, DF5, DF20, and DF21.
         """
         
-        # This dict will hold all the information we're able to decode from frames
-        retVal = {}
+        # Get our flight status info
+        fsData = self.getFlightStatus(binData)
         
-        # Get length in bytes.
-        retVal['len'] = len(binData)
+        # Set flight status data.
+        retVal.fs = fsData[0]
+        if self.decodeNames: retVal.fsName = fsData[1]
         
-        # If we seem to have mode S based on length
-        # 7 bytes = 56 bits, 14 bytes = 112 bits
-        if (retVal['len'] == 7) or (retVal['len'] == 14):
-            
-            #Set our type to mode-s
-            retVal['mode'] = "s"
-            
-            # Get our DF (downlink format)
-            retVal['df'] = binData[0] >> 3
-            
-            # Get the frame's CRC value and compute the CRC value of the frame.
-            retVal['frameCrc'] = (binData[-3] << 16) + (binData[-2] << 8) + (binData[-1])
-            retVal['cmpCrc'] = self.getCrc(binData[0:-3])
-            
-            # Short air-to-air ACAS
-            if(retVal['df'] == 0):
-                if self.decodeNames: retVal['dfName'] = "Short Air-to-air ACAS"
-                
-                # Get vertical status bits.
-                vsBit = (binData[0] & 0x04) >> 2
-                retVal['vertStat'] = "air" if vsBit == 0 else "gnd"
-                retVal['cc'] = (binData[0] & 0x02) >> 1
-                retVal['sl'] = (binData[1] & 0xE0) >> 5
-                
-                # Grab our altitude.
-                alt = self.get13BitAlt(binData)
-                
-                # If we got good data
-                if alt != False:
-                    #Set our altitude data.
-                    retVal['alt'] = alt
-                
-            # Roll cal (alt)   
-            elif(retVal['df'] == 4):
-                if self.decodeNames: retVal['dfName'] = "Roll call reply (alt)"
-                
-                # Get our flight status info
-                fsData = self.getFlightStatus(binData)
-                
-                # Set flight status data.
-                retVal['fs'] = fsData[0]
-                if self.decodeNames: retVal['fsName'] = fsData[1]
-                
-                # If we have a flight status that indicates an emergency...
-                if (retVal['fs'] >= 2) and (retVal['fs'] <= 4):
-                    retVal['emergency'] = True
-                    retVal['fsEmergency'] = True
-                else:
-                    retVal['fsEmergency'] = False
-                
-                # Downlink request data
-                dfData = self.getDwnlnkReq(binData)
-                
-                # Set the downlink request values
-                retVal['dr'] = dfData[0]
-                if self.decodeNames: retVal['drName'] = dfData[1]
-                
-                # Get our utility message data
-                umData = self.getUtilityMsg(binData)
-                
-                # Set the utilit message fields
-                retVal['iis'] = umData[0]
-                retVal['ids'] = umData[1]
-                
-                # If we're decoding names set the IDS name
-                if self.decodeNames: retVal['idsName'] = umData[2]
-                
-                # Grab our altitude.
-                alt = self.get13BitAlt(binData)
-                
-                # If we got good data
-                if alt != False:
-                    #Set our altitude data.
-                    retVal['alt'] = alt
-            
-            # Roll call (ident)
-            elif(retVal['df'] == 5):
-                if self.decodeNames: retVal['dfName'] = "Roll call reply (ident)"
-                
-                # Get our flight status info
-                fsData = self.getFlightStatus(binData)
-                
-                # Set flight status data.
-                retVal['fs'] = fsData[0]
-                if self.decodeNames: retVal['fsName'] = fsData[1]
-                
-                # Downlink request data
-                dfData = self.getDwnlnkReq(binData)
-                
-                # Set the downlink request values
-                retVal['dr'] = dfData[0]
-                if self.decodeNames: retVal['drName'] = dfData[1]
-                
-                # Get our utility message data
-                umData = self.getUtilityMsg(binData)
-                
-                # Set the utilit message fields
-                retVal['iis'] = umData[0]
-                retVal['ids'] = umData[1]
-                
-                # If we're decoding names set the IDS name
-                if self.decodeNames: retVal['idsName'] = umData[2]
-                
-                # Get our mode A squawk bytes.
-                sqkBytes = ((binData[2] << 8) | binData[3]) & 0x1fff
-                
-                retVal['aSquawk'] = self.getModeAStr(sqkBytes)
-                
-                # Check for emergency squawk codes.
-                sqwkEmergency = self.checkSquawk(retVal['aSquawk'])
-                
-                # Check to see if we have some emergency condition
-                if sqwkEmergency != False:
-                    retVal['aSquawkEmergency'] = sqwkEmergency
-                    # Set the emergency flag
-                    retVal['emergency'] = True
-            
-            # All call
-            elif(retVal['df'] == 11):
-                if self.decodeNames: retVal['dfName'] = "All call reply"
-                
-                # Get the CA/Capability value
-                retVal['ca'] = self.getCACO(binData)
-                
-                # Get the ICAO AA as a hex string and int.
-                retVal['icaoAAHx'] = self.getIcaoAAHx(binData)
-                retVal['icaoAAInt'] = self.getIcaoAAInt(binData)
-            
-            # Long air-to-air ACAS
-            elif(retVal['df'] == 16):
-                if self.decodeNames: retVal['dfName'] = "Long Air-to-air ACAS"
-                
-                # Grab our altitude.
-                alt = self.get13BitAlt(binData)
-                
-                # If we got good data
-                if alt != False:
-                    #Set our altitude data.
-                    retVal['alt'] = alt
-                    #retVal['altUnit'] = "ft"
-            
-            # Extended squitter / TIS-B
-            elif(retVal['df'] == 17) or (retVal['df'] == 18):
-                
-                # Get the CA/Capability value
-                caCo = self.getCACO(binData)
-                
-                # Get our format bytes.
-                retVal['fmt'] = binData[4] >> 3
-                
-                # Do some work on our DFs
-                if retVal['df'] == 17:
-                    if self.decodeNames: retVal['dfName'] = "Extended squitter"
-                    
-                    # Set our CA
-                    retVal['ca'] = caCo
-                    
-                    # Get the ICAO AA as a hex string and int.
-                    retVal['icaoAAHx'] = self.getIcaoAAHx(binData)
-                    retVal['icaoAAInt'] = self.getIcaoAAInt(binData)
-                else:
-                    if self.decodeNames: retVal['dfName'] = "TIS-B"
-                     # Control field description
-                    ctrlText = ["ADS-B ES/NT w/ ICAO AA",
-                    "ADS-B ES/NT w/ other addr",
-                    "Fine fmt TIS-B",
-                    "Coarse fmt TIS-B",
-                    "TIS-B mgmt msg",
-                    "TIS-B relay of ADS-B msg w/other addr",
-                    "ADS-B rebroadcast using DF17 msg fmt",
-                    "Reserved"]
-                    
-                    # Set the control value
-                    retVal['ctrl'] = caCo
-                    # Set the control name
-                    if self.decodeNames: retVal['ctrlName'] = ctrlText[caCo]
-                    
-                    # ADSB ES/NT w/ICAO AA
-                    if caCo == 0:
-                        # Get the ICAO AA as a hex string and int.
-                        retVal['icaoAAHx'] = self.getIcaoAAHx(binData)
-                        retVal['icaoAAInt'] = self.getIcaoAAInt(binData)
-                    
-                    # ADS-B ES/NT w/ other addr
-                    elif caCo == 1:
-                        # Set address.
-                        retVal['addrHx'] = self.getIcaoAAHx(binData)
-                        retVal['addrInt'] = self.getIcaoAAInt(binData)
-                    
-                    # ADS-B rebroadcast using DF17 msg fmt.
-                    elif caCo == 6:
-                        # Get the ICAO AA as a hex string and int.
-                        retVal['icaoAAHx'] = self.getIcaoAAHx(binData)
-                        retVal['icaoAAInt'] = self.getIcaoAAInt(binData)
-                
-                #Only proceed if we have DF17 or DF18 + CO0/1/6
-                if(retVal['df'] == 17) or ((retVal['df'] == 18) and ((caCo <= 1) or (caCo == 6))):
-                
-                    # No pos data
-                    if(retVal['fmt'] == 0):
-                        if self.decodeNames: retVal['fmtName'] = "No position info"
-                        retVal['nxc'] = 0
-                    
-                    # ID and category
-                    if (retVal['fmt'] >= 1) and (retVal['fmt'] <= 4):
-                        # AC ID and aircraft category
-                        if self.decodeNames: retVal['fmtName'] = "ID and category"
-                        
-                        # Get the category item #.
-                        catItem = binData[4] & 0x07
-                        
-                        # Set the aircraft category information.
-                        retVal['category'] = chr(0x45 - retVal['fmt']) + str(catItem)
-                        
-                        # Convert our flight ID data to a big number so we can do binary operations on it. 
-                        bigNumber = (binData[5] << 40) | (binData[6] << 32) | (binData[7] << 24) | (binData[8] << 16) | (binData[9] << 8) | binData[10]
-                        
-                        # Try to interpret bigNumber as ID data.
-                        idData = self.getIDInfo(bigNumber)
-                    
-                        # See if we have legit data.
-                        if idData != "":
-                            # Set the idInfo field.
-                            retVal['idInfo'] = idData
-                    
-                    # Surface position
-                    elif (retVal['fmt'] >= 5) and (retVal['fmt'] <= 8):
-                        if self.decodeNames: retVal['fmtName'] = "Surface pos"
-                        # Calculate our nav. uncertainty category, V0 is NUC and V1 is NIC
-                        retVal['nxc'] = 14 - retVal['fmt']
-                        
-                        # Get subformat bits
-                        subFmt = binData[4] >> 3
-                        
-                        # Get movment bits
-                        movementRaw = ((binData[4] & 0x07) << 4) | (binData[5] >> 4)
-                        
-                        # Get our track validity bit
-                        headingValid = (binData[5] & 0x08) >> 3
-                        retVal['headingValid'] = headingValid
-                        
-                        # If we have a valid track, get our track bits
-                        if(headingValid == 1):
-                            headingRaw = ((binData[5] & 0x07) << 4) | (((binData[6] & 0xF0)) >> 4)
-                            
-                            # The track data is from 0-360, in 128 steps.
-                            headingRaw = headingRaw * 2.8125
-                            
-                            # Round to 1 decimal place
-                            headingRaw = round(headingRaw, 1)
-                            
-                            # Set the track value
-                            retVal['heading'] = headingRaw
-                            
-                        # Get UTC sync and even/odd format bit.
-                        utcSync = (binData[6] & 0x08) >> 3
-                        evenOdd = (binData[6] & 0x04) >> 2
-                        
-                        # Set UTC sync and evenOdd
-                        retVal['utcSync'] = utcSync
-                        retVal['evenOdd'] = evenOdd
-                        
-                        # Get 17 bit CPR latitude
-                        rawLat = ((binData[6] & 0x03) << 15) | (binData[7] << 7) | ((binData[8] & 0xfe) >> 1)
-                        
-                        # Get 17 bit CRP longitude
-                        rawLon = ((binData[8] & 0x01) << 16) | (binData[9] << 8) | binData[10]
-                        
-                        # Set raw lat and lon
-                        retVal['rawLat'] = rawLat
-                        retVal['rawLon'] = rawLon
-                        
-                    # Airborne position
-                    elif (retVal['fmt'] >= 9) and (retVal['fmt'] <= 18) or ((retVal['fmt'] >= 20) and (retVal['fmt'] <= 22)):
-                        if self.decodeNames: retVal['fmtName'] = "Airborne pos"
-                        
-                        #Caclulate our NUC
-                        if (retVal['fmt'] <= 18):
-                            retVal['nxc'] = 18 - retVal['fmt']
-                        elif(retVal <= 21):
-                            retVal['nxc'] = 29 - retVal['fmt']
-                        
-                        # Get the single-antenna flag.
-                        retVal['singleAnt'] = binData[4] & 0x01
-                        
-                        # Get surveillance status bytes.
-                        ss = (binData[4] & 0x06) >> 1
-                        
-                        # Surveillance status table
-                        ssTable = ["No alert", "Permanent alert", "Code change", "SPI"]
-                        
-                        retVal['ss'] = ss
-                        if self.decodeNames: retVal['ssName'] = ssTable[ss]
-                        
-                        # If we have a "permanent alert"
-                        if ss == 1:
-                            retVal['emergency'] = True
-                        
-                        # Get the altitude type
-                        if (retVal['fmt'] >= 9) and (retVal['fmt'] <= 18):
-                            retVal['altType'] = "Baro"
-                        else:
-                            retVal['altType'] = "GNSS"
-                        
-                        # Attempt to decode the altitude data.
-                        altitudeBytes = (binData[5] << 8) | binData[6]
-                        altProcessed = self.decode12BitAlt(altitudeBytes >> 4)
-                        
-                        # Verify altitude and see if we have an odd format bit.
-                        if (altProcessed != False): 
-                            retVal['alt'] = altProcessed
-                        
-                        # If we have format types 9, 10, 20, or 21 get the UTC sync flag
-                        if((retVal['fmt'] <= 10) or (retVal['fmt'] >= 20)):
-                            retVal['utcSync'] = (binData[6] & 0x08) >> 3
-                        
-                        # Pull position format flag, even/odd
-                        retVal['evenOdd'] = (binData[6] & 0x04) >> 2
-                        
-                        # Grab lat bits.
-                        rawLat = ((binData[6] & 0x03) << 15) | (binData[7] << 7) | ((binData[8] & 0xfe) >> 1)
-                        retVal['rawLat'] = rawLat
-                        
-                        # Grab lon bits.
-                        rawLon = ((binData[8] & 0x01) << 16) | (binData[9] << 8) | binData[10]
-                        retVal['rawLon'] = rawLon
-                    
-                    # Airborne velocity
-                    elif retVal['fmt'] == 19:
-                        if self.decodeNames: retVal['fmtName'] = "Airborne velo"
-                        
-                        # Get subtype.
-                        subType = binData[4] & 0x07
-                        
-                        # Set the subtype
-                        retVal['subType'] = subType
-                        
-                        # Get source bit.
-                        srcFlag = (binData[8] >> 4) & 0x01
-                        retVal['srcFlag'] = srcFlag
-                        
-                        # Get the intent bit.
-                        retVal['intentFlag'] = binData[5] >> 7
-                        
-                        # Get the high-level ADS-B (IFR) support bit
-                        retVal['ifrCap'] = (binData[5] & 0x40) >> 6
-                        
-                        # Get the NUC/NAC
-                        retVal['nxc'] = (binData[5] & 0x38) >> 3
-                        
-                        # Get turn bits (reserved for future)
-                        #manuBits = binData[5] & 0x03
-                        
-                        # Set the default not-supersonic
-                        retVal['supersonic'] = False
-                        
-                        # Get Vertical rate data, and the vertical rate sign bit.
-                        vertSign = (binData[8] >> 3) & 0x01
-                        vertRateRaw = ((binData[8] & 0x07) << 6) | ((binData[9] & 0xfc) >> 2)
-                        
-                        # If we have vert rate data...
-                        if vertRateRaw > 0:
-                            # Adjust for vertical rate offset where 1 = 0, 2 = 1, etc.
-                            vertRateRaw -= 1
-                            
-                            # Adjust for vertical rate sign.
-                            if vertSign == 1:
-                                vertRateRaw = 0 - vertRateRaw
-                            
-                            # Adjust for 64 ft. scale
-                            retVal['vertRate'] = vertRateRaw * 64
-                            
-                            # Get the geometric height difference sign bit
-                            geoSign = (binData[10] >> 7) & 0x01
-                            
-                            # Get the raw geometric height difference data.
-                            geoHeightDiffRaw = binData[10] & 0x7f
-                            
-                            # If we have valid data...
-                            if geoHeightDiffRaw > 0:
-                                # Remove offset where 1 = 0, 2 = 1, etc.
-                                geoHeightDiffRaw -= 1
-                                
-                                # If we have a geometric alt below the baro alt, then make the value negative.
-                                if geoSign == 1:
-                                    geoHeightDiffRaw = 0 - geoHeightDiffRaw
-                                
-                                # Scale to 25 feet.
-                                retVal['altDelta'] = geoHeightDiffRaw * 25
-                        
-                        # Do we have a supersonic aircraft?
-                        if (subType == 2) or (subType == 4):
-                            
-                            # Also, set the supersonic flag.
-                            retVal['supersonic'] = True
-                        
-                        # Are we using a cartesian or polar coordinate system?
-                        if (subType == 1) or (subType == 2):
-                        # We are cartesian!                        
-                            retVal['dataFmt'] = "crt"
-                            
-                            # Get the E/W and N/S bit for the direction
-                            ewDirFlag = (binData[5] >> 2) & 0x01
-                            nsDirFlag = (binData[7] >> 7) & 0x01
-                            
-                            # Get E/W and N/S velocity data
-                            ewVeloRaw = ((binData[5] & 0x03) << 8) | binData[6]
-                            # Adjust offset
-                            ewVeloRaw -= 1
-                            
-                            nsVeloRaw = ((binData[7] & 0x7f) << 3) | (binData[8] >> 5)
-                            # Adjust offset
-                            nsVeloRaw -= 1
-                            
-                            # Do we have data?
-                            if (ewVeloRaw >= 0) or (nsVeloRaw >= 0):
-                            
-                                # Are we suspersonic
-                                if retVal['supersonic']:
-                                    # If so, LSB is now 4.
-                                    ewVeloRaw = ewVeloRaw << 2
-                                    nsVeloRaw = nsVeloRaw << 2
-                                
-                                # Get our velocity (knots)
-                                velo = math.sqrt((ewVeloRaw ** 2) + (nsVeloRaw ** 2))
-                                
-                                # Round our velocity to 1 decimal place.
-                                velo = round(velo, 1)
-                                
-                                # Set our ground speed.
-                                retVal['gndspeed'] = velo
-                                    
-                                # Account for E/W and N/S direction flags
-                                if(ewDirFlag == 1):
-                                    ewVeloRaw = 0 - ewVeloRaw
-                                
-                                if(nsDirFlag == 1):
-                                    nsVeloRaw = 0 - nsVeloRaw
-                                
-                                # Get our heading in degrees.
-                                heading = math.atan2(ewVeloRaw, nsVeloRaw) * 180 / math.pi
-                                
-                                # Make sure we have a heading that's > 0 flip it to the other side of the grid.
-                                if (heading < 0):
-                                    heading = heading + 360
-                              
-                                # Reduce to 1 decimal place of accuracy.
-                                heading = round(heading, 1)
-                              
-                                # Set our heading
-                                retVal['heading'] = heading
-                        
-                        # We have polar coordinates.
-                        elif (subType == 3) or (subType == 4):
-                            retVal['dataFmt'] = "plr"
-                            
-                            # Get heading status flag
-                            headingStat = (binData[5] & 0x04) >> 2
-                            
-                            # Set value
-                            retVal['headingAvail'] = headingStat
-                            
-                            # If we have heading data...
-                            if (headingStat == 1):
-                                
-                                # 1024 bit heading... LSB = 1024/360 = 0.3515625
-                                headingRaw = ((binData[5] & 0x03) << 8) | binData[6]
-                                
-                                # Convert the heading to an angle moving clockwise from north.
-                                heading = headingRaw * 0.3515625
-                                
-                                # Set the heading, rounded to one decimal point
-                                retVal['heading'] = round(heading, 1)
-                            
-                            # Get airspeed type bit
-                            airspeedType = binData[7] >> 7
-                            
-                            # Get airspeed bits
-                            rawAirspeed = ((binData[7] & 0x7f) << 3) | (binData[8] >> 5)
-                            
-                            # If we have airspeed data (data = 0)
-                            if rawAirspeed > 0:
-                                # Are we supersonic?
-                                if retVal['supersonic']:
-                                    rawAirspeed = rawAirspeed << 2
-                                
-                                retVal['airspeed'] = rawAirspeed
-                            
-                            # If we have a 0, we have true airspeed, if we have a 1 it's indicated airspeed
-                            retVal['airspeedRef'] = 'true' if airspeedType == 1 else 'indicated'
-                    
-                    # Reserved for testing
-                    elif(retVal['fmt'] == 23):
-                        if self.decodeNames: retVal['fmtName'] = "Testing"
-                        
-                        # Get subtype
-                        subType = binData[4] & 0x07
-                        retVal['subType'] = subType
-                        
-                        # If we have a subType of 7...
-                        if subType == 7:
-                            # Get the test squawk code bits
-                            modeABits = (((binData[5] << 8) | binData[6]) & 0xfff1) >> 3
-                            
-                            # Set the mode A squawk code data.
-                            retVal['aSquawk'] = self.getModeAStr(modeABits)
-                                
-                            # Check for emergency squawk codes.
-                            sqwkEmergency = self.checkSquawk(retVal['aSquawk'])
-                            
-                            # Check to see if we have some emergency condition
-                            if sqwkEmergency != False:
-                                retVal['aSquawkEmergency'] = sqwkEmergency
-                                # Set the emergency flag
-                                retVal['emergency'] = True
-                        
-                    # Reserved for system status
-                    elif(retVal['fmt'] == 24):
-                        if self.decodeNames: retVal['fmtName'] = "System status"
-                    
-                    # Reserved
-                    elif((retVal['fmt'] >= 25) and (retVal['fmt'] <= 27)):
-                        if self.decodeNames: retVal['fmtName'] = "Reserved"
-                    
-                    # Extended squitter aircraft status
-                    elif(retVal['fmt'] == 28):
-                        if self.decodeNames: retVal['fmtName'] = "ES Aircraft Status"
-                        
-                        # Get subtype
-                        subType = binData[4] & 0x07
-                        retVal['subType'] = subType
-                        
-                        # If we have a subType of 1...
-                        if subType == 1:
-                            
-                            # Get ES data
-                            esData = self.getEmergencyState(binData)
-                            
-                            # Set ES output.
-                            retVal['es'] = esData[0]
-                            if self.decodeNames: retVal['esName'] = esData[1]
-                            
-                            # If we have ES > 0 there's an emergency.
-                            if esData[0] > 0:
-                                # Set emergency flag
-                                retVal['emergency'] = True
-                            
-                            # Get the test squawk code bits
-                            modeABits = ((binData[5] << 8) | binData[6]) & 0x1fff
-                            
-                            # Set the mode A squawk code data.
-                            retVal['aSquawk'] = self.getModeAStr(modeABits)
-                            
-                            # Check for emergency squawk codes.
-                            sqwkEmergency = self.checkSquawk(retVal['aSquawk'])
-                            
-                            # Check to see if we have some emergency condition
-                            if sqwkEmergency != False:
-                                retVal['aSquawkEmergency'] = sqwkEmergency
-                                # Set the emergency flag
-                                retVal['emergency'] = True
-                    
-                    # Fluid - depends on version
-                    elif(retVal['fmt'] == 29):
-                        if self.decodeNames: retVal['fmtName'] = "Next trajectory change point / Target state and status"
-                    
-                    # Aircraft operational coordination, not used in V1
-                    elif(retVal['fmt'] == 30):
-                        if self.decodeNames: retVal['fmtName'] = "Aircraft operational coordination"
-                    
-                    # Aircraft operational status
-                    elif(retVal['fmt'] == 31):
-                        if self.decodeNames: retVal['fmtName'] = "Aircraft operational status"
-                    
-                    # Unknown/invalid
-                    else:
-                        if self.decodeNames: retVal['fmtName'] = "Invalid"
-            
-            # Military extended squitter
-            elif(retVal['df'] == 19):
-                if self.decodeNames: retVal['dfName'] = "Extended squitter (Military)"
+        # Downlink request data
+        dfData = self.getDwnlnkReq(binData)
+        
+        # Set the downlink request values
+        retVal.dr = dfData[0]
+        if self.decodeNames: retVal.drName = dfData[1]
+        
+        # Get our utility message data
+        umData = self.getUtilityMsg(binData)
+        
+        # Set the utilit message fields
+        retVal.iis = umData[0]
+        retVal.ids = umData[1]
+        
+        # If we're decoding names set the IDS name
+        if self.decodeNames: retVal.idsName = umData[2]
+    
+    def __setCommBID(self, binData, retVal):
+        """
+        Set the flight ID from a Comm-B reply in DF20 and DF21 if the MB field carries one.
+        """
+        
+        # See if we have flight ID data.
+        if binData[4] == 0x20:
+            # Convert our flight ID data to a big number so we can do binary operations on it.
+            bigNumber = (binData[5] << 40) | (binData[6] << 32) | (binData[7] << 24) | (binData[8] << 16) | (binData[9] << 8) | binData[10]
             
-            # Comm B altitude data.
-            elif(retVal['df'] == 20):
-                if self.decodeNames: retVal['dfName'] = "Comm B alt"
-                
-                # Grab our altitude.
-                alt = self.get13BitAlt(binData)
-                
-                # If we got good data
-                if alt != False:
-                    #Set our altitude data.
-                    retVal['alt'] = alt
-                    #retVal['altUnit'] = "ft"
-                
-                # Get our flight status info
-                fsData = self.getFlightStatus(binData)
-                
-                # Set flight status data.
-                retVal['fs'] = fsData[0]
-                if self.decodeNames: retVal['fsName'] = fsData[1]
-                
-                # Downlink request data
-                dfData = self.getDwnlnkReq(binData)
-                
-                # Set the downlink request values
-                retVal['dr'] = dfData[0]
-                if self.decodeNames: retVal['drName'] = dfData[1]
-                
-                # Get our utility message data
-                umData = self.getUtilityMsg(binData)
-                
-                # Set the utilit message fields
-                retVal['iis'] = umData[0]
-                retVal['ids'] = umData[1]
-                
-                # If we're decoding names set the IDS name
-                if self.decodeNames: retVal['idsName'] = umData[2]
-                
-                # See if we have flight ID data.
-                if binData[4] == 0x20:
-                    # Convert our flight ID data to a big number so we can do binary operations on it. 
-                    bigNumber = (binData[5] << 40) | (binData[6] << 32) | (binData[7] << 24) | (binData[8] << 16) | (binData[9] << 8) | binData[10]
-                    
-                    # Try to interpret bigNumber as ID data.
-                    idData = self.getIDInfo(bigNumber)
-                    
-                    # See if we have legit data.
-                    if idData != "":
-                        # Set the idInfo field.
-                        retVal['idInfo'] = idData
-                
-            # Comm B identification data.
-            elif(retVal['df'] == 21):
-                if self.decodeNames: retVal['dfName'] = "Comm B ident"
-                
-                # Get our flight status info
-                fsData = self.getFlightStatus(binData)
-                
-                # Set flight status data.
-                retVal['fs'] = fsData[0]
-                if self.decodeNames: retVal['fsName'] = fsData[1]
-                
-                # Downlink request data
-                dfData = self.getDwnlnkReq(binData)
-                
-                # Set the downlink request values
-                retVal['dr'] = dfData[0]
-                if self.decodeNames: retVal['drName'] = dfData[1]
-                
-                # Get our utility message data
-                umData = self.getUtilityMsg(binData)
-                
-                # Set the utilit message fields
-                retVal['iis'] = umData[0]
-                retVal['ids'] = umData[1]
-                
-                # If we're decoding names set the IDS name
-                if self.decodeNames: retVal['idsName'] = umData[2]
-                
-                # See if we have flight ID data.
-                if binData[4] == 0x20:
-                    # Convert our flight ID data to a big number so we can do binary operations on it. 
-                    bigNumber = (binData[5] << 40) | (binData[6] << 32) | (binData[7] << 24) | (binData[8] << 16) | (binData[9] << 8) | binData[10]
-                    
-                    # Try to interpret bigNumber as ID data.
-                    idData = self.getIDInfo(bigNumber)
-                    
-                    # See if we have legit data.
-                    if idData != "":
-                        # Set the idInfo field.
-                        retVal['idInfo'] = idData
-                
-                # Get our altitude bytes.
-                aSquawkBytes = ((binData[2] << 8) | binData[3]) & 0x1fff
-                
-                retVal['aSquawk'] = self.getModeAStr(aSquawkBytes)
-                   
-                # Check for emergency squawk codes.
-                sqwkEmergency = self.checkSquawk(retVal['aSquawk'])
-                    
-                # Check to see if we have some emergency condition
-                if sqwkEmergency != False:
-                    retVal['aSquawkEmergency'] = sqwkEmergency
-                    # Set the emergency flag
-                    retVal['emergency'] = True
+            # Try to interpret bigNumber as ID data.
+            idData = self.getIDInfo(bigNumber)
             
-            # Military use only
-            elif(retVal['df'] == 22):
-                if self.decodeNames: retVal['dfName'] = "Military"
+            # See if we have legit data.
+            if idData != "":
+                # Set the idInfo field.
+                retVal.idInfo = idData
+    
+    ############################
+    # Downlink format handlers #
+    ############################
+    
+    def __parseDF0(self, binData, retVal):
+        """
+        Short air-to-air ACAS
+        """
+        
+        if self.decodeNames: retVal.dfName = "Short Air-to-air ACAS"
+        
+        # Get vertical status bits.
+        vsBit = (binData[0] & 0x04) >> 2
+        retVal.vertStat = "air" if vsBit == 0 else "gnd"
+        retVal.cc = (binData[0] & 0x02) >> 1
+        retVal.sl = (binData[1] & 0xE0) >> 5
+        
+        # Grab our altitude.
+        self.__setAlt13(binData, retVal)
+    
+    def __parseDF4(self, binData, retVal):
+        """
+        Roll call reply (alt)
+        """
+        
+        if self.decodeNames: retVal.dfName = "Roll call reply (alt)"
+        
+        # Get flight status, downlink request and utility message data.
+        self.__setSurvFields(binData, retVal)
+        
+        # If we have a flight status that indicates an emergency...
+        if (retVal.fs >= 2) and (retVal.fs <= 4):
+            retVal.emergency = True
+            retVal.fsEmergency = True
+        else:
+            retVal.fsEmergency = False
+        
+        # Grab our altitude.
+        self.__setAlt13(binData, retVal)
+    
+    def __parseDF5(self, binData, retVal):
+        """
+        Roll call reply (ident)
+        """
+        
+        if self.decodeNames: retVal.dfName = "Roll call reply (ident)"
+        
+        # Get flight status, downlink request and utility message data.
+        self.__setSurvFields(binData, retVal)
+        
+        # Get our mode A squawk bytes.
+        self.__setSquawk(retVal, ((binData[2] << 8) | binData[3]) & 0x1fff)
+    
+    def __parseDF11(self, binData, retVal):
+        """
+        All call reply
+        """
+        
+        if self.decodeNames: retVal.dfName = "All call reply"
+        
+        # Get the CA/Capability value
+        retVal.ca = self.getCACO(binData)
+        
+        # Get the ICAO AA as a hex string and int.
+        retVal.icaoAAHx = self.getIcaoAAHx(binData)
+        retVal.icaoAAInt = self.getIcaoAAInt(binData)
+    
+    def __parseDF16(self, binData, retVal):
+        """
+        Long air-to-air ACAS
+        """
+        
+        if self.decodeNames: retVal.dfName = "Long Air-to-air ACAS"
+        
+        # Grab our altitude.
+        self.__setAlt13(binData, retVal)
+    
+    def __parseDF17(self, binData, retVal):
+        """
+        Extended squitter
+        """
+        
+        if self.decodeNames: retVal.dfName = "Extended squitter"
+        
+        # Set our CA
+        retVal.ca = self.getCACO(binData)
+        
+        # Get the ICAO AA as a hex string and int.
+        retVal.icaoAAHx = self.getIcaoAAHx(binData)
+        retVal.icaoAAInt = self.getIcaoAAInt(binData)
+        
+        # Get our format bytes and decode the ME field.
+        fmt = binData[4] >> 3
+        retVal.fmt = fmt
+        self.__fmtHandlers[fmt](binData, retVal, fmt)
+    
+    def __parseDF18(self, binData, retVal):
+        """
+        TIS-B
+        """
+        
+        if self.decodeNames: retVal.dfName = "TIS-B"
+        
+        # Get the control value
+        caCo = self.getCACO(binData)
+        
+        # Set the control value
+        retVal.ctrl = caCo
+        # Set the control name
+        if self.decodeNames: retVal.ctrlName = self.__ctrlText[caCo]
+        
+        # ADSB ES/NT w/ICAO AA
+        if caCo == 0:
+            # Get the ICAO AA as a hex string and int.
+            retVal.icaoAAHx = self.getIcaoAAHx(binData)
+            retVal.icaoAAInt = self.getIcaoAAInt(binData)
+        
+        # ADS-B ES/NT w/ other addr
+        elif caCo == 1:
+            # Set address.
+            retVal.addrHx = self.getIcaoAAHx(binData)
+            retVal.addrInt = self.getIcaoAAInt(binData)
+        
+        # ADS-B rebroadcast using DF17 msg fmt.
+        elif caCo == 6:
+            # Get the ICAO AA as a hex string and int.
+            retVal.icaoAAHx = self.getIcaoAAHx(binData)
+            retVal.icaoAAInt = self.getIcaoAAInt(binData)
+        
+        # Get our format bytes.
+        fmt = binData[4] >> 3
+        retVal.fmt = fmt
+        
+        # Only decode the ME field for CO0/1/6
+        if (caCo <= 1) or (caCo == 6):
+            self.__fmtHandlers[fmt](binData, retVal, fmt)
+    
+    def __parseDF19(self, binData, retVal):
+        """
+        Military extended squitter
+        """
+        
+        if self.decodeNames: retVal.dfName = "Extended squitter (Military)"
+    
+    def __parseDF20(self, binData, retVal):
+        """
+        Comm B altitude data.
+        """
+        
+        if self.decodeNames: retVal.dfName = "Comm B alt"
+        
+        # Grab our altitude.
+        self.__setAlt13(binData, retVal)
+        
+        # Get flight status, downlink request and utility message data.
+        self.__setSurvFields(binData, retVal)
+        
+        # See if we have flight ID data.
+        self.__setCommBID(binData, retVal)
+    
+    def __parseDF21(self, binData, retVal):
+        """
+        Comm B identification data.
+        """
+        
+        if self.decodeNames: retVal.dfName = "Comm B ident"
+        
+        # Get flight status, downlink request and utility message data.
+        self.__setSurvFields(binData, retVal)
+        
+        # See if we have flight ID data.
+        self.__setCommBID(binData, retVal)
+        
+        # Get our squawk bytes.
+        self.__setSquawk(retVal, ((binData[2] << 8) | binData[3]) & 0x1fff)
+    
+    def __parseDF22(self, binData, retVal):
+        """
+        Military use only
+        """
+        
+        if self.decodeNames: retVal.dfName = "Military"
+    
+    def __parseDF24(self, binData, retVal):
+        """
+        Comm D extended length message
+        """
+        
+        if self.decodeNames: retVal.dfName = "Comm D ELM"
+    
+    def __parseDFUnknown(self, binData, retVal):
+        """
+        Unknown/unsupported/error
+        """
+        
+        if self.decodeNames: retVal.dfName = "Unknown"
+    
+    ###################################
+    # Extended squitter type handlers #
+    ###################################
+    
+    def __parseFmtNoPos(self, binData, retVal, fmt):
+        """
+        No position info
+        """
+        
+        if self.decodeNames: retVal.fmtName = "No position info"
+        retVal.nxc = 0
+    
+    def __parseFmtIdent(self, binData, retVal, fmt):
+        """
+        ID and category
+        """
+        
+        # AC ID and aircraft category
+        if self.decodeNames: retVal.fmtName = "ID and category"
+        
+        # Get the category item #.
+        catItem = binData[4] & 0x07
+        
+        # Set the aircraft category information.
+        retVal.category = chr(0x45 - fmt) + str(catItem)
+        
+        # Convert our flight ID data to a big number so we can do binary operations on it.
+        bigNumber = (binData[5] << 40) | (binData[6] << 32) | (binData[7] << 24) | (binData[8] << 16) | (binData[9] << 8) | binData[10]
+        
+        # Try to interpret bigNumber as ID data.
+        idData = self.getIDInfo(bigNumber)
+        
+        # See if we have legit data.
+        if idData != "":
+            # Set the idInfo field.
+            retVal.idInfo = idData
+    
+    def __parseFmtSurface(self, binData, retVal, fmt):
+        """
+        Surface position
+        """
+        
+        if self.decodeNames: retVal.fmtName = "Surface pos"
+        # Calculate our nav. uncertainty category, V0 is NUC and V1 is NIC
+        retVal.nxc = 14 - fmt
+        
+        # Get movment bits
+        movementRaw = ((binData[4] & 0x07) << 4) | (binData[5] >> 4)
+        
+        # Get our track validity bit
+        headingValid = (binData[5] & 0x08) >> 3
+        retVal.headingValid = headingValid
+        
+        # If we have a valid track, get our track bits
+        if(headingValid == 1):
+            headingRaw = ((binData[5] & 0x07) << 4) | (((binData[6] & 0xF0)) >> 4)
             
-            # Comm D extended length message
-            elif(retVal['df'] == 24):
-                if self.decodeNames: retVal['dfName'] = "Comm D ELM"
+            # The track data is from 0-360, in 128 steps.
+            headingRaw = headingRaw * 2.8125
             
-            # Unknown/unsupported/error
-            else:
-                if self.decodeNames: retVal['dfName'] = "Unknown"
+            # Round to 1 decimal place
+            headingRaw = round(headingRaw, 1)
             
-        # Mode A/C data
-        elif (retVal['len'] == 2):
-            retVal['mode'] = "ac"
+            # Set the track value
+            retVal.heading = headingRaw
+        
+        # Get UTC sync and even/odd format bit.
+        utcSync = (binData[6] & 0x08) >> 3
+        evenOdd = (binData[6] & 0x04) >> 2
+        
+        # Set UTC sync and evenOdd
+        retVal.utcSync = utcSync
+        retVal.evenOdd = evenOdd
+        
+        # Get 17 bit CPR latitude
+        rawLat = ((binData[6] & 0x03) << 15) | (binData[7] << 7) | ((binData[8] & 0xfe) >> 1)
+        
+        # Get 17 bit CRP longitude
+        rawLon = ((binData[8] & 0x01) << 16) | (binData[9] << 8) | binData[10]
+        
+        # Set raw lat and lon
+        retVal.rawLat = rawLat
+        retVal.rawLon = rawLon
+    
+    def __parseFmtAirbornePos(self, binData, retVal, fmt):
+        """
+        Airborne position
+        """
+        
+        if self.decodeNames: retVal.fmtName = "Airborne pos"
+        
+        #Caclulate our NUC
+        if (fmt <= 18):
+            retVal.nxc = 18 - fmt
+        elif (fmt <= 21):
+            retVal.nxc = 29 - fmt
+        else:
+            retVal.nxc = 0
+        
+        # Get the single-antenna flag.
+        retVal.singleAnt = binData[4] & 0x01
+        
+        # Get surveillance status bytes.
+        ss = (binData[4] & 0x06) >> 1
+        
+        retVal.ss = ss
+        if self.decodeNames: retVal.ssName = self.__ssTable[ss]
+        
+        # If we have a "permanent alert"
+        if ss == 1:
+            retVal.emergency = True
+        
+        # Get the altitude type
+        if (fmt >= 9) and (fmt <= 18):
+            retVal.altType = "Baro"
+        else:
+            retVal.altType = "GNSS"
+        
+        # Attempt to decode the altitude data.
+        altitudeBytes = (binData[5] << 8) | binData[6]
+        altProcessed = self.decode12BitAlt(altitudeBytes >> 4)
+        
+        # Verify altitude and see if we have an odd format bit.
+        if (altProcessed != False):
+            retVal.alt = altProcessed
+        
+        # If we have format types 9, 10, 20, or 21 get the UTC sync flag
+        if((fmt <= 10) or (fmt >= 20)):
+            retVal.utcSync = (binData[6] & 0x08) >> 3
+        
+        # Pull position format flag, even/odd
+        retVal.evenOdd = (binData[6] & 0x04) >> 2
+        
+        # Grab lat bits.
+        rawLat = ((binData[6] & 0x03) << 15) | (binData[7] << 7) | ((binData[8] & 0xfe) >> 1)
+        retVal.rawLat = rawLat
+        
+        # Grab lon bits.
+        rawLon = ((binData[8] & 0x01) << 16) | (binData[9] << 8) | binData[10]
+        retVal.rawLon = rawLon
+    
+    def __parseFmtVelocity(self, binData, retVal, fmt):
+        """
+        Airborne velocity
+        """
+        
+        if self.decodeNames: retVal.fmtName = "Airborne velo"
+        
+        # Get subtype.
+        subType = binData[4] & 0x07
+        
+        # Set the subtype
+        retVal.subType = subType
+        
+        # Get source bit.
+        srcFlag = (binData[8] >> 4) & 0x01
+        retVal.srcFlag = srcFlag
+        
+        # Get the intent bit.
+        retVal.intentFlag = binData[5] >> 7
+        
+        # Get the high-level ADS-B (IFR) support bit
+        retVal.ifrCap = (binData[5] & 0x40) >> 6
+        
+        # Get the NUC/NAC
+        retVal.nxc = (binData[5] & 0x38) >> 3
+        
+        # Get turn bits (reserved for future)
+        #manuBits = binData[5] & 0x03
+        
+        # Do we have a supersonic aircraft?
+        supersonic = (subType == 2) or (subType == 4)
+        retVal.supersonic = supersonic
+        
+        # Get Vertical rate data, and the vertical rate sign bit.
+        vertSign = (binData[8] >> 3) & 0x01
+        vertRateRaw = ((binData[8] & 0x07) << 6) | ((binData[9] & 0xfc) >> 2)
+        
+        # If we have vert rate data...
+        if vertRateRaw > 0:
+            # Adjust for vertical rate offset where 1 = 0, 2 = 1, etc.
+            vertRateRaw -= 1
+            
+            # Adjust for vertical rate sign.
+            if vertSign == 1:
+                vertRateRaw = 0 - vertRateRaw
+            
+            # Adjust for 64 ft. scale
+            retVal.vertRate = vertRateRaw * 64
             
-            # Set our mode a squawk code... this is only supported for dump1090 data right now.
-            retVal['aSquawk'] = self.formatString(binascii.hexlify(binData)).rjust(4, '0')
+            # Get the geometric height difference sign bit
+            geoSign = (binData[10] >> 7) & 0x01
             
-            # Check for emergency squawk codes.
-            sqwkEmergency = self.checkSquawk(retVal['aSquawk'])
+            # Get the raw geometric height difference data.
+            geoHeightDiffRaw = binData[10] & 0x7f
             
-            # Check to see if we have some emergency condition
-            if sqwkEmergency != False:
-                retVal['aSquawkEmergency'] = sqwkEmergency
-                # Set the emergency flag
-                retVal['emergency'] = True
+            # If we have valid data...
+            if geoHeightDiffRaw > 0:
+                # Remove offset where 1 = 0, 2 = 1, etc.
+                geoHeightDiffRaw -= 1
+                
+                # If we have a geometric alt below the baro alt, then make the value negative.
+                if geoSign == 1:
+                    geoHeightDiffRaw = 0 - geoHeightDiffRaw
+                
+                # Scale to 25 feet.
+                retVal.altDelta = geoHeightDiffRaw * 25
+        
+        # Are we using a cartesian or polar coordinate system?
+        if (subType == 1) or (subType == 2):
+        # We are cartesian!
+            retVal.dataFmt = "crt"
             
-            # Get the mode A squawk as an integer.
-            aHx = (binData[0] << 8) | binData[1]
+            # Get the E/W and N/S bit for the direction
+            ewDirFlag = (binData[5] >> 2) & 0x01
+            nsDirFlag = (binData[7] >> 7) & 0x01
             
-            # Attempt to decode the mode A squawk as a mode C altitude.
-            cAlt = self.modeASquawk2modeCAlt(aHx)
+            # Get E/W and N/S velocity data
+            ewVeloRaw = ((binData[5] & 0x03) << 8) | binData[6]
+            # Adjust offset
+            ewVeloRaw -= 1
             
-            # If it worked, set our possible altitude value.
-            if cAlt != False:
-                retVal['cAlt'] = cAlt
+            nsVeloRaw = ((binData[7] & 0x7f) << 3) | (binData[8] >> 5)
+            # Adjust offset
+            nsVeloRaw -= 1
+            
+            # Do we have data?
+            if (ewVeloRaw >= 0) or (nsVeloRaw >= 0):
+                
+                # Are we suspersonic
+                if supersonic:
+                    # If so, LSB is now 4.
+                    ewVeloRaw = ewVeloRaw << 2
+                    nsVeloRaw = nsVeloRaw << 2
+                
+                # Get our velocity (knots)
+                velo = math.sqrt((ewVeloRaw ** 2) + (nsVeloRaw ** 2))
+                
+                # Round our velocity to 1 decimal place.
+                velo = round(velo, 1)
+                
+                # Set our ground speed.
+                retVal.gndspeed = velo
+                
+                # Account for E/W and N/S direction flags
+                if(ewDirFlag == 1):
+                    ewVeloRaw = 0 - ewVeloRaw
+                
+                if(nsDirFlag == 1):
+                    nsVeloRaw = 0 - nsVeloRaw
+                
+                # Get our heading in degrees.
+                heading = math.atan2(ewVeloRaw, nsVeloRaw) * 180 / math.pi
+                
+                # Make sure we have a heading that's > 0 flip it to the other side of the grid.
+                if (heading < 0):
+                    heading = heading + 360
+                
+                # Reduce to 1 decimal place of accuracy.
+                heading = round(heading, 1)
+                
+                # Set our heading
+                retVal.heading = heading
+        
+        # We have polar coordinates.
+        elif (subType == 3) or (subType == 4):
+            retVal.dataFmt = "plr"
             
+            # Get heading status flag
+            headingStat = (binData[5] & 0x04) >> 2
+            
+            # Set value
+            retVal.headingAvail = headingStat
+            
+            # If we have heading data...
+            if (headingStat == 1):
+                
+                # 1024 bit heading... LSB = 1024/360 = 0.3515625
+                headingRaw = ((binData[5] & 0x03) << 8) | binData[6]
+                
+                # Convert the heading to an angle moving clockwise from north.
+                heading = headingRaw * 0.3515625
+                
+                # Set the heading, rounded to one decimal point
+                retVal.heading = round(heading, 1)
+            
+            # Get airspeed type bit
+            airspeedType = binData[7] >> 7
+            
+            # Get airspeed bits
+            rawAirspeed = ((binData[7] & 0x7f) << 3) | (binData[8] >> 5)
+            
+            # If we have airspeed data (data = 0)
+            if rawAirspeed > 0:
+                # Are we supersonic?
+                if supersonic:
+                    rawAirspeed = rawAirspeed << 2
+                
+                retVal.airspeed = rawAirspeed
+            
+            # If we have a 0, we have true airspeed, if we have a 1 it's indicated airspeed
+            retVal.airspeedRef = 'true' if airspeedType == 1 else 'indicated'
+    
+    def __parseFmtTest(self, binData, retVal, fmt):
+        """
+        Reserved for testing
+        """
+        
+        if self.decodeNames: retVal.fmtName = "Testing"
+        
+        # Get subtype
+        subType = binData[4] & 0x07
+        retVal.subType = subType
+        
+        # If we have a subType of 7...
+        if subType == 7:
+            # Get the test squawk code bits
+            self.__setSquawk(retVal, (((binData[5] << 8) | binData[6]) & 0xfff1) >> 3)
+    
+    def __parseFmtSysStatus(self, binData, retVal, fmt):
+        """
+        Reserved for system status
+        """
+        
+        if self.decodeNames: retVal.fmtName = "System status"
+    
+    def __parseFmtReserved(self, binData, retVal, fmt):
+        """
+        Reserved
+        """
+        
+        if self.decodeNames: retVal.fmtName = "Reserved"
+    
+    def __parseFmtAcStatus(self, binData, retVal, fmt):
+        """
+        Extended squitter aircraft status
+        """
+        
+        if self.decodeNames: retVal.fmtName = "ES Aircraft Status"
+        
+        # Get subtype
+        subType = binData[4] & 0x07
+        retVal.subType = subType
+        
+        # If we have a subType of 1...
+        if subType == 1:
+            
+            # Get ES data
+            esData = self.getEmergencyState(binData)
+            
+            # Set ES output.
+            retVal.es = esData[0]
+            if self.decodeNames: retVal.esName = esData[1]
+            
+            # If we have ES > 0 there's an emergency.
+            if esData[0] > 0:
+                # Set emergency flag
+                retVal.emergency = True
+            
+            # Get the test squawk code bits
+            self.__setSquawk(retVal, ((binData[5] << 8) | binData[6]) & 0x1fff)
+    
+    def __parseFmtTrajectory(self, binData, retVal, fmt):
+        """
+        Fluid - depends on version
+        """
+        
+        if self.decodeNames: retVal.fmtName = "Next trajectory change point / Target state and status"
+    
+    def __parseFmtOpCoord(self, binData, retVal, fmt):
+        """
+        Aircraft operational coordination, not used in V1
+        """
+        
+        if self.decodeNames: retVal.fmtName = "Aircraft operational coordination"
+    
+    def __parseFmtOpStatus(self, binData, retVal, fmt):
+        """
+        Aircraft operational status
+        """
+        
+        if self.decodeNames: retVal.fmtName = "Aircraft operational status"
+    
+    def __parseFmtInvalid(self, binData, retVal, fmt):
+        """
+        Unknown/invalid
+        """
+        
+        if self.decodeNames: retVal.fmtName = "Invalid"
+    
+    def __buildHandlerTables(self):
+        """
+        Build the downlink format and extended squitter type code dispatch tables used by the decoder. Both tables are indexed directly by the 5-bit DF or TC value.
+        """
+        
+        # Every DF we don't explicitly support is unknown.
+        self.__dfHandlers = [self.__parseDFUnknown] * 32
+        self.__dfHandlers[0] = self.__parseDF0
+        self.__dfHandlers[4] = self.__parseDF4
+        self.__dfHandlers[5] = self.__parseDF5
+        self.__dfHandlers[11] = self.__parseDF11
+        self.__dfHandlers[16] = self.__parseDF16
+        self.__dfHandlers[17] = self.__parseDF17
+        self.__dfHandlers[18] = self.__parseDF18
+        self.__dfHandlers[19] = self.__parseDF19
+        self.__dfHandlers[20] = self.__parseDF20
+        self.__dfHandlers[21] = self.__parseDF21
+        self.__dfHandlers[22] = self.__parseDF22
+        self.__dfHandlers[24] = self.__parseDF24
+        
+        # Extended squitter type codes.
+        self.__fmtHandlers = [self.__parseFmtInvalid] * 32
+        self.__fmtHandlers[0] = self.__parseFmtNoPos
+        
+        for i in range(1, 5):
+            self.__fmtHandlers[i] = self.__parseFmtIdent
+        
+        for i in range(5, 9):
+            self.__fmtHandlers[i] = self.__parseFmtSurface
+        
+        for i in range(9, 19):
+            self.__fmtHandlers[i] = self.__parseFmtAirbornePos
+        
+        for i in range(20, 23):
+            self.__fmtHandlers[i] = self.__parseFmtAirbornePos
+        
+        self.__fmtHandlers[19] = self.__parseFmtVelocity
+        self.__fmtHandlers[23] = self.__parseFmtTest
+        self.__fmtHandlers[24] = self.__parseFmtSysStatus
+        
+        for i in range(25, 28):
+            self.__fmtHandlers[i] = self.__parseFmtReserved
+        
+        self.__fmtHandlers[28] = self.__parseFmtAcStatus
+        self.__fmtHandlers[29] = self.__parseFmtTrajectory
+        self.__fmtHandlers[30] = self.__parseFmtOpCoord
+        self.__fmtHandlers[31] = self.__parseFmtOpStatus
+    
+    def __parseModeAC(self, binData, retVal):
+        """
+        Mode A/C data
+        """
+        
+        retVal.mode = "ac"
+        
+        # Set our mode a squawk code... this is only supported for dump1090 data right now.
+        retVal.aSquawk = self.formatString(binascii.hexlify(binData)).rjust(4, '0')
+        
+        # Check for emergency squawk codes.
+        sqwkEmergency = self.checkSquawk(retVal.aSquawk)
+        
+        # Check to see if we have some emergency condition
+        if sqwkEmergency != False:
+            retVal.aSquawkEmergency = sqwkEmergency
+            # Set the emergency flag
+            retVal.emergency = True
+        
+        # Get the mode A squawk as an integer.
+        aHx = (binData[0] << 8) | binData[1]
+        
+        # Attempt to decode the mode A squawk as a mode C altitude.
+        cAlt = self.modeASquawk2modeCAlt(aHx)
+        
+        # If it worked, set our possible altitude value.
+        if cAlt != False:
+            retVal.cAlt = cAlt
+    
+    def __decodeFrame(self, binData, retVal):
+        """
+        Decode binData into retVal, which is either an ssrFrame or an ssrDictFrame. Mode S frames are routed through the DF dispatch table.
+        
+        Returns retVal.
+        """
+        
+        # Get length in bytes.
+        frameLen = len(binData)
+        retVal.len = frameLen
+        
+        # If we seem to have mode S based on length
+        # 7 bytes = 56 bits, 14 bytes = 112 bits
+        if (frameLen == 7) or (frameLen == 14):
+            
+            #Set our type to mode-s
+            retVal.mode = "s"
+            
+            # Get our DF (downlink format)
+            df = binData[0] >> 3
+            retVal.df = df
+            
+            # Get the frame's CRC value and compute the CRC value of the frame.
+            retVal.frameCrc = (binData[-3] << 16) + (binData[-2] << 8) + (binData[-1])
+            retVal.cmpCrc = self.getCrc(binData[0:-3])
+            
+            # Try to fix bad CRCs if we're set up to.
+            if (self.__crcFixBits > 0) and (retVal.frameCrc != retVal.cmpCrc):
+                binData = self.__fixCrc(binData, retVal)
+            
+            # Decode the rest of the frame based on DF.
+            self.__dfHandlers[df](binData, retVal)
+        
+        # Mode A/C data
+        elif (frameLen == 2):
+            self.__parseModeAC(binData, retVal)
+        
         # Looks like the data is not Mode A/C/S based on invalid length.
         else:
-            retVal['mode'] = "invalid"
+            retVal.mode = "invalid"
+        
+        return retVal
+    
+    def ssrParse(self, binData):
+        """
+        Parse SSR data.
+        
+        Parse SSR data, looking for fields, etc. from binary data in the string binData.
+        Mode A/C data is only supported for dump1090-style messages which are already decoded into 2-byte hex representations of a mode A squawk code where squawk 1200 = 0x1200.
+        
+        Please note that when decoding Mode A/C replies, we don't actually know if we're working with a mode A ident reply or mode C altitude reply because we don't know the RADAR pulse spacing from the interrogation. We do our best to see if a squawk could be a mode C reply and decode it both as mode A and C.
+        
+        This method returns a dictionary of all decode fields.
+        
+        http://www.lll.lu/~edward/edward/adsb/DecodingADSBposition.html
+        http://www.radartutorial.eu/13.ssr/sr25.en.html
+        """
         
         # Return our dictionary full of new information from parsed frames.
-        return retVal
\ No newline at end of file
+        return self.__decodeFrame(binData, ssrDictFrame()).__dict__
+    
+    def ssrParseFrame(self, binData):
+        """
+        Parse SSR data the same way ssrParse() does, but return the decoded fields as a compact ssrFrame record instead of a dictionary. Use the record's toDict() method to get the dictionary ssrParse() would have returned.
+        """
+        
+        return self.__decodeFrame(binData, ssrFrame())
+    
+    def __decodeHeader(self, binData, retVal):
+        """
+        Decode only the fields needed to route or dedupe a frame: length, mode, DF, CRC values, the ICAO AA when the frame carries one in the clear, and the extended squitter type code.
+        
+        Returns the frame data, which is a corrected copy of binData if we fixed its CRC.
+        """
+        
+        # Get length in bytes.
+        frameLen = len(binData)
+        retVal.len = frameLen
+        
+        # Mode S
+        if (frameLen == 7) or (frameLen == 14):
+            retVal.mode = "s"
+            
+            # Get our DF (downlink format)
+            df = binData[0] >> 3
+            retVal.df = df
+            
+            # Get the frame's CRC value and compute the CRC value of the frame.
+            retVal.frameCrc = (binData[-3] << 16) + (binData[-2] << 8) + (binData[-1])
+            retVal.cmpCrc = self.getCrc(binData[0:-3])
+            
+            # Try to fix bad CRCs if we're set up to.
+            if (self.__crcFixBits > 0) and (retVal.frameCrc != retVal.cmpCrc):
+                binData = self.__fixCrc(binData, retVal)
+            
+            # DF11, DF17, and DF18 with CO0/6 carry the ICAO AA in the clear.
+            if (df == 11) or (df == 17) or ((df == 18) and (((binData[0] & 0x07) == 0) or ((binData[0] & 0x07) == 6))):
+                retVal.icaoAAHx = self.getIcaoAAHx(binData)
+                retVal.icaoAAInt = self.getIcaoAAInt(binData)
+            
+            # Get the type code of extended squitters.
+            if ((df == 17) or (df == 18)) and (frameLen == 14):
+                retVal.fmt = binData[4] >> 3
+        
+        # Mode A/C data
+        elif (frameLen == 2):
+            retVal.mode = "ac"
+        
+        # Looks like the data is not Mode A/C/S based on invalid length.
+        else:
+            retVal.mode = "invalid"
+        
+        return binData
+    
+    def __decodeBody(self, binData, retVal):
+        """
+        Decode everything past the header fields set by __decodeHeader() into retVal.
+        
+        Returns retVal.
+        """
+        
+        # Get length in bytes.
+        frameLen = len(binData)
+        
+        # Mode S frames go through the DF dispatch table.
+        if (frameLen == 7) or (frameLen == 14):
+            self.__dfHandlers[binData[0] >> 3](binData, retVal)
+        
+        # Mode A/C data
+        elif (frameLen == 2):
+            self.__parseModeAC(binData, retVal)
+        
+        return retVal
+    
+    def __batchFrame2Bin(self, frame):
+        """
+        Convert one frame passed to parseBatch() to a bytearray. Binary frames are used as they are. Hex frames can have dump1090 delimiters, and the MLAT timestamp is dropped from MLAT frames.
+        
+        Returns a bytearray, which is empty if the hex data is invalid.
+        """
+        
+        # Binary frames are good as they are.
+        if type(frame) == bytearray:
+            return frame
+        
+        # Clean up the hex string.
+        frame = frame.strip()
+        
+        # Drop the MLAT timestamp.
+        if frame[0:1] == "@":
+            frame = frame[13:]
+        
+        frame = frame.replace('*', '').replace(';', '')
+        
+        try:
+            retVal = bytearray(binascii.unhexlify(frame))
+        
+        except (TypeError, ValueError):
+            retVal = bytearray()
+        
+        return retVal
+    
+    def parseBatch(self, frames):
+        """
+        Parse many SSR frames at once into columns. frames can be a list of binary frames (bytearrays), a list of hex strings, or a string containing one hex frame per line such as a buffer of dump1090 output. Mode S frames are grouped by length and decoded with numpy, so this requires numpy.
+        
+        Returns a dictionary of numpy arrays with one entry per frame: len, df, frameCrc, cmpCrc, icaoAAInt, fmt, alt, aSquawkInt, evenOdd, rawLat, and rawLon. Fields a frame doesn't have are -1, or NaN for alt. aSquawkInt holds the squawk as a hex-style int, so squawk 1200 = 0x1200. Frames are not CRC corrected here.
+        """
+        
+        # Make sure we have numpy.
+        if numpy is None:
+            raise ImportError("parseBatch() requires numpy.")
+        
+        # If we got a buffer split it into frames.
+        if isinstance(frames, (str, type(u""))):
+            frames = [thisLine for thisLine in frames.splitlines() if thisLine.strip() != ""]
+        
+        binFrames = [self.__batchFrame2Bin(thisFrame) for thisFrame in frames]
+        frameCount = len(binFrames)
+        
+        # Set up our columns.
+        frameLens = numpy.array([len(thisFrame) for thisFrame in binFrames], dtype=numpy.int32)
+        retVal = {
+            'len': frameLens,
+            'df': numpy.full(frameCount, -1, dtype=numpy.int16),
+            'frameCrc': numpy.full(frameCount, -1, dtype=numpy.int64),
+            'cmpCrc': numpy.full(frameCount, -1, dtype=numpy.int64),
+            'icaoAAInt': numpy.full(frameCount, -1, dtype=numpy.int32),
+            'fmt': numpy.full(frameCount, -1, dtype=numpy.int16),
+            'alt': numpy.full(frameCount, numpy.nan, dtype=numpy.float64),
+            'aSquawkInt': numpy.full(frameCount, -1, dtype=numpy.int32),
+            'evenOdd': numpy.full(frameCount, -1, dtype=numpy.int8),
+            'rawLat': numpy.full(frameCount, -1, dtype=numpy.int32),
+            'rawLon': numpy.full(frameCount, -1, dtype=numpy.int32)
+        }
+        
+        # Mode A/C frames already have the squawk as hex.
+        for thisRow in numpy.flatnonzero(frameLens == 2):
+            retVal['aSquawkInt'][thisRow] = (binFrames[thisRow][0] << 8) | binFrames[thisRow][1]
+        
+        # Decode Mode S frames in blocks of the same length.
+        for frameLen in (7, 14):
+            rows = numpy.flatnonzero(frameLens == frameLen)
+            
+            if len(rows) == 0:
+                continue
+            
+            rawBlock = self.packFrameBatch([binFrames[thisRow] for thisRow in rows])
+            
+            # Widen the bytes so we can shift them around.
+            block = rawBlock.astype(numpy.int32)
+            
+            # DF and CRC values.
+            df = block[:, 0] >> 3
+            parity, syndrome = self.getCrcBatch(rawBlock)
+            
+            retVal['df'][rows] = df
+            retVal['cmpCrc'][rows] = parity
+            retVal['frameCrc'][rows] = parity ^ syndrome
+            
+            # DF11, DF17, and DF18 with CO0/6 carry the ICAO AA in the clear.
+            caCo = block[:, 0] & 0x07
+            clearAA = (df == 11) | (df == 17) | ((df == 18) & ((caCo == 0) | (caCo == 6)))
+            retVal['icaoAAInt'][rows[clearAA]] = ((block[clearAA, 1] << 16) | (block[clearAA, 2] << 8) | block[clearAA, 3])
+            
+            # 13 bit altitude and squawk fields.
+            acBits = ((block[:, 2] << 8) | block[:, 3]) & 0x1fff
+            
+            altRows = (df == 0) | (df == 4) | (df == 16) | (df == 20)
+            retVal['alt'][rows[altRows]] = ssrParse.__alt13Arr[acBits[altRows]]
+            
+            sqkRows = (df == 5) | (df == 21)
+            retVal['aSquawkInt'][rows[sqkRows]] = ssrParse.__gillham2BinArr[acBits[sqkRows]]
+            
+            # Extended squitters.
+            if frameLen == 14:
+                fmt = block[:, 4] >> 3
+                esRows = (df == 17) | (df == 18)
+                retVal['fmt'][rows[esRows]] = fmt[esRows]
+                
+                # Only decode the ME field of DF18 for CO0/1/6.
+                esRows = (df == 17) | ((df == 18) & ((caCo <= 1) | (caCo == 6)))
+                
+                # Airborne and surface position.
+                airRows = esRows & (((fmt >= 9) & (fmt <= 18)) | ((fmt >= 20) & (fmt <= 22)))
+                posRows = airRows | (esRows & (fmt >= 5) & (fmt <= 8))
+                
+                retVal['evenOdd'][rows[posRows]] = (block[posRows, 6] & 0x04) >> 2
+                retVal['rawLat'][rows[posRows]] = ((block[posRows, 6] & 0x03) << 15) | (block[posRows, 7] << 7) | ((block[posRows, 8] & 0xfe) >> 1)
+                retVal['rawLon'][rows[posRows]] = ((block[posRows, 8] & 0x01) << 16) | (block[posRows, 9] << 8) | block[posRows, 10]
+                
+                # Airborne position altitude.
+                retVal['alt'][rows[airRows]] = ssrParse.__alt12Arr[((block[airRows, 5] << 8) | block[airRows, 6]) >> 4]
+                
+                # Squawk codes from test messages with subtype 7 and aircraft status with subtype 1.
+                meSqkBits = (block[:, 5] << 8) | block[:, 6]
+                
+                sqkRows = esRows & (fmt == 23) & ((block[:, 4] & 0x07) == 7)
+                retVal['aSquawkInt'][rows[sqkRows]] = ssrParse.__gillham2BinArr[(meSqkBits[sqkRows] & 0xfff1) >> 3]
+                
+                sqkRows = esRows & (fmt == 28) & ((block[:, 4] & 0x07) == 1)
+                retVal['aSquawkInt'][rows[sqkRows]] = ssrParse.__gillham2BinArr[meSqkBits[sqkRows] & 0x1fff]
+        
+        return retVal
+    
+    def ssrParseLazy(self, binData):
+        """
+        Parse SSR data in two stages. Only the header fields (len, mode, df, frameCrc, cmpCrc, corrected, icaoAAHx, icaoAAInt and fmt) are decoded up front, and the rest of the frame is decoded the first time any other field is read.
+        
+        Returns an ssrLazyFrame.
+        """
+        
+        retVal = ssrLazyFrame(binData, self.__decodeBody)
+        
+        # Make sure we decode the rest of the frame from the corrected data if we fixed it.
+        retVal.setBinData(self.__decodeHeader(binData, retVal))
+        
+        return retVal
+
+
+##################
+# ssrFrame class #
+##################
+
+class ssrFrame(object):
+    """
+    ssrFrame is a compact record of the fields decoded from a single SSR frame by ssrParse.ssrParseFrame(). Fields that weren't decoded from the frame aren't set.
+    
+    Fields can be read and set like a dictionary (frame['df'], 'alt' in frame), and toDict() returns the same dictionary ssrParse.ssrParse() would have.
+    """
+    
+    # Every field ssrParse can decode.
+    __slots__ = ('len', 'mode', 'df', 'frameCrc', 'cmpCrc', 'dfName', 'vertStat', 'cc', 'sl', 'alt', 'fs', 'fsName', 'fsEmergency',
+        'emergency', 'dr', 'drName', 'iis', 'ids', 'idsName', 'aSquawk', 'aSquawkEmergency', 'cAlt', 'ca', 'ctrl', 'ctrlName',
+        'icaoAAHx', 'icaoAAInt', 'addrHx', 'addrInt', 'fmt', 'fmtName', 'nxc', 'category', 'idInfo', 'headingValid', 'heading',
+        'utcSync', 'evenOdd', 'rawLat', 'rawLon', 'singleAnt', 'ss', 'ssName', 'altType', 'subType', 'srcFlag', 'intentFlag',
+        'ifrCap', 'supersonic', 'vertRate', 'altDelta', 'dataFmt', 'gndspeed', 'headingAvail', 'airspeed', 'airspeedRef', 'es',
+        'esName', 'corrected')
+    
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        
+        except AttributeError:
+            raise KeyError(key)
+    
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+    
+    def __contains__(self, key):
+        return hasattr(self, key)
+    
+    def get(self, key, default=None):
+        """
+        Get a field by name, returning default if the field isn't set.
+        """
+        
+        return getattr(self, key, default)
+    
+    def toDict(self):
+        """
+        Convert the record to a dictionary containing only the fields that were set.
+        """
+        
+        retVal = {}
+        
+        for thisField in ssrFrame.__slots__:
+            try:
+                retVal[thisField] = getattr(self, thisField)
+            
+            except AttributeError:
+                # Field wasn't set for this frame.
+                pass
+        
+        return retVal
+
+
+######################
+# ssrLazyFrame class #
+######################
+
+class ssrLazyFrame(ssrFrame):
+    """
+    ssrLazyFrame is an ssrFrame returned by ssrParse.ssrParseLazy() that holds only the frame's header fields until something asks for a field that hasn't been decoded yet. At that point the whole frame is decoded.
+    """
+    
+    __slots__ = ('_binData', '_decoder', '_decoded', '_fields')
+    
+    # Fields the header decoder can set.
+    headerFields = ('len', 'mode', 'df', 'frameCrc', 'cmpCrc', 'corrected', 'icaoAAHx', 'icaoAAInt', 'fmt')
+    
+    def __init__(self, binData, decoder):
+        # Keep the raw frame and the function that decodes everything past the header.
+        self._binData = binData
+        self._decoder = decoder
+        self._decoded = False
+        self._fields = None
+    
+    def __getattr__(self, name):
+        # This only gets called for fields that aren't in our slots.
+        if name in ssrFrame.__slots__:
+            self.decode()
+            
+            # Decoded fields live in the dictionary from the full decode.
+            if name in self._fields:
+                return self._fields[name]
+        
+        raise AttributeError(name)
+    
+    def setBinData(self, binData):
+        """
+        Set the frame data the rest of the frame gets decoded from.
+        """
+        
+        self._binData = binData
+    
+    def isDecoded(self):
+        """
+        Returns True if the full frame has been decoded, False if we only have the header.
+        """
+        
+        return self._decoded
+    
+    def decode(self):
+        """
+        Decode the full frame if we haven't already.
+        """
+        
+        if self._decoded == False:
+            # Flag first so a failed decode doesn't get retried on every field access.
+            self._decoded = True
+            
+            # Start with the header we already have and decode the rest of the frame on top of it.
+            fullFrame = ssrDictFrame()
+            fullFrame.__dict__ = self.headerDict()
+            self._fields = fullFrame.__dict__
+            
+            self._decoder(self._binData, fullFrame)
+    
+    def toDict(self):
+        """
+        Decode the full frame if we haven't already and convert it to a dictionary.
+        """
+        
+        self.decode()
+        
+        return dict(self._fields)
+    
+    def headerDict(self):
+        """
+        Convert only the header fields to a dictionary without decoding the rest of the frame.
+        """
+        
+        retVal = {}
+        
+        for thisField in ssrLazyFrame.headerFields:
+            try:
+                retVal[thisField] = object.__getattribute__(self, thisField)
+            
+            except AttributeError:
+                # Field wasn't set for this frame.
+                pass
+        
+        return retVal
+
+
+######################
+# ssrDictFrame class #
+######################
+
+class ssrDictFrame(object):
+    """
+    ssrDictFrame lets the decoder set fields as attributes while ssrParse.ssrParse() hands back the instance's __dict__ as its result.
+    """
+    
+    pass
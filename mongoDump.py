@@ -14,20 +14,29 @@ except:
 	raise IOError("No configuration present. Please copy config/config.py to the airSuck folder and edit it.")
 
 import sys
-import redis
 import pymongo
 import time
 import json
 import datetime
 import traceback
+import Queue
 from libAirSuck import asLog
+from libAirSuck import asCodec
+from libAirSuck import asRedisPool
+from libAirSuck import asLocalQueue
 from pprint import pprint
 
 #Redis queue name
 targetQ = "airReliable"
 
 # Redis instance for queueing.
-rQ = redis.StrictRedis(host=config.connRel['host'], port=config.connRel['port'])
+rQ = asRedisPool().getRedis(config.connRel['host'], config.connRel['port'])
+
+# When airSuck.py runs us alongside the connectors they hand us data through a local queue.
+localQ = None
+
+if config.connPub['transport'] == "local":
+    localQ = asLocalQueue().subscribe([config.connRel['qName']])
 
 #Delay this many seconds if the queue is empty to prevent
 #stupid amounts of CPU utilization.
@@ -65,9 +74,12 @@ def str2Datetime(strDateTime):
     
     return retVal
 
-# Decapsulate the JSON data.
+# Decodes JSON or binary messages.
+codec = asCodec()
+
+# Decapsulate the JSON or binary data.
 def dejsonify(msg):
-        return json.loads(msg)
+        return codec.decode(msg)
 
 # Insert records into specified mongo instance
 def serializeADSB(entry):
@@ -76,59 +88,92 @@ def serializeADSB(entry):
 # Set up the logger.
 logger = asLog(config.connMongo['logMode'])
 
-# If this mongo engine is enabled...
-if config.connMongo['enabled'] == True:
-    # Limits?
-    timeLimit = datetime.timedelta(seconds=config.connMongo['insertDelay'])
+# Get the oldest entry from the queue.
+def popEntry():
+    """
+    Get the oldest entry from the connector reliable queue, waiting up to checkDelay seconds for one when the queue is empty. Returns None if we didn't get anything.
+    """
+    
+    retVal = None
+    
+    # When airSuck.py runs us alongside the connectors we get data from the local queue instead of Redis.
+    if localQ is not None:
+        try:
+            retVal = localQ.get(True, checkDelay)['data']
+        
+        except Queue.Empty:
+            None
+    
+    else:
+        retVal = rQ.rpop(config.connRel['qName'])
+        
+        # If we have no data sleep for our configured delay to save CPU.
+        if (retVal == None):
+            time.sleep(checkDelay)
+    
+    return retVal
 
-    # What time is it now?
-    timeThen = datetime.datetime.now()
-    timeNow = datetime.datetime.now()
+def run():
+    """
+    Dump connector data to MongoDB until keepRunning is False or we get a keyboard interrupt.
+    """
+    
+    global keepRunning
     
-    # Infinite fucking loop.
-    logger.log("Dumping connector data from queue to MongoDB.")
-    while(keepRunning) :
-            try:
-                    # Pull oldest entry from the queue.
-                    dQd = rQ.rpop(config.connRel['qName'])
-                    
-                    # If we have no data sleep for our configured delay to save CPU.
-                    if(dQd == None):
-                        time.sleep(checkDelay)
-                    else:
-                            # We have data so we should break it out of JSON formatting.
-                            xDqd = dejsonify(dQd)
-                            xDqd['dts'] = str2Datetime(xDqd['dts'])
-                            
-                            # Add record to buffer.
-                            insertBuff.append(xDqd)
-                            
-                            # What time is it now?
-                            timeNow = datetime.datetime.now()
-                            
-                            # Time to store?
-                            if (timeNow - timeThen) > timeLimit:
-                                # Bulk insert
-                                serializeADSB(insertBuff)
+    # If this mongo engine is enabled...
+    if config.connMongo['enabled'] == True:
+        # Limits?
+        timeLimit = datetime.timedelta(seconds=config.connMongo['insertDelay'])
+        
+        # What time is it now?
+        timeThen = datetime.datetime.now()
+        timeNow = datetime.datetime.now()
+        
+        # Infinite fucking loop.
+        logger.log("Dumping connector data from queue to MongoDB.")
+        while(keepRunning) :
+                try:
+                        # Pull oldest entry from the queue.
+                        dQd = popEntry()
+                        
+                        if(dQd != None):
+                                # We have data so we should break it out of JSON formatting.
+                                xDqd = dejsonify(dQd)
+                                xDqd['dts'] = str2Datetime(xDqd['dts'])
                                 
-                                # Reset our then.
-                                timeThen = datetime.datetime.now()
+                                # Add record to buffer.
+                                insertBuff.append(xDqd)
                                 
-                                # Nuke buffered records because we've theoretically alread serialized them.
-                                insertBuff[:] = []
-            
-            except KeyboardInterrupt:
-                keepRunning = False
+                                # What time is it now?
+                                timeNow = datetime.datetime.now()
+                                
+                                # Time to store?
+                                if (timeNow - timeThen) > timeLimit:
+                                    # Bulk insert
+                                    serializeADSB(insertBuff)
+                                    
+                                    # Reset our then.
+                                    timeThen = datetime.datetime.now()
+                                    
+                                    # Nuke buffered records because we've theoretically alread serialized them.
+                                    insertBuff[:] = []
+                
+                except KeyboardInterrupt:
+                    keepRunning = False
                 
-                try:
-                    # Store records.
-                    serializeADSB(insertBuff)
                 except:
-                    None
-            
-            except:
-                tb = traceback.format_exc()
-                logger.log("Failed to pull from the Redis queue. Sleeping %s sec\n%s" %(checkDelay, tb))
-
-else:
-    logger.log("The connector mongoDB engine is not enabled in the configuration.")
+                    tb = traceback.format_exc()
+                    logger.log("Failed to pull from the Redis queue. Sleeping %s sec\n%s" %(checkDelay, tb))
+        
+        try:
+            # Store records.
+            if len(insertBuff) > 0:
+                serializeADSB(insertBuff)
+        except:
+            None
+    
+    else:
+        logger.log("The connector mongoDB engine is not enabled in the configuration.")
+
+if __name__ == "__main__":
+    run()
@@ -17,7 +17,6 @@ try:
 except:
 	raise IOError("No configuration present. Please copy config/config.py to the airSuck folder and edit it.")
 
-import redis
 import time
 import json
 import threading
@@ -27,7 +26,13 @@ import traceback
 from libAirSuck import cprMath
 from libAirSuck import airSuckUtil
 from libAirSuck import asLog
+from libAirSuck import asConsumer
+from libAirSuck import asCodec
+from libAirSuck import ssrParse
+from libAirSuck import ssrBatchDecoder
 from libAirSuck import ssrReg
+from libAirSuck import asRedisPool
+from libAirSuck import asLocalQueue
 from pprint import pprint
 
 
@@ -52,11 +57,26 @@ class SubListener(threading.Thread):
         
         # Redis queues and entities
         self.__channels = channels
-        self.__psQ = None
+        self.__codec = asCodec(config.statePub['msgFormat'])
         self.__sPsQ = None
         self.__sRQ = None
         self.__redHash = None
-        self.__psObj = None
+        self.__consumer = None
+        
+        # Longitude quadrants surface position pairs are resolved against, keyed on the receiver position.
+        self.__surfaceRefs = {}
+        
+        # Keep track of how many ring messages we lost since we last logged it.
+        self.__overrunLastTime = time.time()
+        self.__overrunLastCount = 0
+        
+        # When airSuck.py runs us stateMongoDump is in the same process.
+        self.__localQ = asLocalQueue()
+        
+        # Parse frames from thin connectors.
+        ssrParser = ssrParse()
+        ssrParser.setCrcFixBits(config.ssrStateEngine['crcFixBits'])
+        self.__decoder = ssrBatchDecoder(ssrParser, config.ssrStateEngine['parseCacheSize'])
         
         # SSR registration
         self.__ssrReg = ssrReg(config, logger)
@@ -313,11 +333,11 @@ class SubListener(threading.Thread):
         Put status data on a queue for processing
         """
         
-        # Debug print instead of dumping data onto another queue.
-        jsonData = json.dumps(statusData)
+        # Encode the data for the state queues.
+        encData = self.__codec.encode(statusData)
         
         # Publish the data on the queue.
-        self.__sPsQ.publish(config.statePub['qName'], jsonData)
+        self.__sPsQ.publish(config.statePub['qName'], encData)
         
         # If we actually want to store the state data in MongoDB...
         if config.stateMongo['enabled'] == True:
@@ -330,8 +350,12 @@ class SubListener(threading.Thread):
                     #DGAF, keep going.
                     None
             
-            jsonData = json.dumps(statusData)
-            self.__sRQ.rpush(config.stateRel['qName'], jsonData)
+            encData = self.__codec.encode(statusData)
+            
+            if config.connPub['transport'] == "local":
+                self.__localQ.publish(config.stateRel['qName'], [encData])
+            else:
+                self.__sRQ.rpush(config.stateRel['qName'], encData)
             
         return
 
@@ -356,30 +380,153 @@ class SubListener(threading.Thread):
         
         return binascii.hexlify(chr((crcInt >> 16) & 0xff) + chr((crcInt >> 8) & 0xff) + chr((crcInt & 0xff)))
     
-    def worker(self, work):
+    def surfaceLonBase(self, data, myPos):
         """
-        Given an SSR entry do some work.
+        Get the longitude quadrant surface position pairs from the receiver in the state data are resolved against. Receivers don't move so we only work it out once for each receiver position.
         """
-        try:
-            # Do work on the data returned from the subscriber.
-            ssrJson = str(work['data'])
+        
+        refKey = (data['srcLat'], data['srcLon'])
+        retVal = self.__surfaceRefs.get(refKey)
+        
+        if retVal is None:
+            retVal = cprProc.surfaceLonBase(myPos)
             
-            # Default value for ssrWrapped that cause the JSON to no be processed unless it's decoded into a dict.
-            ssrWrapped = None
+            # Start the cache over if it's full.
+            if len(self.__surfaceRefs) >= config.ssrStateEngine['cprSurfaceRefCacheSize']:
+                self.__surfaceRefs.clear()
             
-            try:
-                # Get wrapped SSR data.
-                ssrWrapped = json.loads(ssrJson)
+            self.__surfaceRefs[refKey] = retVal
+        
+        return retVal
+    
+    def decodeCPR(self, ssrWrapped, data):
+        """
+        Decode the CPR position in ssrWrapped given the state data for the aircraft, which should already have the even or odd raw position from ssrWrapped. If we have a recent even/odd pair we resolve it globally. If we don't, but we know where the receiver is, we can get a first fix by decoding the single frame locally against the receiver position. The next global decode refines it. Surface positions (formats 5-8) always need the receiver position.
+        
+        Returns a list of [locData, locMeta], where locData is [lat, lon] or None if we couldn't get a position.
+        """
+        
+        retVal = [None, None]
+        
+        # Is this an airborne or surface position?
+        airborne = ((ssrWrapped['fmt'] >= 9) and (ssrWrapped['fmt'] <= 18)) or ((ssrWrapped['fmt'] >= 20) and (ssrWrapped['fmt'] <= 22))
+        surface = (ssrWrapped['fmt'] >= 5) and (ssrWrapped['fmt'] <= 8)
+        
+        # See if we know where our data source is located...
+        myPos = None
+        
+        if ('srcLat' in data) and ('srcLon' in data):
+            myPos = [float(data['srcLat']), float(data['srcLon'])]
+        
+        # By default we don't have a pair to work with.
+        havePair = False
+        
+        # If we have even and odd lat/lon data
+        if ('evenTs' in data) and ('oddTs' in data):
             
-            except ValueError:
-                if config.ssrStateEngine['debug']:
-                    tb = traceback.format_exc()
-                    logger.log("Failed to parse JSON string to dict:\n%s" %tb)
+            # Get time delta.
+            timeDelta = datetime.timedelta(seconds=config.ssrStateEngine['cprExpireSec'])
             
-            except:
-                tb = traceback.format_exc()
-                logger.log("Exception parsing JSON data:\n%s" %tb)
+            # Get the age of our even and odd data.
+            evenAge = self.str2Datetime(data['lastSeen']) - self.str2Datetime(data['evenTs'])
+            oddAge = self.str2Datetime(data['lastSeen']) - self.str2Datetime(data['oddTs'])
+            
+            # See if our lat/lon timestamps are within n seconds of each other.
+            havePair = (evenAge < timeDelta) and (oddAge < timeDelta)
+        
+        if havePair:
+            
+            # Pull even and odd data.
+            evenData = [data['evenLat'], data['evenLon']]
+            oddData = [data['oddLat'], data['oddLon']]
+            
+            fmt = ssrWrapped['evenOdd']
+            
+            # If we have CPR Global position data...
+            if airborne:
+                try:
+                    # Decode global position
+                    retVal = [cprProc.cprResolveGlobal(evenData, oddData, fmt), "CPRGlobal"]
+                
+                except RuntimeError:
+                    # If we can't get a first fix either pass the boundary straddle along.
+                    if (myPos is None) or (not config.ssrStateEngine['cprFirstFix']):
+                        raise
+            
+            # Surface positions can only be resolved if we know where we are.
+            elif surface and (myPos is not None):
+                try:
+                    # Decode global surface position
+                    retVal = [cprProc.cprResolveGlobal(evenData, oddData, fmt, myPos, True, self.surfaceLonBase(data, myPos)), "CPRGlobal"]
+                
+                except RuntimeError:
+                    # We can still decode this frame against the receiver position below.
+                    pass
+        
+        # If we didn't get a global position see if we can get a first fix from this frame and the receiver position.
+        if (retVal[0] is None) and airborne and (myPos is not None) and config.ssrStateEngine['cprFirstFix']:
+            locData = cprProc.cprResolveLocal(myPos, [ssrWrapped['rawLat'], ssrWrapped['rawLon']], ssrWrapped['evenOdd'], False)
+            
+            # This always lands within half a zone of the receiver, and an aircraft past that lands in the wrong zone about 667 km minus its range from us. Only keep fixes close enough that they can't be one of those.
+            if self.__asu.getRange(myPos, locData) <= config.ssrStateEngine['cprFirstFixMaxKm']:
+                retVal = [locData, "CPRLocal"]
+        
+        # If we didn't get a global surface position decode this frame against the receiver position.
+        elif (retVal[0] is None) and surface and (myPos is not None):
+            locData = cprProc.cprResolveLocal(myPos, [ssrWrapped['rawLat'], ssrWrapped['rawLon']], ssrWrapped['evenOdd'], True)
             
+            # Surface zones are a quarter the size of airborne ones, so the same goes for about 167 km minus the range.
+            if self.__asu.getRange(myPos, locData) <= config.ssrStateEngine['cprSurfaceMaxKm']:
+                retVal = [locData, "CPRRelative"]
+        
+        return retVal
+    
+    def decodeWork(self, work):
+        """
+        Decode an entry from the connector queue. Returns the message, or None if we couldn't decode it.
+        """
+        
+        # Default value for ssrWrapped that cause the JSON to no be processed unless it's decoded into a dict.
+        ssrWrapped = None
+        
+        try:
+            # Get wrapped SSR data.
+            ssrWrapped = self.__codec.decode(str(work['data']))
+        
+        except ValueError:
+            if config.ssrStateEngine['debug']:
+                tb = traceback.format_exc()
+                logger.log("Failed to parse JSON string to dict:\n%s" %tb)
+        
+        except:
+            tb = traceback.format_exc()
+            logger.log("Exception parsing JSON data:\n%s" %tb)
+        
+        return ssrWrapped
+    
+    def workBatch(self, workList):
+        """
+        Given a list of entries from the connector queue decode them, parse the frames from thin connectors all at once, and do some work on each one.
+        """
+        
+        ssrList = [self.decodeWork(work) for work in workList]
+        
+        try:
+            # Parse frames from thin connectors.
+            self.__decoder.decodeBatch(ssrList)
+        
+        except:
+            tb = traceback.format_exc()
+            logger.log("Exception parsing SSR frames:\n%s" %tb)
+        
+        for ssrWrapped in ssrList:
+            self.worker(ssrWrapped)
+    
+    def worker(self, ssrWrapped):
+        """
+        Given a decoded SSR entry do some work.
+        """
+        try:
             # Make sure we got good data from json.loads
             if (ssrWrapped != None) and (type(ssrWrapped) == dict):
                 
@@ -550,118 +697,67 @@ class SubListener(threading.Thread):
                                         # Set odd data.
                                         data.update({"oddLat": ssrWrapped['rawLat'], "oddLon": ssrWrapped['rawLon'], "oddTs": ssrWrapped['dts'], "lastFmt": ssrWrapped['evenOdd']})
                                     
-                                    # If we have even and odd lat/lon data
-                                    if ('evenTs' in data) and ('oddTs' in data):
-                                        
-                                        # Get time delta.
-                                        timeDelta = datetime.timedelta(seconds=config.ssrStateEngine['cprExpireSec'])
+                                    # Decode location
+                                    try:
+                                        [locData, locMeta] = self.decodeCPR(ssrWrapped, data)
                                         
-                                        # Get the age of our even and odd data.
-                                        evenAge = self.str2Datetime(data['lastSeen']) - self.str2Datetime(data['evenTs'])
-                                        oddAge = self.str2Datetime(data['lastSeen']) - self.str2Datetime(data['oddTs'])
-                                        
-                                        # See if our lat/lon timestamps are within n seconds of each other.
-                                        if (evenAge < timeDelta) and (oddAge < timeDelta):
-                                            
-                                            # Pull even and odd data.
-                                            evenData = [data['evenLat'], data['evenLon']]
-                                            oddData = [data['oddLat'], data['oddLon']]
+                                        # Location data
+                                        if type(locData) == list:
                                             
-                                            fmt = ssrWrapped['evenOdd']
-                                            
-                                            locData = None
-                                            
-                                            # Decode location
-                                            try:
-                                                # If we have data source location data set its position.
-                                                if 'srcLat' in data:
-                                                    # See if we know where our data source is located...
-                                                    myPos = [data['srcLat'], data['srcLon']]
-                                                
-                                                # If we have CPR Global position data...
-                                                if (ssrWrapped['fmt'] >= 9) and (ssrWrapped['fmt'] <= 18) or ((ssrWrapped['fmt'] >= 20) and (ssrWrapped['fmt'] <= 22)):
-                                                    # Flag the type of position we got.
-                                                    locMeta = "CPRGlobal"
-                                                    
-                                                    # Decode global position
-                                                    locData = cprProc.cprResolveGlobal(evenData, oddData, fmt)
+                                            # Since we have location data.
+                                            if ('lat' in data) and ('lon' in data):
                                                 
-                                                # If we know where we are and have our current location.
-                                                elif (ssrWrapped['fmt'] >= 5) and (ssrWrapped['fmt'] <= 8) and ('srcLat' in data):
-                                                    
-                                                    # Flag the type of position we got.
-                                                    locMeta = "CPRRelative"
+                                                # See if the we have moved...
+                                                if (data['lat'] != locData[0]) and (data['lon'] != locData[1]):
                                                     
-                                                    # Figure out if we last got ever or odd data and use it.
-                                                    if evenAge >= oddAge:
-                                                        # Use the even data.
-                                                        lastEOData = [data['evenLat'], data['evenLon']]
-                                                        thisTgt = 0
-                                                    else:
-                                                        # Use the odd data.
-                                                        lastEOData = [data['oddLat'], data['oddLon']]
-                                                        thisTgt = 1
+                                                    # Derived heading flag
+                                                    derivedHeading = False;
                                                     
-                                                    # Decode local position.
-                                                    locData = cprProc.cprResolveLocal(myPos, evenData, 0, True)
-                                                
-                                                # Location data
-                                                if type(locData) == list:
-                                                    
-                                                    # Since we have location data.
-                                                    if ('lat' in data) and ('lon' in data):
+                                                    # See if we already have a derived heading
+                                                    if 'headingMeta' in data:
                                                         
-                                                        # See if the we have moved...
-                                                        if (data['lat'] != locData[0]) and (data['lon'] != locData[1]):
+                                                        # If we already have a GPS derived heading, set our flag.
+                                                        if data['headingMeta'] == "GPSDerived":
+                                                            derivedHeading = True;
+                                                    
+                                                    # If we don't have a heading compute or we've already derived one compute it again assuimng we didn't just get a new one from ADS-B.
+                                                    if (not ('heading' in data) or derivedHeading) and not ('heading' in ssrWrapped):
+                                                        try:
                                                             
-                                                            # Derived heading flag
-                                                            derivedHeading = False;
+                                                            # If we're debugging.
+                                                            if config.ssrStateEngine['debug']:
+                                                                logger.log("Computing heading for %s using coords." %ssrWrapped['icaoAAHx'])
                                                             
-                                                            # See if we already have a derived heading
-                                                            if 'headingMeta' in data:
-                                                                
-                                                                # If we already have a GPS derived heading, set our flag.
-                                                                if data['headingMeta'] == "GPSDerived":
-                                                                    derivedHeading = True;
+                                                            # Get the bearing based on the location we have.
+                                                            newHeading = self.__asu.coords2Bearing([data['lat'], data['lon']], [locData[0], locData[1]])
+                                                            # Add the heading to the traffic data
+                                                            data.update({"heading": newHeading, "headingMeta": "GPSDerived"})
+                                                        
+                                                        except ValueError as e:
+                                                            # If we got a value error trying to grab the bearing...
+                                                            if e == "math domain error":
+                                                                logger.log("Math domain error trying to compute heading for %s" %ssrWrapped['icaoAAHx'])
                                                             
-                                                            # If we don't have a heading compute or we've already derived one compute it again assuimng we didn't just get a new one from ADS-B.
-                                                            if (not ('heading' in data) or derivedHeading) and not ('heading' in ssrWrapped):
-                                                                try:
-                                                                    
-                                                                    # If we're debugging.
-                                                                    if config.ssrStateEngine['debug']:
-                                                                        logger.log("Computing heading for %s using coords." %ssrWrapped['icaoAAHx'])
-                                                                    
-                                                                    # Get the bearing based on the location we have.
-                                                                    newHeading = self.__asu.coords2Bearing([data['lat'], data['lon']], [locData[0], locData[1]])
-                                                                    # Add the heading to the traffic data
-                                                                    data.update({"heading": newHeading, "headingMeta": "GPSDerived"})
-                                                                
-                                                                except ValueError as e:
-                                                                    # If we got a value error trying to grab the bearing...
-                                                                    if e == "math domain error":
-                                                                        logger.log("Math domain error trying to compute heading for %s" %ssrWrapped['icaoAAHx'])
-                                                                    
-                                                                    else:
-                                                                        tb = traceback.format_exc()
-                                                                        logger.log("Value error computing heading for %s:\n%s" %(ssrWrapped['icaoAAHx'], tb))
-                                                                
-                                                                except:
-                                                                    tb = traceback.format_exc()
-                                                                    logger.log("Error computing heading for %s:\n%s" %(ssrWrapped['icaoAAHx'], tb))
-                                                    
-                                                    # Set location data.
-                                                    data.update({"lat": locData[0], "lon": locData[1], "locationMeta": locMeta})
-                                            
-                                            except RuntimeError:
-                                                # CPR boundary exception...
-                                                if config.ssrStateEngine['debug']:
-                                                    logger.log("CPR boundary straddle error for %s." %ssrWrapped['icaoAAHx'])
+                                                            else:
+                                                                tb = traceback.format_exc()
+                                                                logger.log("Value error computing heading for %s:\n%s" %(ssrWrapped['icaoAAHx'], tb))
+                                                        
+                                                        except:
+                                                            tb = traceback.format_exc()
+                                                            logger.log("Error computing heading for %s:\n%s" %(ssrWrapped['icaoAAHx'], tb))
                                             
-                                            except:
-                                                # Log exception when trying to get ADS-B data.
-                                                tb = traceback.format_exc()
-                                                logger.log("Error processing ADS-B location for %s:\n%s" %(ssrWrapped['icaoAAHx'], tb))
+                                            # Set location data.
+                                            data.update({"lat": locData[0], "lon": locData[1], "locationMeta": locMeta})
+                                    
+                                    except RuntimeError:
+                                        # CPR boundary exception...
+                                        if config.ssrStateEngine['debug']:
+                                            logger.log("CPR boundary straddle error for %s." %ssrWrapped['icaoAAHx'])
+                                    
+                                    except:
+                                        # Log exception when trying to get ADS-B data.
+                                        tb = traceback.format_exc()
+                                        logger.log("Error processing ADS-B location for %s:\n%s" %(ssrWrapped['icaoAAHx'], tb))
                                 
                                 # Enqueue processed state data.
                                 self.enqueueData(self.updateState(ssrWrapped['icaoAAHx'], data))
@@ -696,6 +792,26 @@ class SubListener(threading.Thread):
             tb = traceback.format_exc()
             logger.log("Exception in worker:\n%s" %tb)
     
+    def __logOverruns(self):
+        """
+        Log how many ring messages per second we lost because we fell behind every connRing['overrunStatsSec'] seconds.
+        """
+        
+        # Are we supposed to log stats? Only rings can overrun.
+        if (config.connPub['transport'] == "ring") and (config.connRing['overrunStatsSec'] > 0):
+            # How long has it been?
+            elapsed = time.time() - self.__overrunLastTime
+            
+            if elapsed >= config.connRing['overrunStatsSec']:
+                # Get the number of messages we lost since last time.
+                overruns = self.__consumer.overrunCount - self.__overrunLastCount
+                
+                logger.log("SSR state engine lost %s ring messages to overruns in %.0f sec (%.2f msgs/sec)." %(overruns, elapsed, overruns / elapsed))
+                
+                # Reset our counters.
+                self.__overrunLastTime = time.time()
+                self.__overrunLastCount = self.__consumer.overrunCount
+    
     def run(self):
         """
         Actually watch the queue.
@@ -704,20 +820,23 @@ class SubListener(threading.Thread):
         # Keep running.
         while self.__keepRunning:
             # Redis queues and entities
-            self.__psQ = redis.StrictRedis(host=config.connPub['host'], port=config.connPub['port'])
-            self.__sPsQ = redis.StrictRedis(host=config.statePub['host'], port=config.statePub['port'])
-            self.__sRQ = redis.StrictRedis(host=config.stateRel['host'], port=config.stateRel['port'])
-            self.__redHash = redis.StrictRedis(host=config.ssrStateEngine['hashHost'], port=config.ssrStateEngine['hashPort'])
+            redisPool = asRedisPool()
+            self.__sPsQ = redisPool.getRedis(config.statePub['host'], config.statePub['port'])
+            self.__sRQ = redisPool.getRedis(config.stateRel['host'], config.stateRel['port'])
+            self.__redHash = redisPool.getRedis(config.ssrStateEngine['hashHost'], config.ssrStateEngine['hashPort'])
             
-            # Subscribe the the connector pub/sub queue.
-            self.__psObj = self.__psQ.pubsub() 
-            self.__psObj.subscribe(self.__channels)
+            # Listen to the connector queue.
+            self.__consumer = asConsumer(self.__channels, config.ssrStateEngine['streamGroup'], config.ssrStateEngine['streamConsumer'])
+            self.__overrunLastCount = 0
             
             try:
                 # Try to run the worker.
-                for work in self.__psObj.listen():
+                for workList in self.__consumer.listenBatch():
                     # Do the work on the incoming JSON.
-                    self.worker(work)
+                    self.workBatch(workList)
+                    
+                    # Log ring overrun stats if it's time.
+                    self.__logOverruns()
             
             except SystemExit:
                 self.__keepRunning = False
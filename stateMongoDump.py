@@ -14,20 +14,29 @@ except:
 	raise IOError("No configuration present. Please copy config/config.py to the airSuck folder and edit it.")
 
 import sys
-import redis
 import pymongo
 import time
 import json
 import datetime
 import traceback
+import Queue
 from libAirSuck import asLog
+from libAirSuck import asCodec
+from libAirSuck import asRedisPool
+from libAirSuck import asLocalQueue
 from pprint import pprint
 
 # Set up the logger.
 logger = asLog(config.stateMongo['logMode'])
 
 # Redis instance for queueing.
-rQ = redis.StrictRedis(host=config.stateRel['host'], port=config.stateRel['port'])
+rQ = asRedisPool().getRedis(config.stateRel['host'], config.stateRel['port'])
+
+# When airSuck.py runs us alongside the state engines they hand us data through a local queue.
+localQ = None
+
+if config.connPub['transport'] == "local":
+    localQ = asLocalQueue().subscribe([config.stateRel['qName']])
 
 #Delay this many seconds if the queue is empty to prevent
 #stupid amounts of CPU utilization.
@@ -65,83 +74,118 @@ def toDatetime(strDateTime):
     
     return retVal
 
-# Decapsulate the JSON data.
+# Decodes JSON or binary messages.
+codec = asCodec()
+
+# Decapsulate the JSON or binary data.
 def dejsonify(msg):
-    return json.loads(msg)
+    return codec.decode(msg)
 
 # Insert records into specified mongo instance
 def serializeState(entry):
     mDBColl.insert(entry)
 
-# If the mongo state dumper is enabled...
-if config.stateMongo['enabled'] == True:
-    # Limits?
-    timeLimit = datetime.timedelta(seconds=config.stateMongo['insertDelay'])
-
-    # What time is it now?
-    timeThen = datetime.datetime.now()
-    timeNow = datetime.datetime.now()
-
-    # Infinite fucking loop.
-    logger.log("Dumping state data from queue to MongoDB.")
-    while(keepRunning):
-            try:
-                    # Pull oldest entry from the queue.
-                    dQd = rQ.rpop(config.stateRel['qName'])
-                    
-                    # If we have no data sleep for our configured delay to save CPU.
-                    if (dQd == None):
-                        time.sleep(checkDelay)
-                    
-                    else:
-                        # We have data so we should break it out of JSON formatting.
-                        xDqd = dejsonify(dQd)
-                        
-                        if 'firstSeen' in xDqd:
-                            if xDqd['firstSeen'] != 'None':
-                                xDqd['firstSeen'] = toDatetime(xDqd['firstSeen'])
-                        
-                        if 'lastSeen' in xDqd:
-                            if xDqd['lastSeen'] != 'None':
-                                xDqd['lastSeen'] = toDatetime(xDqd['lastSeen'])
-                        
-                        if 'evenTs' in xDqd:
-                            if xDqd['evenTs'] != 'None':
-                                xDqd['evenTs'] = toDatetime(xDqd['evenTs'])
-                        
-                        if 'oddTs' in xDqd:
-                            if xDqd['oddTs'] != 'None':
-                                xDqd['oddTs'] = toDatetime(xDqd['oddTs'])
-                        
-                        # Add record to buffer.
-                        insertBuff.append(xDqd)
-                        
-                        # What time is it now?
-                        timeNow = datetime.datetime.now()
+# Get the oldest entry from the queue.
+def popEntry():
+    """
+    Get the oldest entry from the state reliable queue, waiting up to checkDelay seconds for one when the queue is empty. Returns None if we didn't get anything.
+    """
+    
+    retVal = None
+    
+    # When airSuck.py runs us alongside the state engines we get data from the local queue instead of Redis.
+    if localQ is not None:
+        try:
+            retVal = localQ.get(True, checkDelay)['data']
+        
+        except Queue.Empty:
+            None
+    
+    else:
+        retVal = rQ.rpop(config.stateRel['qName'])
+        
+        # If we have no data sleep for our configured delay to save CPU.
+        if (retVal == None):
+            time.sleep(checkDelay)
+    
+    return retVal
+
+def run():
+    """
+    Dump state data to MongoDB until keepRunning is False or we get a keyboard interrupt.
+    """
+    
+    global keepRunning
+    
+    # If the mongo state dumper is enabled...
+    if config.stateMongo['enabled'] == True:
+        # Limits?
+        timeLimit = datetime.timedelta(seconds=config.stateMongo['insertDelay'])
+        
+        # What time is it now?
+        timeThen = datetime.datetime.now()
+        timeNow = datetime.datetime.now()
+        
+        # Infinite fucking loop.
+        logger.log("Dumping state data from queue to MongoDB.")
+        while(keepRunning):
+                try:
+                        # Pull oldest entry from the queue.
+                        dQd = popEntry()
                         
-                        # Time to store?
-                        if (timeNow - timeThen) > timeLimit:
-                            # Bulk insert
-                            serializeState(insertBuff)
+                        if (dQd != None):
+                            # We have data so we should break it out of JSON formatting.
+                            xDqd = dejsonify(dQd)
+                            
+                            if 'firstSeen' in xDqd:
+                                if xDqd['firstSeen'] != 'None':
+                                    xDqd['firstSeen'] = toDatetime(xDqd['firstSeen'])
                             
-                            # Reset our then.
-                            timeThen = datetime.datetime.now()
+                            if 'lastSeen' in xDqd:
+                                if xDqd['lastSeen'] != 'None':
+                                    xDqd['lastSeen'] = toDatetime(xDqd['lastSeen'])
                             
-                            # Nuke buffered records because we've theoretically alread serialized them.
-                            insertBuff[:] = []
-            
-            except KeyboardInterrupt:
-                keepRunning = False
+                            if 'evenTs' in xDqd:
+                                if xDqd['evenTs'] != 'None':
+                                    xDqd['evenTs'] = toDatetime(xDqd['evenTs'])
+                            
+                            if 'oddTs' in xDqd:
+                                if xDqd['oddTs'] != 'None':
+                                    xDqd['oddTs'] = toDatetime(xDqd['oddTs'])
+                            
+                            # Add record to buffer.
+                            insertBuff.append(xDqd)
+                            
+                            # What time is it now?
+                            timeNow = datetime.datetime.now()
+                            
+                            # Time to store?
+                            if (timeNow - timeThen) > timeLimit:
+                                # Bulk insert
+                                serializeState(insertBuff)
+                                
+                                # Reset our then.
+                                timeThen = datetime.datetime.now()
+                                
+                                # Nuke buffered records because we've theoretically alread serialized them.
+                                insertBuff[:] = []
                 
-                try:
-                    # Store records.
-                    serializeState(insertBuff)
-                except:
-                    None
+                except KeyboardInterrupt:
+                    keepRunning = False
                 
-            except:
-                tb = traceback.format_exc()
-                logger.log("Failed to pull from the Redis queue. Sleeping %s sec\n%s" %(checkDelay, tb))
+                except:
+                    tb = traceback.format_exc()
+                    logger.log("Failed to pull from the Redis queue. Sleeping %s sec\n%s" %(checkDelay, tb))
+        
+        try:
+            # Store records.
+            if len(insertBuff) > 0:
+                serializeState(insertBuff)
+        except:
+            None
+    
+    else:
+        logger.log("Connector mongoDB engine not enabled in configuration.")
 
-else:
-    logger.log("Connector mongoDB engine not enabled in configuration.")
+if __name__ == "__main__":
+    run()
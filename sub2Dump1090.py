@@ -18,7 +18,6 @@ except:
 	raise IOError("No configuration present. Please copy config/config.py to the airSuck folder and edit it.")
 
 import sys
-import redis
 import time
 import json
 import threading
@@ -27,6 +26,8 @@ import traceback
 from libAirSuck import asLog
 from socket import socket
 from pprint import pprint
+from libAirSuck import asCodec
+from libAirSuck import asRedisPool
 
 #################
 # Configuration #
@@ -55,6 +56,7 @@ class SubListener(threading.Thread):
         self.redis = r
         self.pubsub = self.redis.pubsub()
         self.pubsub.subscribe(channels)
+        self.__codec = asCodec()
 
     def worker(self, work, dSock):
         """
@@ -62,7 +64,7 @@ class SubListener(threading.Thread):
         """
         # Break our SSR wrapped data out from the Redis queue
         ssrJson = str(work['data'])
-        ssrWrapped = json.loads(ssrJson)
+        ssrWrapped = self.__codec.decode(ssrJson)
         
         # Make sure we pared the JSON correctly.
         if (type(ssrWrapped) == dict):
@@ -130,7 +132,7 @@ if __name__ == "__main__":
     logger = asLog('stdout')
 
     # Start up redis, create our threaded client, and start it.
-    r = redis.Redis(host=config.connPub['host'], port=config.connPub['port'])
+    r = asRedisPool().getRedis(config.connPub['host'], config.connPub['port'])
     client = SubListener(r, [config.connPub['qName']])
     client.daemon = True
     client.start()
@@ -0,0 +1,184 @@
+#!/usr/bin/python
+
+"""
+aisDefragTest by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Run the multipart sentences in test/corpus/aisAivdm.txt through aisDefrag as if several receivers heard them with their fragments mixed together and out of order, and make sure every message comes back out whole. Then make sure messages missing fragments are thrown away after the TTL, and time aisDefrag against the old Redis reassembly if the fragment Redis host in the config is up.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+import os
+import random
+import time
+import redis
+import config
+from libAirSuck import aisDefrag
+from libAirSuck import aisParse
+
+#################
+# Configuration #
+#################
+
+# Where our corpus lives.
+testDir = os.path.dirname(os.path.abspath(__file__))
+aisCorpus = os.path.join(testDir, "corpus", "aisAivdm.txt")
+
+# How many receivers do we simulate?
+receivers = 3
+
+# Fragment TTL in seconds.
+ttlSec = config.aisSettings['fragTTLSec']
+
+# How far apart in seconds do messages start? Message IDs only go from 1 to 9 so they get reused every 9 messages, and a reused ID has to be past the TTL.
+msgSpacingSec = ttlSec / 4.0
+
+# How many times do we go through the fragments when timing?
+passes = 20
+
+###########
+# Traffic #
+###########
+
+def loadFragments(fileName):
+    """
+    Load the multipart sentences from fileName. Returns a list of messages, each of which is a list of decapsulated fragments.
+    """
+    
+    retVal = []
+    parser = aisParse()
+    
+    with open(fileName) as corpusFile:
+        for thisLine in corpusFile:
+            thisLine = thisLine.strip()
+            
+            # Skip blank lines and comments.
+            if (thisLine == "") or thisLine.startswith("#"):
+                continue
+            
+            fragment = parser.nmeaDecapsulate(thisLine)
+            
+            if fragment['fragCount'] > 1:
+                # Start a new message with the first fragment.
+                if fragment['fragNumber'] == 1:
+                    retVal.append([])
+                
+                retVal[-1].append(fragment)
+    
+    return retVal
+
+def buildTraffic(messages):
+    """
+    Build a list of [arrival time, fragment] where each receiver hears every message, and fragments from neighboring messages and receivers arrive mixed together in a random order.
+    """
+    
+    retVal = []
+    
+    for i in range(0, len(messages)):
+        for thisRx in range(0, receivers):
+            for thisFrag in messages[i]:
+                # Give each receiver its own copy of the fragment.
+                fragment = dict(thisFrag)
+                fragment['src'] = "rx%s" %thisRx
+                
+                retVal.append([(i * msgSpacingSec) + random.uniform(0, msgSpacingSec * 2), fragment])
+    
+    retVal.sort(key=lambda entry: entry[0])
+    
+    return retVal
+
+########
+# Main #
+########
+
+random.seed(1090)
+
+messages = loadFragments(aisCorpus)
+traffic = buildTraffic(messages)
+
+print("%s multipart messages, %s fragments from %s receivers." %(len(messages), len(traffic), receivers))
+
+allGood = True
+
+# Put the messages back together.
+defrag = aisDefrag(ttlSec)
+expected = ["".join([thisFrag['payload'] for thisFrag in thisMsg]) for thisMsg in messages]
+assembled = []
+
+for arrivalTime, fragment in traffic:
+    payload = defrag.addFragment(fragment, arrivalTime)
+    
+    if payload is not None:
+        assembled.append(payload)
+
+missing = 0
+
+for payload in expected:
+    if assembled.count(payload) != receivers:
+        missing += 1
+
+if (missing > 0) or (len(assembled) != len(messages) * receivers):
+    allGood = False
+
+print("Assembled %s messages, %s missing or wrong, %s expired, %s pending" %(len(assembled), missing, defrag.expiredCount, defrag.pendingCount()))
+
+# Drop the last fragment of every message and make sure they all expire.
+defrag = aisDefrag(ttlSec)
+partial = [[arrivalTime, fragment] for arrivalTime, fragment in traffic if fragment['fragNumber'] < fragment['fragCount']]
+
+for arrivalTime, fragment in partial:
+    defrag.addFragment(fragment, arrivalTime)
+
+pendingBefore = defrag.pendingCount()
+
+# A fragment for some other message well past the TTL should clear everything out.
+lastTime = traffic[-1][0] + ttlSec
+defrag.addFragment({'src': "rxLate", 'fragCount': 2, 'fragNumber': 1, 'messageID': 1, 'payload': "X"}, lastTime)
+
+if (defrag.expiredCount != len(messages) * receivers) or (defrag.pendingCount() != 1) or (defrag.assembledCount != 0):
+    allGood = False
+
+print("Incomplete messages: %s pending before the TTL, %s expired, %s pending after" %(pendingBefore, defrag.expiredCount, defrag.pendingCount()))
+
+# Time it.
+defrag = aisDefrag(ttlSec)
+
+startTime = time.time()
+
+for i in range(0, passes):
+    for arrivalTime, fragment in traffic:
+        defrag.addFragment(fragment)
+
+runTime = time.time() - startTime
+
+print("aisDefrag (local): %10.0f fragments/sec" %(len(traffic) * passes / runTime))
+
+# Time the old Redis reassembly if we can.
+try:
+    defrag = aisDefrag(ttlSec, "redis", config.aisSettings['fragHost'], config.aisSettings['fragPort'])
+    
+    startTime = time.time()
+    
+    for arrivalTime, fragment in traffic:
+        defrag.addFragment(fragment)
+    
+    runTime = time.time() - startTime
+    
+    print("aisDefrag (redis): %10.0f fragments/sec" %(len(traffic) / runTime))
+
+except redis.ConnectionError:
+    print("aisDefrag (redis): skipped, can't connect to %s:%s" %(config.aisSettings['fragHost'], config.aisSettings['fragPort']))
+
+if allGood:
+    print("All messages reassembled and expired correctly.")
+else:
+    print("Reassembly errors found!")
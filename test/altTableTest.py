@@ -0,0 +1,62 @@
+#!/usr/bin/python
+
+"""
+altTableTest by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Exhaustively check ssrParse's Gillham code and altitude lookup tables against the bit-by-bit reference implementations.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+from libAirSuck import ssrParse
+
+########
+# Main #
+########
+
+# Set up our parser.
+parser = ssrParse()
+
+# Public table-driven method, reference method, and every input to check.
+checks = [
+    ["gillham2Bin", parser.gillham2Bin, parser._ssrParse__gillham2BinCalc, range(0, 0x10000)],
+    ["bin2Gillham", parser.bin2Gillham, parser._ssrParse__bin2GillhamCalc, range(0, 0x10000)],
+    ["modeA2C", parser.modeA2C, parser._ssrParse__modeA2CCalc, range(0, 0x20000)],
+    ["decode12BitAlt", parser.decode12BitAlt, parser._ssrParse__decode12BitAltCalc, range(0, 0x2000)],
+    ["decode13BitAlt", parser.decode13BitAlt, parser._ssrParse__decode13BitAltCalc, range(0, 0x4000)]
+]
+
+allGood = True
+
+for name, tableMethod, refMethod, inputs in checks:
+    bad = 0
+    
+    for thisInput in inputs:
+        tableVal = tableMethod(thisInput)
+        refVal = refMethod(thisInput)
+        
+        # Make sure we don't mix up False and 0.
+        if (tableVal != refVal) or (type(tableVal) != type(refVal)):
+            bad += 1
+            
+            if bad <= 10:
+                print("%s(%s): table %s, reference %s" %(name, hex(thisInput), repr(tableVal), repr(refVal)))
+    
+    if bad > 0:
+        allGood = False
+    
+    print("%s: %s inputs checked, %s bad" %(name, len(inputs), bad))
+
+if allGood:
+    print("All tables match.")
+else:
+    print("Table mismatches found!")
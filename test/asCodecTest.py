@@ -0,0 +1,157 @@
+#!/usr/bin/python
+
+"""
+asCodecTest by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Build connector messages from the frames in test/corpus the same way the connectors do, and make sure every one of them comes back out of asCodec's binary envelope the same as it would from JSON. Then compare message sizes and encode + decode time for both formats. Requires msgpack.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+import binascii
+import json
+import os
+import time
+from libAirSuck import asCodec
+from libAirSuck import ssrParse
+from libAirSuck import aisParse
+
+#################
+# Configuration #
+#################
+
+# Where our corpus lives.
+testDir = os.path.dirname(os.path.abspath(__file__))
+ssrCorpus = os.path.join(testDir, "corpus", "ssrAvr.txt")
+aisCorpus = os.path.join(testDir, "corpus", "aisAivdm.txt")
+
+# How many times do we run through the messages when timing?
+passes = 5
+
+############
+# Messages #
+############
+
+def corpusLines(fileName):
+    """
+    Get the lines from fileName that aren't blank or comments.
+    """
+    
+    retVal = []
+    
+    with open(fileName) as corpusFile:
+        for thisLine in corpusFile:
+            thisLine = thisLine.strip()
+            
+            if (thisLine != "") and not thisLine.startswith("#"):
+                retVal.append(thisLine)
+    
+    return retVal
+
+def ssrMessages():
+    """
+    Build messages like handler1090 publishes from the SSR corpus.
+    """
+    
+    retVal = []
+    parser = ssrParse()
+    
+    for thisLine in corpusLines(ssrCorpus):
+        thisMsg = {'dataOrigin': 'dump1090', 'type': 'airSSR', 'dts': "2016-06-01 12:34:56.789012", 'src': "kpdx1", 'entryPoint': 'dump1090ConnClt', 'clientName': "dump1090-1"}
+        
+        hexData = thisLine.strip("*@;").lower()
+        
+        # Split off MLAT data.
+        if thisLine.startswith("@"):
+            thisMsg['mlatData'] = hexData[0:12]
+            hexData = hexData[12:]
+        
+        thisMsg['data'] = hexData
+        thisMsg.update(parser.ssrParse(bytearray(binascii.unhexlify(hexData))))
+        retVal.append(thisMsg)
+    
+    return retVal
+
+def aisMessages():
+    """
+    Build messages like handlerAIS publishes from the unfragmented sentences in the AIS corpus.
+    """
+    
+    retVal = []
+    parser = aisParse()
+    
+    for thisLine in corpusLines(aisCorpus):
+        thisMsg = {'entryPoint': 'aisConnector', 'dataOrigin': 'aisConn', 'type': 'airAIS', 'dts': "2016-06-01 12:34:56.789012", 'src': "kpdx1", 'clientName': "ais-1", 'data': thisLine, 'isFrag': False, 'isAssembled': False}
+        thisMsg.update(parser.nmeaDecapsulate(thisLine))
+        
+        if thisMsg['fragCount'] == 1:
+            thisMsg.update(parser.aisParse(thisMsg))
+            thisMsg.pop('payload', None)
+            retVal.append(thisMsg)
+    
+    return retVal
+
+########
+# Main #
+########
+
+jsonCodec = asCodec("json")
+binCodec = asCodec("binary")
+
+allGood = True
+
+for name, messages in [["SSR", ssrMessages()], ["AIS", aisMessages()]]:
+    # Make sure binary messages decode the same as JSON ones.
+    bad = 0
+    
+    for thisMsg in messages:
+        jsonMsg = jsonCodec.encode(thisMsg)
+        binMsg = binCodec.encode(thisMsg)
+        
+        if (binCodec.decode(binMsg) != json.loads(jsonMsg)) or (binCodec.decode(jsonMsg) != json.loads(jsonMsg)):
+            bad += 1
+            
+            if bad <= 10:
+                print("%s: JSON %s, binary %s" %(name, json.loads(jsonMsg), binCodec.decode(binMsg)))
+    
+    if bad > 0:
+        allGood = False
+    
+    print("%s: %s messages checked, %s bad" %(name, len(messages), bad))
+    
+    # Compare sizes and speed.
+    for fmtName, codec in [["json", jsonCodec], ["binary", binCodec]]:
+        encoded = [codec.encode(thisMsg) for thisMsg in messages]
+        avgSize = sum([len(thisMsg) for thisMsg in encoded]) / float(len(encoded))
+        
+        startTime = time.time()
+        
+        for i in range(0, passes):
+            for thisMsg in messages:
+                codec.encode(thisMsg)
+        
+        encTime = (time.time() - startTime) / (passes * len(messages))
+        
+        startTime = time.time()
+        
+        for i in range(0, passes):
+            for thisMsg in encoded:
+                codec.decode(thisMsg)
+        
+        decTime = (time.time() - startTime) / (passes * len(messages))
+        
+        print("%-6s %7.1f bytes/msg, encode %5.1f usec/msg, decode %5.1f usec/msg" %(fmtName, avgSize, encTime * 1000000, decTime * 1000000))
+
+if allGood:
+    print("All binary messages match.")
+else:
+    print("Binary message mismatches found!")
@@ -0,0 +1,259 @@
+#!/usr/bin/python
+
+"""
+asConsumerStreamTest by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Make sure asConsumer reading a stream names itself after the host and process ID, that workers in one consumer group split the messages between them without getting the same one twice, and that messages a worker read but never acknowledged get claimed and acknowledged by another worker after connPub['streamClaimMs'], which also drops the worker that went away from the group. We stand in for Redis with a client that keeps streams and consumer groups in memory, so this runs without a Redis server.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+import os
+import socket
+import time
+import redis
+import config
+
+#################
+# Configuration #
+#################
+
+# Read the stream in small batches and claim quickly so the test doesn't take long.
+config.connPub['transport'] = "stream"
+config.connPub['streamBatch'] = 10
+config.connPub['streamClaimMs'] = 300
+config.connPub['streamBlockMs'] = 10
+
+streamName = "testStream"
+claimStreamName = "claimStream"
+groupName = "testGroup"
+
+##############
+# Fake Redis #
+##############
+
+class fakeRedis:
+    """
+    Stands in for redis.StrictRedis with the stream and consumer group commands asConsumer uses. Every client shares the streams and groups in the class attributes.
+    """
+    
+    streams = {}
+    groups = {}
+    
+    def __init__(self, *args, **kwargs):
+        pass
+    
+    def __nowMs(self):
+        return int(time.time() * 1000)
+    
+    def __idKey(self, msgID):
+        return tuple([int(part) for part in msgID.split("-")])
+    
+    def __seen(self, group, consumer):
+        group['consumers'][consumer] = self.__nowMs()
+    
+    def xadd(self, name, fields, maxlen=None):
+        thisStream = fakeRedis.streams.setdefault(name, [])
+        msgID = "1-%s" %len(thisStream)
+        thisStream.append((msgID, fields))
+        
+        return msgID
+    
+    def xgroup_create(self, name, groupname, id="$", mkstream=False):
+        if (name, groupname) in fakeRedis.groups:
+            raise redis.ResponseError("BUSYGROUP Consumer Group name already exists")
+        
+        fakeRedis.groups[(name, groupname)] = {'next': len(fakeRedis.streams.setdefault(name, [])), 'pending': {}, 'consumers': {}}
+    
+    def xreadgroup(self, groupname, consumername, streams, count=None, block=None):
+        retVal = []
+        
+        for name, startID in streams.items():
+            group = fakeRedis.groups[(name, groupname)]
+            self.__seen(group, consumername)
+            
+            if startID == ">":
+                messages = fakeRedis.streams[name][group['next']:group['next'] + count]
+                group['next'] += len(messages)
+                
+                for msgID, fields in messages:
+                    group['pending'][msgID] = [consumername, self.__nowMs()]
+                
+                if len(messages) > 0:
+                    retVal.append([name, messages])
+            
+            else:
+                # Hand back what this consumer has pending.
+                entries = dict(fakeRedis.streams[name])
+                pendingIDs = sorted([msgID for msgID, info in group['pending'].items() if info[0] == consumername], key=self.__idKey)[:count]
+                retVal.append([name, [(msgID, entries[msgID]) for msgID in pendingIDs]])
+        
+        return retVal
+    
+    def xack(self, name, groupname, *ids):
+        group = fakeRedis.groups[(name, groupname)]
+        
+        for msgID in ids:
+            group['pending'].pop(msgID, None)
+        
+        return len(ids)
+    
+    def xpending_range(self, name, groupname, min, max, count, consumername=None):
+        group = fakeRedis.groups[(name, groupname)]
+        now = self.__nowMs()
+        pendingIDs = sorted(group['pending'].keys(), key=self.__idKey)
+        
+        if min != "-":
+            pendingIDs = [msgID for msgID in pendingIDs if self.__idKey(msgID) >= self.__idKey(min)]
+        
+        return [{'message_id': msgID, 'consumer': group['pending'][msgID][0], 'time_since_delivered': now - group['pending'][msgID][1], 'times_delivered': 1} for msgID in pendingIDs[:count]]
+    
+    def xclaim(self, name, groupname, consumername, min_idle_time, message_ids):
+        group = fakeRedis.groups[(name, groupname)]
+        entries = dict(fakeRedis.streams[name])
+        now = self.__nowMs()
+        self.__seen(group, consumername)
+        retVal = []
+        
+        for msgID in message_ids:
+            info = group['pending'].get(msgID)
+            
+            if (info is not None) and ((now - info[1]) >= min_idle_time):
+                group['pending'][msgID] = [consumername, now]
+                retVal.append((msgID, entries[msgID]))
+        
+        return retVal
+    
+    def xinfo_consumers(self, name, groupname):
+        group = fakeRedis.groups[(name, groupname)]
+        now = self.__nowMs()
+        
+        return [{'name': consumer, 'pending': len([info for info in group['pending'].values() if info[0] == consumer]), 'idle': now - lastSeen} for consumer, lastSeen in group['consumers'].items()]
+    
+    def xgroup_delconsumer(self, name, groupname, consumername):
+        group = fakeRedis.groups[(name, groupname)]
+        del group['consumers'][consumername]
+        
+        for msgID in [msgID for msgID, info in group['pending'].items() if info[0] == consumername]:
+            del group['pending'][msgID]
+
+# Hand out our fake clients from now on.
+redis.StrictRedis = fakeRedis
+
+from libAirSuck import asConsumer
+
+###########
+# Helpers #
+###########
+
+def check(name, good, detail):
+    """
+    Print the result of a check and return whether it passed.
+    """
+    
+    if good:
+        print("%s: OK" %name)
+    else:
+        print("%s: failed, %s" %(name, detail))
+    
+    return good
+
+def publish(name, count):
+    """
+    Add count messages to the stream name and return them.
+    """
+    
+    retVal = []
+    
+    for i in range(0, count):
+        thisMsg = "msg%s" %len(fakeRedis.streams.get(name, []))
+        client.xadd(name, {'data': thisMsg})
+        retVal.append(thisMsg)
+    
+    return retVal
+
+def nextData(reader):
+    """
+    Get the data from the next batch a reader yields.
+    """
+    
+    return [thisMsg['data'] for thisMsg in next(reader)]
+
+def consumerNames(name):
+    """
+    Get the names of the workers in our group on the stream name.
+    """
+    
+    return [consumer['name'] for consumer in client.xinfo_consumers(name, groupName)]
+
+########
+# Main #
+########
+
+allGood = True
+client = fakeRedis()
+
+# Without a name a worker goes by the host name and process ID, so workers on one machine don't collide.
+defaultConsumer = asConsumer([streamName], groupName)
+defaultReader = defaultConsumer.listenBatch()
+
+# The group starts with new messages, so it has to exist before we publish.
+client.xgroup_create(streamName, groupName)
+msgs = publish(streamName, 5)
+got = nextData(defaultReader)
+expectName = "%s-%s" %(socket.gethostname(), os.getpid())
+allGood &= check("Default name", (got == msgs) and (consumerNames(streamName) == [expectName]), "got %s as %s" %(got, consumerNames(streamName)))
+
+# Two workers in the group split the messages between them.
+readerA = asConsumer([streamName], groupName, "workerA").listenBatch()
+readerB = asConsumer([streamName], groupName, "workerB").listenBatch()
+msgs = publish(streamName, 50)
+gotA = []
+gotB = []
+
+for i in range(0, 5):
+    if i % 2 == 0:
+        gotA.extend(nextData(readerA))
+    else:
+        gotB.extend(nextData(readerB))
+
+shared = set(gotA) & set(gotB)
+allGood &= check("Split", (len(shared) == 0) and (sorted(gotA + gotB) == sorted(msgs)) and (len(gotA) == 30) and (len(gotB) == 20), "%s for A, %s for B, %s both" %(len(gotA), len(gotB), len(shared)))
+
+# The workers above still hold their last batch until they're asked for another, so use a stream of our own. A worker that reads messages and dies before acknowledging them...
+client.xgroup_create(claimStreamName, groupName)
+msgs = publish(claimStreamName, 5)
+client.xreadgroup(groupName, "deadWorker", {claimStreamName: ">"}, count=10)
+
+# ...doesn't lose them to a worker that checks before they've sat for streamClaimMs...
+claimConsumer = asConsumer([claimStreamName], groupName, "claimWorker")
+claimReader = claimConsumer.listenBatch()
+extra = publish(claimStreamName, 1)
+got = nextData(claimReader)
+allGood &= check("Not idle yet", (got == extra) and (claimConsumer.claimCount == 0), "got %s, claimed %s" %(got, claimConsumer.claimCount))
+
+# ...and once they have, the next worker to check claims and acknowledges them.
+time.sleep((config.connPub['streamClaimMs'] / 1000.0) + 0.1)
+got = nextData(claimReader)
+claimed = got == msgs
+
+# Once we move on the worker that went away is out of the group.
+extra = publish(claimStreamName, 1)
+got = nextData(claimReader)
+# The last batch stays pending until the worker asks for the next one, but nothing should be left from the worker that went away.
+pending = [entry for entry in client.xpending_range(claimStreamName, groupName, "-", "+", 100) if entry['consumer'] != "claimWorker"]
+allGood &= check("Claim", claimed and (got == extra) and (claimConsumer.claimCount == 5) and (len(pending) == 0) and ("deadWorker" not in consumerNames(claimStreamName)), "claimed %s, %s pending, workers %s" %(claimConsumer.claimCount, len(pending), consumerNames(claimStreamName)))
+
+if allGood:
+    print("asConsumer streams work.")
+else:
+    print("asConsumer stream problems found!")
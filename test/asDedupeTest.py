@@ -0,0 +1,177 @@
+#!/usr/bin/python
+
+"""
+asDedupeTest by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Make sure asDedupe drops a key for exactly the TTL after it was recorded and doesn't let duplicates refresh it, throws old keys away a bucket at a time without forgetting keys recorded again since, matches a simple reference on random traffic, and counts every duplicate when several threads share it in local and Redis mode. We stand in for Redis with a client that keeps keys in memory, so this runs without a Redis server.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+import random
+import threading
+import redis
+
+#################
+# Configuration #
+#################
+
+# How many random frames do we check against the reference?
+randomFrames = 50000
+
+# How many threads share a dedupe, and how many different keys does each one send?
+threadCount = 8
+threadKeys = 2000
+
+##############
+# Fake Redis #
+##############
+
+class fakeRedis:
+    """
+    Stands in for redis.StrictRedis with the SET command asDedupe uses. Keys never expire since the threaded check is over long before the TTL.
+    """
+    
+    keys = set()
+    lock = threading.Lock()
+    
+    def __init__(self, *args, **kwargs):
+        pass
+    
+    def set(self, name, value, ex=None, nx=False):
+        with fakeRedis.lock:
+            if nx and (name in fakeRedis.keys):
+                return None
+            
+            fakeRedis.keys.add(name)
+            
+            return True
+
+# Hand out our fake clients from now on.
+redis.StrictRedis = fakeRedis
+
+from libAirSuck import asDedupe
+
+###########
+# Helpers #
+###########
+
+def check(name, good, detail):
+    """
+    Print the result of a check and return whether it passed.
+    """
+    
+    if good:
+        print("%s: OK" %name)
+    else:
+        print("%s: failed, %s" %(name, detail))
+    
+    return good
+
+def hammer(dedupe, results):
+    """
+    Send every key to dedupe from this thread and count how many were duplicates.
+    """
+    
+    dupes = 0
+    
+    for i in range(0, threadKeys):
+        if dedupe.seen("key%s" %i):
+            dupes += 1
+    
+    results.append(dupes)
+
+def threaded(dedupe):
+    """
+    Send the same keys to dedupe from several threads at once. Returns [duplicates the threads saw, duplicates dedupe counted].
+    """
+    
+    results = []
+    threads = [threading.Thread(target=hammer, args=(dedupe, results)) for i in range(0, threadCount)]
+    
+    for thisThread in threads:
+        thisThread.start()
+    
+    for thisThread in threads:
+        thisThread.join()
+    
+    return [sum(results), dedupe.dupeCount]
+
+########
+# Main #
+########
+
+allGood = True
+
+# A key is a duplicate until exactly the TTL after we recorded it.
+dedupe = asDedupe(3, "test-")
+decisions = [dedupe.seen("a", 100.0), dedupe.seen("a", 102.99), dedupe.seen("a", 103.0), dedupe.seen("a", 105.99)]
+allGood &= check("TTL", decisions == [False, True, False, True], "got %s" %decisions)
+
+# A duplicate doesn't restart the TTL.
+dedupe = asDedupe(3, "test-")
+decisions = [dedupe.seen("a", 100.0), dedupe.seen("a", 102.0), dedupe.seen("a", 103.5)]
+allGood &= check("Duplicates don't refresh", decisions == [False, True, False], "got %s" %decisions)
+
+# With a 4 second TTL and 4 buckets each bucket covers a second and we keep 5 of them.
+dedupe = asDedupe(4, "test-", buckets=4)
+
+for i in range(0, 100):
+    dedupe.seen("old%s" %i, 0.5)
+
+# Record this one again in a later bucket once it's past the TTL.
+dedupe.seen("again", 0.5)
+dedupe.seen("again", 4.6)
+heldBefore = dedupe.keyCount()
+
+# Moving into bucket 5 throws away bucket 0.
+dedupe.seen("new", 5.5)
+heldAfter = dedupe.keyCount()
+againDupe = dedupe.seen("again", 5.5)
+oldDupe = dedupe.seen("old0", 5.5)
+allGood &= check("Bucket rotation", (heldBefore == 101) and (heldAfter == 2) and againDupe and (not oldDupe), "held %s then %s, re-recorded key duplicate %s, expired key duplicate %s" %(heldBefore, heldAfter, againDupe, oldDupe))
+
+# Random traffic on a clock that moves forward should get the same answers as remembering every key forever.
+random.seed(1090)
+ttlSec = 3
+dedupe = asDedupe(ttlSec, "test-")
+lastRecorded = {}
+now = 1000.0
+wrong = 0
+
+for i in range(0, randomFrames):
+    now += random.expovariate(1000.0)
+    key = "key%s" %random.randint(0, 2000)
+    
+    expect = (key in lastRecorded) and ((now - lastRecorded[key]) < ttlSec)
+    
+    if not expect:
+        lastRecorded[key] = now
+    
+    if dedupe.seen(key, now) != expect:
+        wrong += 1
+
+# Keys can stay up to one extra bucket past the TTL, but no longer.
+maxAllowed = max([len([key for key, keyTime in lastRecorded.items() if keyTime >= (now - ttlSec - (ttlSec / 4.0))]), 1])
+allGood &= check("Random traffic", (wrong == 0) and (dedupe.keyCount() <= maxAllowed), "%s wrong decisions, holding %s keys with at most %s expected" %(wrong, dedupe.keyCount(), maxAllowed))
+
+# Several threads sharing a dedupe get each key through once and every other copy gets counted.
+expectDupes = (threadCount - 1) * threadKeys
+
+for mode in ("local", "redis"):
+    dupes, counted = threaded(asDedupe(60, "test-", mode, "localhost", 6379))
+    allGood &= check("Threaded %s" %mode, dupes == counted == expectDupes, "threads saw %s, counted %s, expected %s" %(dupes, counted, expectDupes))
+
+if allGood:
+    print("asDedupe works.")
+else:
+    print("asDedupe problems found!")
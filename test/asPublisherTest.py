@@ -0,0 +1,192 @@
+#!/usr/bin/python
+
+"""
+asPublisherTest by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Make sure asPublisher sends full batches, sends batches that waited maxMs on its own, sends what it's holding when it's closed, keeps what it's holding while Redis is down and sends it once Redis comes back, and drops the oldest messages past connPubBatch['maxHeld']. We stand in for Redis with a client that records what gets published and can pretend the server is down, so this runs without a Redis server.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+import time
+import redis
+import config
+
+#################
+# Configuration #
+#################
+
+# Publish over pub/sub only so there's one copy of each message to check.
+config.connPub['transport'] = "pubsub"
+config.connMongo['enabled'] = False
+
+# Hold a small number of messages while Redis is down so we can fill it up.
+config.connPubBatch['maxHeld'] = 30
+config.connPubBatch['retrySec'] = 0.2
+
+##############
+# Fake Redis #
+##############
+
+class fakeRedis:
+    """
+    Stands in for redis.StrictRedis, keeping what gets published in the class attribute published. Set down to True to make pipelines fail like the server went away.
+    """
+    
+    published = []
+    down = False
+    
+    def __init__(self, *args, **kwargs):
+        pass
+    
+    def pipeline(self, transaction=True):
+        return fakePipeline()
+
+class fakePipeline:
+    """
+    Stands in for a Redis pipeline.
+    """
+    
+    def __init__(self):
+        self.__msgs = []
+    
+    def publish(self, channel, msg):
+        self.__msgs.append(msg)
+    
+    def execute(self):
+        if fakeRedis.down:
+            raise redis.ConnectionError("Redis is pretending to be down.")
+        
+        fakeRedis.published.extend(self.__msgs)
+
+# Hand out our fake clients from now on.
+redis.StrictRedis = fakeRedis
+
+from libAirSuck import asPublisher
+
+###########
+# Helpers #
+###########
+
+def check(name, good, detail):
+    """
+    Print the result of a check and return whether it passed.
+    """
+    
+    if good:
+        print("%s: OK" %name)
+    else:
+        print("%s: failed, %s" %(name, detail))
+    
+    return good
+
+def reset():
+    """
+    Forget what was published and bring Redis back up.
+    """
+    
+    fakeRedis.published = []
+    fakeRedis.down = False
+
+########
+# Main #
+########
+
+allGood = True
+msgs = ["msg%s" %i for i in range(0, 50)]
+
+# Full batches go out right away and the rest waits.
+reset()
+pub = asPublisher("none", 10, 10000.0)
+
+for thisMsg in msgs[:25]:
+    pub.publish(thisMsg)
+
+allGood &= check("Full batches", (fakeRedis.published == msgs[:20]) and (pub.batchCount == 2), "published %s in %s batches" %(len(fakeRedis.published), pub.batchCount))
+
+# close() sends what's left.
+pub.close()
+allGood &= check("Close", fakeRedis.published == msgs[:25], "published %s" %len(fakeRedis.published))
+
+# Batches that waited maxMs go out without anything else showing up.
+reset()
+pub = asPublisher("none", 100, 50.0)
+
+for thisMsg in msgs[:3]:
+    pub.publish(thisMsg)
+
+time.sleep(0.3)
+allGood &= check("Timer", fakeRedis.published == msgs[:3], "published %s" %len(fakeRedis.published))
+pub.close()
+
+# While Redis is down publish() keeps going and we hold on to everything, then flush() sends it all once it's back.
+reset()
+pub = asPublisher("none", 10, 10000.0)
+fakeRedis.down = True
+publishErrors = 0
+
+for thisMsg in msgs[:25]:
+    try:
+        pub.publish(thisMsg)
+    
+    except Exception:
+        publishErrors += 1
+
+try:
+    pub.flush()
+    flushRaised = False
+
+except redis.ConnectionError:
+    flushRaised = True
+
+allGood &= check("Redis down", (publishErrors == 0) and flushRaised and (fakeRedis.published == []) and (pub.dropCount == 0), "%s publish errors, flush raised %s, published %s, dropped %s" %(publishErrors, flushRaised, len(fakeRedis.published), pub.dropCount))
+
+fakeRedis.down = False
+pub.flush()
+allGood &= check("Retry", fakeRedis.published == msgs[:25], "published %s" %len(fakeRedis.published))
+
+# The timer keeps trying on its own once it's time to try Redis again.
+reset()
+pub = asPublisher("none", 100, 50.0)
+fakeRedis.down = True
+pub.publish(msgs[0])
+
+# Let the timer fail at least once, then bring Redis back.
+time.sleep(0.15)
+fakeRedis.down = False
+time.sleep(config.connPubBatch['retrySec'] + 0.2)
+allGood &= check("Timer retry", fakeRedis.published == msgs[:1], "published %s" %len(fakeRedis.published))
+pub.close()
+
+# Past maxHeld we drop the oldest messages.
+reset()
+pub = asPublisher("none", 10, 10000.0)
+fakeRedis.down = True
+
+for thisMsg in msgs:
+    pub.publish(thisMsg)
+    
+    # Don't wait for the retry time so every full batch tries Redis.
+    try:
+        pub.flush()
+    
+    except redis.ConnectionError:
+        pass
+
+fakeRedis.down = False
+pub.close()
+allGood &= check("Held limit", (fakeRedis.published == msgs[-30:]) and (pub.dropCount == 20), "published %s, dropped %s" %(len(fakeRedis.published), pub.dropCount))
+
+if allGood:
+    print("asPublisher works.")
+else:
+    print("asPublisher problems found!")
@@ -0,0 +1,145 @@
+#!/usr/bin/python
+
+"""
+asTablesTest by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Check airSuckUtil's table-driven ICAO, MID, and mode A squawk lookups against the reference code in asTables, make sure the shared tables can't be changed, and time the lookups.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+import random
+import time
+from libAirSuck import airSuckUtil
+from libAirSuck import asTables
+
+#################
+# Configuration #
+#################
+
+# How many random ICAO AAs do we check on top of the interval boundaries?
+randomAddrs = 200000
+
+########
+# Main #
+########
+
+asu = airSuckUtil()
+
+random.seed(24)
+
+allGood = True
+
+def report(name, checked, bad):
+    """
+    Print the results of a check.
+    """
+    
+    global allGood
+    
+    if bad > 0:
+        allGood = False
+    
+    print("%s: %s checked, %s bad" %(name, checked, bad))
+
+# ICAO AAs on each side of every interval boundary, and some random ones.
+icaoAddrs = []
+
+for thisStart in asTables.icaoStarts:
+    icaoAddrs.extend([(thisStart - 1) & 0xffffff, thisStart, (thisStart + 1) & 0xffffff])
+
+icaoAddrs.extend([random.randint(0, 0xffffff) for i in range(0, randomAddrs)])
+
+bad = 0
+
+for icaoAAInt in icaoAddrs:
+    if asu.getICAOMeta(icaoAAInt) != asTables._icaoMetaScan(icaoAAInt):
+        bad += 1
+        
+        if bad <= 10:
+            print("getICAOMeta(%06x): table %s, reference %s" %(icaoAAInt, asu.getICAOMeta(icaoAAInt), asTables._icaoMetaScan(icaoAAInt)))
+
+report("getICAOMeta", len(icaoAddrs), bad)
+
+# Every squawk code.
+bad = 0
+
+for aCode in range(0, 4096):
+    aSquawk = "%04o" %aCode
+    
+    if asu.modeA2Meta(aSquawk, asu.regionUSA) != asTables._modeA2MetaUSA(int(aSquawk)):
+        bad += 1
+        
+        if bad <= 10:
+            print("modeA2Meta(%s): table %s, reference %s" %(aSquawk, asu.modeA2Meta(aSquawk, asu.regionUSA), asTables._modeA2MetaUSA(int(aSquawk))))
+
+report("modeA2Meta", 4096, bad)
+
+# Every MID.
+bad = 0
+
+for mid in range(100, 1000):
+    # A coastal station MMSI starts with the MID.
+    mmsiMeta = asu.getMMSIMeta(mid * 10000)
+    
+    if str(mid) in asTables._mid2isoCC:
+        refCC = asTables._mid2isoCC[str(mid)]['isoCC']
+    else:
+        refCC = None
+    
+    if mmsiMeta.get('mmsiCC') != refCC:
+        bad += 1
+
+report("getMMSIMeta", 900, bad)
+
+# Make sure nobody can change the shared tables.
+bad = 0
+
+for thisTable in [asTables.isoCC2country, asTables.isoCC2country['US'], asTables.icaoMetas[0]]:
+    try:
+        thisTable['test'] = "test"
+        bad += 1
+    
+    except TypeError:
+        pass
+
+report("Read-only tables", 3, bad)
+
+# Time our lookups.
+startTime = time.time()
+
+for icaoAAInt in icaoAddrs:
+    asu.getICAOMeta(icaoAAInt)
+
+runTime = time.time() - startTime
+print("getICAOMeta: %10.0f lookups/sec" %(len(icaoAddrs) / runTime))
+
+startTime = time.time()
+
+for icaoAAInt in icaoAddrs:
+    asTables._icaoMetaScan(icaoAAInt)
+
+runTime = time.time() - startTime
+print("Prefix scan: %10.0f lookups/sec" %(len(icaoAddrs) / runTime))
+
+startTime = time.time()
+
+for i in range(0, 10000):
+    airSuckUtil()
+
+runTime = time.time() - startTime
+print("airSuckUtil(): %10.0f instances/sec" %(10000 / runTime))
+
+if allGood:
+    print("All tables match.")
+else:
+    print("Table mismatches found!")
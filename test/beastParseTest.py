@@ -0,0 +1,107 @@
+#!/usr/bin/python
+
+"""
+beastParseTest by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Build a Beast binary stream from known frames, feed it to beastParse in random chunks, and make sure we get the same frames back.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+import binascii
+import random
+import time
+from libAirSuck import beastParse
+
+#################
+# Configuration #
+#################
+
+# How many messages do we send through?
+messageCount = 50000
+
+# Frames to send. Some of these have 0x1a bytes that have to be escaped.
+someFrames = [
+    "2610", # Mode A Squawk 2610/ Mode C altitude 13300 ft.
+    "5da189a7b82d24", # DF11 All-call relpy.
+    "8da15e719941be06306c00b1e7db", # DF17, airborne veloicty
+    "8D75804B580FF2CF7E9BA6F701D0", # DF17, airborne position, even formation
+    "8D1a6D2B2058F6B9CF98201a1a1a", # DF17 with 0x1a bytes
+    "280010839b69fd", # DF 5, unknown squawk
+    "20001838ca3804" # DF 4, altitude
+]
+
+########
+# Main #
+########
+
+def beastMsg(timestamp, signalLevel, frame):
+    """
+    Build an escaped Beast message.
+    """
+    
+    msgTypes = {2: 0x31, 7: 0x32, 14: 0x33}
+    
+    # Timestamp, signal level, and frame.
+    body = bytearray([(timestamp >> shift) & 0xff for shift in (40, 32, 24, 16, 8, 0)])
+    body.append(signalLevel)
+    body.extend(frame)
+    
+    retVal = bytearray([0x1a, msgTypes[len(frame)]])
+    
+    # Escape 0x1a bytes.
+    for thisByte in body:
+        retVal.append(thisByte)
+        
+        if thisByte == 0x1a:
+            retVal.append(0x1a)
+    
+    return retVal
+
+random.seed(1090)
+binFrames = [bytearray(binascii.unhexlify(thisFrame)) for thisFrame in someFrames]
+
+# Build our stream and what we expect to get out of it.
+expected = []
+stream = bytearray()
+
+for i in range(0, messageCount):
+    thisMsg = [random.randint(0, 0xffffffffffff), random.choice([0x1a, random.randint(0, 255)]), random.choice(binFrames)]
+    
+    expected.append(thisMsg)
+    stream.extend(beastMsg(thisMsg[0], thisMsg[1], thisMsg[2]))
+
+# Add some garbage in front of the stream so we have to sync up.
+stream = bytearray(b"\x00\x1a\x1a\x05junk") + stream
+
+# Feed the stream in random chunk sizes like we'd get from recv().
+parser = beastParse()
+got = []
+pos = 0
+
+startTime = time.time()
+
+while pos < len(stream):
+    chunkLen = random.randint(1, 4096)
+    got.extend(parser.feed(memoryview(stream)[pos:pos + chunkLen]))
+    pos += chunkLen
+
+runTime = time.time() - startTime
+
+print("%s messages sent, %s recieved, %s bytes skipped" %(len(expected), len(got), parser.skippedBytes))
+
+if got == expected:
+    print("All frames match.")
+else:
+    print("Frame mismatch!")
+
+print("%.0f frames/sec, %.1f bytes per frame on the wire" %(len(got) / runTime, float(len(stream)) / len(expected)))
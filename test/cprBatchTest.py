@@ -0,0 +1,125 @@
+#!/usr/bin/python
+
+"""
+cprBatchTest by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Check cprMath's numpy batch CPR decoders against decoding one position at a time with cprResolveGlobal() and cprResolveLocal(), and compare their speed. Requires numpy.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+import random
+import time
+import numpy
+from libAirSuck import cprMath
+
+#################
+# Configuration #
+#################
+
+# How many random positions do we check for each decoder?
+randomPositions = 100000
+
+########
+# Main #
+########
+
+# Set up our decoder.
+cprDecoder = cprMath()
+
+random.seed(1090)
+
+# Random raw CPR positions and reference positions.
+evenLat = [random.randint(0, 0x1ffff) for i in range(0, randomPositions)]
+evenLon = [random.randint(0, 0x1ffff) for i in range(0, randomPositions)]
+oddLat = [random.randint(0, 0x1ffff) for i in range(0, randomPositions)]
+oddLon = [random.randint(0, 0x1ffff) for i in range(0, randomPositions)]
+mostRecent = [random.randint(0, 1) for i in range(0, randomPositions)]
+myLat = [random.uniform(-89.9, 89.9) for i in range(0, randomPositions)]
+myLon = [random.uniform(-179.9, 179.9) for i in range(0, randomPositions)]
+
+allGood = True
+
+def compare(name, singleResults, batchResults):
+    """
+    Compare a list of [lat, lon] or None results from the one at a time decoder against the batch decoder's results.
+    """
+    
+    global allGood
+    
+    bad = 0
+    
+    for i in range(0, len(singleResults)):
+        if singleResults[i] is None:
+            # The batch decoder should have flagged this as a straddle.
+            if not batchResults[2][i]:
+                bad += 1
+        
+        elif (len(batchResults) > 2) and batchResults[2][i]:
+            bad += 1
+        
+        elif (singleResults[i][0] != batchResults[0][i]) or (singleResults[i][1] != batchResults[1][i]):
+            bad += 1
+            
+            if bad <= 10:
+                print("%s %s: single %s, batch %s" %(name, i, singleResults[i], [batchResults[0][i], batchResults[1][i]]))
+    
+    if bad > 0:
+        allGood = False
+    
+    print("%s: %s positions checked, %s bad" %(name, len(singleResults), bad))
+
+for surface in [False, True]:
+    # Decode one at a time.
+    startTime = time.time()
+    
+    singleGlobal = []
+    
+    for i in range(0, randomPositions):
+        try:
+            singleGlobal.append(cprDecoder.cprResolveGlobal([evenLat[i], evenLon[i]], [oddLat[i], oddLon[i]], mostRecent[i], [myLat[i], myLon[i]], surface))
+        
+        except RuntimeError:
+            singleGlobal.append(None)
+    
+    singleGlobalTime = time.time() - startTime
+    
+    startTime = time.time()
+    
+    singleLocal = [cprDecoder.cprResolveLocal([myLat[i], myLon[i]], [evenLat[i], evenLon[i]], mostRecent[i], surface) for i in range(0, randomPositions)]
+    
+    singleLocalTime = time.time() - startTime
+    
+    # And in batches.
+    startTime = time.time()
+    batchGlobal = cprDecoder.cprResolveGlobalBatch(evenLat, evenLon, oddLat, oddLon, mostRecent, myLat, myLon, surface)
+    batchGlobalTime = time.time() - startTime
+    
+    startTime = time.time()
+    batchLocal = cprDecoder.cprResolveLocalBatch(myLat, myLon, evenLat, evenLon, mostRecent, surface)
+    batchLocalTime = time.time() - startTime
+    
+    compare("cprResolveGlobalBatch (surface %s)" %surface, singleGlobal, batchGlobal)
+    print("Single: %10.0f pairs/sec, batch: %10.0f pairs/sec, %s straddles" %(randomPositions / singleGlobalTime, randomPositions / batchGlobalTime, numpy.count_nonzero(batchGlobal[2])))
+    
+    compare("cprResolveLocalBatch (surface %s)" %surface, singleLocal, batchLocal)
+    print("Single: %10.0f positions/sec, batch: %10.0f positions/sec" %(randomPositions / singleLocalTime, randomPositions / batchLocalTime))
+
+# Make sure a single shared reference position works too.
+batchShared = cprDecoder.cprResolveLocalBatch(45.5895, -122.5951, evenLat, evenLon, mostRecent)
+singleShared = [cprDecoder.cprResolveLocal([45.5895, -122.5951], [evenLat[i], evenLon[i]], mostRecent[i], False) for i in range(0, randomPositions)]
+compare("cprResolveLocalBatch (shared reference)", singleShared, batchShared)
+
+if allGood:
+    print("All batch decodes match.")
+else:
+    print("Batch decode mismatches found!")
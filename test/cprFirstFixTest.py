@@ -0,0 +1,210 @@
+#!/usr/bin/python
+
+"""
+cprFirstFixTest by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Make sure ssrStateEngine gets a first fix from a single airborne CPR frame when it knows where the receiver is, doesn't without the receiver position, rejects positions farther than ssrStateEngine['cprFirstFixMaxKm'] from the receiver, and uses the global position once it has an even/odd pair. Then put aircraft at random spots out to the radio horizon from random receivers and make sure cprFirstFixMaxKm never lets a position decoded in the wrong zone through.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+import datetime
+import math
+import random
+import config
+
+# We don't need registration data.
+config.ssrRegMongo['enabled'] = False
+
+from libAirSuck import asLog
+from libAirSuck import airSuckUtil
+import ssrStateEngine
+
+#################
+# Configuration #
+#################
+
+# How many random aircraft do we check?
+randomPositions = 20000
+
+# How far from the receiver can a random aircraft be in km? Receivers rarely hear anything past about 500 km.
+maxRangeKm = 500.0
+
+# How far off can a decoded position be in degrees? Airborne CPR resolution is about 6 / 2^17 degrees.
+tolerance = 0.0002
+
+###########
+# Helpers #
+###########
+
+def nl(lat):
+    """
+    Number of longitude zones for a given latitude.
+    """
+    
+    if abs(lat) >= 87.0:
+        return 1
+    
+    return int(math.floor(2.0 * math.pi / math.acos(1.0 - (1.0 - math.cos(math.pi / 30.0)) / (math.cos(math.radians(abs(lat))) ** 2))))
+
+def airborneEncode(lat, lon, cType):
+    """
+    Encode an airborne position as 17 bit CPR lat and lon values.
+    """
+    
+    dLat = 360.0 / (60 - cType)
+    yz = int(math.floor((2 ** 17) * ((lat % dLat) / dLat) + 0.5))
+    rLat = dLat * ((yz / float(2 ** 17)) + math.floor(lat / dLat))
+    
+    dLon = 360.0 / max(nl(rLat) - cType, 1)
+    xz = int(math.floor((2 ** 17) * ((lon % dLon) / dLon) + 0.5))
+    
+    return [yz & 0x1ffff, xz & 0x1ffff]
+
+def offsetPos(pos, rangeKm, bearing):
+    """
+    Get a position about rangeKm from pos in the direction bearing in degrees.
+    """
+    
+    lat = pos[0] + (rangeKm / 111.2) * math.cos(math.radians(bearing))
+    lon = pos[1] + (rangeKm / (111.2 * math.cos(math.radians(lat)))) * math.sin(math.radians(bearing))
+    
+    if lon >= 180.0:
+        lon -= 360.0
+    elif lon < -180.0:
+        lon += 360.0
+    
+    return [lat, lon]
+
+def isClose(decoded, pos):
+    """
+    See if a decoded position is within tolerance of the real position.
+    """
+    
+    lonDiff = abs(decoded[1] - pos[1])
+    
+    # Handle wrapping at 180 degrees.
+    if lonDiff > 180.0:
+        lonDiff = 360.0 - lonDiff
+    
+    return (abs(decoded[0] - pos[0]) <= tolerance) and (lonDiff <= tolerance)
+
+def stateData(pos, rxPos, cTypes):
+    """
+    Build the state data ssrStateEngine would have for an aircraft at pos heard by a receiver at rxPos (or an unknown receiver if it's None), with a frame for each CPR type in cTypes.
+    """
+    
+    now = str(datetime.datetime.utcnow())
+    retVal = {'lastSeen': now}
+    
+    if rxPos is not None:
+        retVal.update({'srcLat': rxPos[0], 'srcLon': rxPos[1]})
+    
+    for cType in cTypes:
+        rawPos = airborneEncode(pos[0], pos[1], cType)
+        prefix = ["even", "odd"][cType]
+        retVal.update({prefix + 'Lat': rawPos[0], prefix + 'Lon': rawPos[1], prefix + 'Ts': now})
+    
+    return retVal
+
+def decode(pos, rxPos, cTypes):
+    """
+    Decode the most recent of the frames for an aircraft at pos heard by a receiver at rxPos like ssrStateEngine does. Returns [locData, locMeta].
+    """
+    
+    data = stateData(pos, rxPos, cTypes)
+    cType = cTypes[-1]
+    rawPos = airborneEncode(pos[0], pos[1], cType)
+    
+    return listener.decodeCPR({'fmt': 11, 'evenOdd': cType, 'rawLat': rawPos[0], 'rawLon': rawPos[1]}, data)
+
+def check(name, good, detail):
+    """
+    Print the result of a check and return whether it passed.
+    """
+    
+    if good:
+        print("%s: OK" %name)
+    else:
+        print("%s: failed, %s" %(name, detail))
+    
+    return good
+
+########
+# Main #
+########
+
+ssrStateEngine.logger = asLog("none")
+listener = ssrStateEngine.SubListener([config.connPub['qName']])
+asu = airSuckUtil()
+
+config.ssrStateEngine['cprFirstFix'] = True
+maxKm = config.ssrStateEngine['cprFirstFixMaxKm']
+
+allGood = True
+acPos = [45.60, -122.30]
+rxPos = offsetPos(acPos, 40.0, 250.0)
+
+# A single even or odd frame gets a first fix near the receiver.
+for cType in (0, 1):
+    result = decode(acPos, rxPos, [cType])
+    allGood &= check("First fix from %s frame" %["even", "odd"][cType], (result[1] == "CPRLocal") and isClose(result[0], acPos), "got %s" %result)
+
+# No receiver position, no first fix.
+result = decode(acPos, None, [0])
+allGood &= check("No receiver position", result == [None, None], "got %s" %result)
+
+# Positions that decode right but are past cprFirstFixMaxKm get thrown away.
+farRxPos = offsetPos(acPos, maxKm + 30.0, 0.0)
+result = decode(acPos, farRxPos, [0])
+allGood &= check("Past cprFirstFixMaxKm", result == [None, None], "got %s" %result)
+
+# An aircraft 450 km out decodes in the wrong zone, closer to the receiver than half a zone, and gets thrown away.
+wrongZoneRxPos = offsetPos(acPos, 450.0, 0.0)
+wrongPos = ssrStateEngine.cprProc.cprResolveLocal(wrongZoneRxPos, airborneEncode(acPos[0], acPos[1], 0), 0, False)
+wrongKm = asu.getRange(wrongZoneRxPos, wrongPos)
+result = decode(acPos, wrongZoneRxPos, [0])
+allGood &= check("Wrong zone", (not isClose(wrongPos, acPos)) and (wrongKm < 333.0) and (result == [None, None]), "wrong position %.0f km from the receiver, got %s" %(wrongKm, result))
+
+# Once we have a pair the global position wins, even when the first fix would have been thrown away.
+for thisRxPos, rxName in [[rxPos, "near"], [wrongZoneRxPos, "far"]]:
+    result = decode(acPos, thisRxPos, [0, 1])
+    allGood &= check("Pair with %s receiver" %rxName, (result[1] == "CPRGlobal") and isClose(result[0], acPos), "got %s" %result)
+
+# Random aircraft out to the radio horizon should never get a first fix in the wrong zone.
+random.seed(1090)
+
+counts = {'good': 0, 'wrong': 0, 'rejected': 0}
+
+for i in range(0, randomPositions):
+    thisRxPos = [random.uniform(-70.0, 70.0), random.uniform(-180.0, 180.0)]
+    thisAcPos = offsetPos(thisRxPos, random.uniform(0.0, maxRangeKm), random.uniform(0.0, 360.0))
+    
+    result = decode(thisAcPos, thisRxPos, [random.randint(0, 1)])
+    
+    if result[0] is None:
+        counts['rejected'] += 1
+    elif isClose(result[0], thisAcPos):
+        counts['good'] += 1
+    else:
+        counts['wrong'] += 1
+        
+        if counts['wrong'] <= 10:
+            print("Wrong fix: receiver %s, real %s, decoded %s" %(thisRxPos, thisAcPos, result[0]))
+
+allGood &= check("Random aircraft out to %.0f km with cprFirstFixMaxKm %.0f" %(maxRangeKm, maxKm), (counts['wrong'] == 0) and (counts['good'] > 0), "%s" %counts)
+print("%s first fixes, %s rejected, %s in the wrong zone" %(counts['good'], counts['rejected'], counts['wrong']))
+
+if allGood:
+    print("CPR first fixes work.")
+else:
+    print("CPR first fix problems found!")
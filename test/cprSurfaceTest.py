@@ -0,0 +1,134 @@
+#!/usr/bin/python
+
+"""
+cprSurfaceTest by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Encode random surface positions near receivers all over the world as CPR, then make sure cprMath decodes them back to the right place both globally from an even/odd pair and locally from a single frame. Global decodes are checked with and without the receiver's longitude quadrant passed in the way the state engine does.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+import math
+import random
+from libAirSuck import cprMath
+
+#################
+# Configuration #
+#################
+
+# How many random positions do we check?
+randomPositions = 50000
+
+# How far from the receiver can the aircraft be in degrees?
+maxOffset = 0.3
+
+# How far off can a decoded position be in degrees? Surface CPR resolution is about 1.5 / 2^17 degrees.
+tolerance = 0.0001
+
+########
+# Main #
+########
+
+# Set up our decoder.
+cprDecoder = cprMath()
+
+random.seed(5)
+
+def nl(lat):
+    """
+    Number of longitude zones for a given latitude.
+    """
+    
+    if abs(lat) >= 87.0:
+        return 1
+    
+    return int(math.floor(2.0 * math.pi / math.acos(1.0 - (1.0 - math.cos(math.pi / 30.0)) / (math.cos(math.radians(abs(lat))) ** 2))))
+
+def surfaceEncode(lat, lon, cType):
+    """
+    Encode a surface position as 17 bit CPR lat and lon values.
+    """
+    
+    dLat = 90.0 / (60 - cType)
+    yz = int(math.floor((2 ** 17) * ((lat % dLat) / dLat) + 0.5))
+    rLat = dLat * ((yz / float(2 ** 17)) + math.floor(lat / dLat))
+    
+    dLon = 90.0 / max(nl(rLat) - cType, 1)
+    xz = int(math.floor((2 ** 17) * ((lon % dLon) / dLon) + 0.5))
+    
+    return [yz & 0x1ffff, xz & 0x1ffff]
+
+def isClose(decoded, lat, lon):
+    """
+    See if a decoded position is within tolerance of the real position.
+    """
+    
+    lonDiff = abs(decoded[1] - lon)
+    
+    # Handle wrapping at 180 degrees.
+    if lonDiff > 180.0:
+        lonDiff = 360.0 - lonDiff
+    
+    return (abs(decoded[0] - lat) <= tolerance) and (lonDiff <= tolerance)
+
+badGlobal = 0
+badLocal = 0
+straddles = 0
+
+for i in range(0, randomPositions):
+    # Pick a receiver and an aircraft near it.
+    myPos = [random.uniform(-80.0, 80.0), random.uniform(-180.0, 180.0)]
+    lat = myPos[0] + random.uniform(0 - maxOffset, maxOffset)
+    lon = myPos[1] + random.uniform(0 - maxOffset, maxOffset)
+    
+    if lon >= 180.0:
+        lon -= 360.0
+    elif lon < -180.0:
+        lon += 360.0
+    
+    evenPos = surfaceEncode(lat, lon, 0)
+    oddPos = surfaceEncode(lat, lon, 1)
+    mostRecent = random.randint(0, 1)
+    
+    # Global decode from the pair.
+    try:
+        decoded = cprDecoder.cprResolveGlobal(evenPos, oddPos, mostRecent, myPos, True)
+        
+        # Passing in the receiver's quadrant like the state engine does should give the same answer.
+        if (not isClose(decoded, lat, lon)) or (cprDecoder.cprResolveGlobal(evenPos, oddPos, mostRecent, myPos, True, cprDecoder.surfaceLonBase(myPos)) != decoded):
+            badGlobal += 1
+            
+            if badGlobal <= 10:
+                print("Global: receiver %s, real %s, decoded %s" %(myPos, [lat, lon], decoded))
+    
+    except RuntimeError:
+        straddles += 1
+    
+    # Local decode from the most recent frame.
+    if mostRecent == 0:
+        decoded = cprDecoder.cprResolveLocal(myPos, evenPos, 0, True)
+    else:
+        decoded = cprDecoder.cprResolveLocal(myPos, oddPos, 1, True)
+    
+    if not isClose(decoded, lat, lon):
+        badLocal += 1
+        
+        if badLocal <= 10:
+            print("Local: receiver %s, real %s, decoded %s" %(myPos, [lat, lon], decoded))
+
+print("Surface global: %s positions checked, %s straddles, %s bad" %(randomPositions, straddles, badGlobal))
+print("Surface local: %s positions checked, %s bad" %(randomPositions, badLocal))
+
+if (badGlobal == 0) and (badLocal == 0):
+    print("All surface positions decoded.")
+else:
+    print("Surface position decode errors found!")
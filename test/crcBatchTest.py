@@ -0,0 +1,85 @@
+#!/usr/bin/python
+
+"""
+crcBatchTest by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Check ssrParse.getCrcBatch() against the per-frame getCrc() reference and compare their speed. Requires numpy.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+import binascii
+import random
+import time
+from libAirSuck import ssrParse
+
+#################
+# Configuration #
+#################
+
+# How many random frames of each length do we check?
+randomFrames = 50000
+
+# Known frames to make sure we're on the right track.
+someFrames = [
+    "5da189a7b82d24", # DF11 All-call relpy.
+    "8da15e719941be06306c00b1e7db", # DF17, airborne veloicty
+    "8D75804B580FF2CF7E9BA6F701D0", # DF17, airborne position, even formation
+    "8D75804B580FF6B283EB7A157117", # DF17, airborne position, odd formation
+    "8D7C6D2B2058F6B9CF9820000000", # DF17, aircraft ID and category info, bad CRC
+    "280010839b69fd", # DF 5, unknown squawk
+    "20001838ca3804" # DF 4, altitude
+]
+
+########
+# Main #
+########
+
+# Set up our parser.
+parser = ssrParse()
+
+# Build random frames of both lengths, starting with the known ones.
+random.seed(1090)
+batches = {7: [], 14: []}
+
+for thisFrame in someFrames:
+    binData = bytearray(binascii.unhexlify(thisFrame))
+    batches[len(binData)].append(binData)
+
+for frameLen in batches:
+    for i in range(0, randomFrames):
+        batches[frameLen].append(bytearray([random.randint(0, 255) for j in range(0, frameLen)]))
+
+for frameLen in sorted(batches):
+    frames = batches[frameLen]
+    
+    # Get reference values one frame at a time.
+    startTime = time.time()
+    refParity = [parser.getCrc(thisFrame[0:-3]) for thisFrame in frames]
+    refTime = time.time() - startTime
+    
+    # And the whole batch at once.
+    startTime = time.time()
+    parity, syndrome = parser.getCrcBatch(parser.packFrameBatch(frames))
+    batchTime = time.time() - startTime
+    
+    # Count mismatches.
+    badCount = 0
+    
+    for i in range(0, len(frames)):
+        frameCrc = (frames[i][-3] << 16) + (frames[i][-2] << 8) + frames[i][-1]
+        
+        if (parity[i] != refParity[i]) or (syndrome[i] != (refParity[i] ^ frameCrc)):
+            badCount += 1
+            print("Mismatch: " + binascii.hexlify(frames[i]))
+    
+    print("%s byte frames: %s checked, %s bad, getCrc %.0f frames/sec, getCrcBatch %.0f frames/sec" %(frameLen, len(frames), badCount, len(frames) / refTime, len(frames) / batchTime))
@@ -0,0 +1,85 @@
+#!/usr/bin/python
+
+"""
+crcFixTest by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Flip random bits in frames with good CRCs and make sure ssrParse's CRC correction recovers them.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+import binascii
+import random
+from libAirSuck import ssrParse
+
+#################
+# Configuration #
+#################
+
+# How many times do we damage each frame?
+passes = 2000
+
+# Frames with good CRCs.
+someFrames = [
+    "5da189a7b82d24", # DF11 All-call relpy.
+    "8da15e719941be06306c00b1e7db", # DF17, airborne veloicty
+    "8D75804B580FF2CF7E9BA6F701D0", # DF17, airborne position, even formation
+    "8D75804B580FF6B283EB7A157117", # DF17, airborne position, odd formation
+    "8da11136e11c280000000074397e" # DF17, ES Should squawk 1330
+]
+
+########
+# Main #
+########
+
+# Set up our parser with 2-bit correction.
+parser = ssrParse()
+parser.setCrcFixBits(2)
+
+random.seed(1090)
+
+for thisFrame in someFrames:
+    binData = bytearray(binascii.unhexlify(thisFrame))
+    goodFrame = parser.ssrParse(binData)
+    
+    # DF11 frames only get 1-bit correction, and errors in the low 7 CRC bits look like an II or SI code.
+    if len(binData) == 7:
+        maxBits = 1
+        lastBit = (len(binData) * 8) - 7
+    
+    else:
+        maxBits = 2
+        lastBit = len(binData) * 8
+    
+    fixed = 0
+    bad = 0
+    
+    for i in range(0, passes):
+        # Flip up to maxBits random bits outside the DF field.
+        badData = bytearray(binData)
+        
+        for thisBit in random.sample(range(5, lastBit), random.randint(1, maxBits)):
+            badData[thisBit >> 3] ^= 0x80 >> (thisBit & 7)
+        
+        parsed = parser.ssrParse(badData)
+        
+        # The corrected frame should decode exactly like the good one.
+        if parsed.pop('corrected', False) and (parsed == goodFrame):
+            fixed += 1
+        
+        else:
+            bad += 1
+            print("Not recovered: " + binascii.hexlify(badData))
+    
+    print("%s: %s recovered, %s not recovered" %(thisFrame, fixed, bad))
+
+print("Total frames recovered: %s" %parser.crcFixCount)
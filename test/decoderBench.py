@@ -0,0 +1,338 @@
+#!/usr/bin/python
+
+"""
+decoderBench by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Benchmark the SSR and AIS decoders against the frames in test/corpus. For each decoder we print frames/sec, per-call latency percentiles, and how much memory each result holds on to, then compare the numbers against a saved JSON baseline so regressions show up.
+
+Usage: python decoderBench.py [--save]
+
+--save writes the results to the baseline file instead of comparing against it. Baselines are only meaningful on the machine they were saved on.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+import binascii
+import gc
+import json
+import os
+import timeit
+from libAirSuck import ssrParse
+from libAirSuck import cprMath
+from libAirSuck import aisParse
+
+#################
+# Configuration #
+#################
+
+# Where our corpus and baseline live.
+benchDir = os.path.dirname(os.path.abspath(__file__))
+ssrCorpus = os.path.join(benchDir, "corpus", "ssrAvr.txt")
+aisCorpus = os.path.join(benchDir, "corpus", "aisAivdm.txt")
+baselineFile = os.path.join(benchDir, "decoderBenchBaseline.json")
+
+# How many times do we run through the corpus for the throughput and latency runs?
+passes = 10
+
+# Receiver location used for local CPR decoding. [lat, lon]
+myPos = [45.5895, -122.5951]
+
+# How much slower than the baseline can a decoder get before we call it a regression? 0.25 = 25%
+regressTolerance = 0.25
+
+###########
+# Corpora #
+###########
+
+def loadSSR(fileName):
+    """
+    Load AVR formatted frames (*hex; or @mlathex;) from fileName.
+    
+    Returns a list of frames as bytearrays.
+    """
+    
+    retVal = []
+    
+    with open(fileName) as corpusFile:
+        for thisLine in corpusFile:
+            thisLine = thisLine.strip()
+            
+            # Skip blank lines and comments.
+            if (thisLine == "") or thisLine.startswith("#"):
+                continue
+            
+            # Drop the delimiters, and the MLAT timestamp if we have one.
+            hexData = thisLine.strip("*@;")
+            
+            if thisLine.startswith("@"):
+                hexData = hexData[12:]
+            
+            retVal.append(bytearray(binascii.unhexlify(hexData)))
+    
+    return retVal
+
+def loadAIS(fileName, parser):
+    """
+    Load AIVDM sentences from fileName, and reassemble fragmented messages the same way handlerAIS does.
+    
+    Returns a list of complete sentences. Each entry is a list of the sentences that make up a message.
+    """
+    
+    retVal = []
+    
+    # Fragments we're waiting on the rest of, keyed on the message ID.
+    pending = {}
+    
+    with open(fileName) as corpusFile:
+        for thisLine in corpusFile:
+            thisLine = thisLine.strip()
+            
+            # Skip blank lines and comments.
+            if (thisLine == "") or thisLine.startswith("#"):
+                continue
+            
+            thisData = parser.nmeaDecapsulate(thisLine)
+            
+            # Single fragment messages go right in.
+            if thisData['fragCount'] == 1:
+                retVal.append([thisLine])
+                continue
+            
+            # Hang on to fragments until we have all of them.
+            fragKey = "%s-%s" %(thisData['channel'], thisData['messageID'])
+            frags = pending.setdefault(fragKey, [])
+            frags.append(thisLine)
+            
+            if len(frags) == thisData['fragCount']:
+                retVal.append(pending.pop(fragKey))
+    
+    return retVal
+
+def getCprInputs(parser, binFrames):
+    """
+    Decode binFrames and pull the airborne position data out of them.
+    
+    Returns a list of [evenPos, oddPos, mostRecent] for global decoding and a list of [encodedLocation, cType] for local decoding.
+    """
+    
+    globalIn = []
+    localIn = []
+    
+    # The last even and odd position we saw for each aircraft.
+    lastPos = {}
+    
+    for thisFrame in binFrames:
+        decoded = parser.ssrParse(thisFrame)
+        
+        # Only use good airborne position frames.
+        if ('rawLat' not in decoded) or (decoded['frameCrc'] != decoded['cmpCrc']) or (decoded['fmt'] < 9) or (decoded['fmt'] > 18):
+            continue
+        
+        encLoc = [decoded['rawLat'], decoded['rawLon']]
+        cType = decoded['evenOdd']
+        localIn.append([encLoc, cType])
+        
+        thisPos = lastPos.setdefault(decoded['icaoAAInt'], [None, None])
+        thisPos[cType] = encLoc
+        
+        # Once we have both formats we can do a global decode.
+        if (thisPos[0] is not None) and (thisPos[1] is not None):
+            globalIn.append([thisPos[0], thisPos[1], cType])
+    
+    return [globalIn, localIn]
+
+######################
+# Benchmark routines #
+######################
+
+def resultSize(thisObj):
+    """
+    Get the number of bytes thisObj holds on to, including the contents of dicts, lists, and tuples.
+    """
+    
+    retVal = sys.getsizeof(thisObj)
+    
+    if isinstance(thisObj, dict):
+        for key, value in thisObj.items():
+            retVal += resultSize(value)
+    
+    elif isinstance(thisObj, (list, tuple)):
+        for value in thisObj:
+            retVal += resultSize(value)
+    
+    return retVal
+
+def percentile(sortedList, pct):
+    """
+    Get the pct percentile of a sorted list by the nearest rank.
+    """
+    
+    index = int(round((pct / 100.0) * (len(sortedList) - 1)))
+    
+    return sortedList[index]
+
+def runBench(name, decoder, inputs):
+    """
+    Run decoder over every input in inputs and measure throughput, per-call latency, and how many bytes each result holds on to.
+    
+    Returns a dict of results.
+    """
+    
+    timer = timeit.default_timer
+    
+    # Warm up any caches so we measure the steady state.
+    for thisInput in inputs:
+        decoder(thisInput)
+    
+    # Memory held by each result.
+    totalBytes = 0
+    
+    for thisInput in inputs:
+        totalBytes += resultSize(decoder(thisInput))
+    
+    # Keep the garbage collector from landing in the middle of our timing.
+    gc.collect()
+    gc.disable()
+    
+    # Throughput, best of our passes.
+    bestTime = None
+    
+    for i in range(0, passes):
+        startTime = timer()
+        
+        for thisInput in inputs:
+            decoder(thisInput)
+        
+        runTime = timer() - startTime
+        
+        if (bestTime is None) or (runTime < bestTime):
+            bestTime = runTime
+    
+    # Per-call latency.
+    latencies = []
+    
+    for i in range(0, passes):
+        for thisInput in inputs:
+            startTime = timer()
+            decoder(thisInput)
+            latencies.append(timer() - startTime)
+    
+    gc.enable()
+    
+    latencies.sort()
+    
+    retVal = {
+        'framesPerSec': len(inputs) / bestTime,
+        'p50Us': percentile(latencies, 50) * 1000000.0,
+        'p90Us': percentile(latencies, 90) * 1000000.0,
+        'p99Us': percentile(latencies, 99) * 1000000.0,
+        'bytesPerCall': float(totalBytes) / len(inputs)
+    }
+    
+    print("%-22s %10.0f frames/sec  p50 %7.2f us  p90 %7.2f us  p99 %7.2f us  %6.0f bytes/call" %(name, retVal['framesPerSec'], retVal['p50Us'], retVal['p90Us'], retVal['p99Us'], retVal['bytesPerCall']))
+    
+    return retVal
+
+def compareBaseline(results, baseline):
+    """
+    Compare our results against the baseline and print the change for each decoder.
+    
+    Returns the number of decoders that regressed.
+    """
+    
+    retVal = 0
+    
+    print("\nChange from baseline:")
+    
+    for name in sorted(results.keys()):
+        if name not in baseline:
+            print("%-22s no baseline" %name)
+            continue
+        
+        change = (results[name]['framesPerSec'] / baseline[name]['framesPerSec']) - 1.0
+        
+        if change < (0 - regressTolerance):
+            flag = "REGRESSION"
+            retVal += 1
+        else:
+            flag = "ok"
+        
+        print("%-22s %+7.1f%% frames/sec  p99 %7.2f -> %7.2f us  %s" %(name, change * 100.0, baseline[name]['p99Us'], results[name]['p99Us'], flag))
+    
+    return retVal
+
+########
+# Main #
+########
+
+# Set up our decoders.
+ssrParser = ssrParse()
+cprDecoder = cprMath()
+aisParser = aisParse()
+
+# Load the corpora.
+binFrames = loadSSR(ssrCorpus)
+crcFrames = [thisFrame[0:-3] for thisFrame in binFrames if len(thisFrame) > 2]
+aisMsgs = loadAIS(aisCorpus, aisParser)
+[globalIn, localIn] = getCprInputs(ssrParser, binFrames)
+
+def decodeGlobal(cprIn):
+    """
+    Run a global CPR decode, treating a boundary straddle as a result like the state engine does.
+    """
+    
+    try:
+        retVal = cprDecoder.cprResolveGlobal(cprIn[0], cprIn[1], cprIn[2])
+    
+    except RuntimeError:
+        retVal = None
+    
+    return retVal
+
+def decodeAIS(sentences):
+    """
+    Decapsulate each sentence, join the payloads of fragmented messages, and parse the message.
+    """
+    
+    nmeaData = aisParser.nmeaDecapsulate(sentences[0])
+    
+    if len(sentences) > 1:
+        nmeaData['payload'] = "".join([aisParser.nmeaDecapsulate(thisSentence)['payload'] for thisSentence in sentences])
+    
+    return aisParser.aisParse(nmeaData)
+
+print("Corpus: %s SSR frames, %s CPR pairs, %s CPR positions, %s AIS messages\n" %(len(binFrames), len(globalIn), len(localIn), len(aisMsgs)))
+
+results = {}
+results['ssrParse'] = runBench("ssrParse.ssrParse", ssrParser.ssrParse, binFrames)
+results['getCrc'] = runBench("ssrParse.getCrc", ssrParser.getCrc, crcFrames)
+results['cprResolveGlobal'] = runBench("cprResolveGlobal", decodeGlobal, globalIn)
+results['cprResolveLocal'] = runBench("cprResolveLocal", lambda cprIn: cprDecoder.cprResolveLocal(myPos, cprIn[0], cprIn[1], False), localIn)
+results['aisParse'] = runBench("aisParse.aisParse", decodeAIS, aisMsgs)
+
+if "--save" in sys.argv:
+    # Save our results as the new baseline.
+    with open(baselineFile, "w") as outFile:
+        json.dump(results, outFile, indent=2, sort_keys=True)
+    
+    print("\nSaved baseline to %s" %baselineFile)
+
+elif os.path.exists(baselineFile):
+    with open(baselineFile) as inFile:
+        baseline = json.load(inFile)
+    
+    # Exit with an error if anything regressed.
+    if compareBaseline(results, baseline) > 0:
+        sys.exit(1)
+
+else:
+    print("\nNo baseline at %s. Run with --save to create one." %baselineFile)
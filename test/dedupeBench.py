@@ -0,0 +1,186 @@
+#!/usr/bin/python
+
+"""
+dedupeBench by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Benchmark asDedupe against simulated traffic built from the frames in test/corpus/ssrAvr.txt where each frame is heard by one or more receivers a little while apart. We print frames/sec and check asDedupe's decisions on the simulated clock: a false positive is a frame dropped even though the last copy we let through was at least the TTL ago, and a false negative is a frame let through even though the last copy we let through was less than the TTL ago. If the dedupe Redis host in the config is up we also time the Redis dedupe mode.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+import os
+import random
+import time
+import redis
+import config
+from libAirSuck import asDedupe
+
+#################
+# Configuration #
+#################
+
+# Where our corpus lives.
+benchDir = os.path.dirname(os.path.abspath(__file__))
+ssrCorpus = os.path.join(benchDir, "corpus", "ssrAvr.txt")
+
+# How many seconds of traffic do we simulate, and how many frames/sec get transmitted?
+simSec = 60
+simRate = 2000
+
+# How many receivers can hear each frame, and how late in seconds can a receiver pass it along?
+maxReceivers = 3
+maxDelaySec = 0.25
+
+# Dedupe TTL in seconds.
+ttlSec = config.d1090Settings['dedupeTTLSec']
+
+# How many frames do we push through Redis if it's up?
+redisFrames = 20000
+
+###########
+# Traffic #
+###########
+
+def loadSSR(fileName):
+    """
+    Load AVR formatted frames (*hex; or @mlathex;) from fileName.
+    
+    Returns a list of frames as hex strings like handler1090 dedupes them.
+    """
+    
+    retVal = []
+    
+    with open(fileName) as corpusFile:
+        for thisLine in corpusFile:
+            thisLine = thisLine.strip()
+            
+            # Skip blank lines and comments.
+            if (thisLine == "") or thisLine.startswith("#"):
+                continue
+            
+            # Drop the delimiters, and the MLAT timestamp if we have one.
+            hexData = thisLine.strip("*@;").lower()
+            
+            if thisLine.startswith("@"):
+                hexData = hexData[12:]
+            
+            retVal.append(hexData)
+    
+    return retVal
+
+def buildTraffic(frames):
+    """
+    Build a list of [arrival time, frame, transmission number] for simulated traffic, sorted by arrival time. Frames come out of the corpus in order and get repeated when we run out, like aircraft sending the same squitters again.
+    """
+    
+    retVal = []
+    
+    for i in range(0, simSec * simRate):
+        sentTime = 1000000.0 + (float(i) / simRate)
+        thisFrame = frames[i % len(frames)]
+        
+        for j in range(0, random.randint(1, maxReceivers)):
+            retVal.append([sentTime + random.uniform(0, maxDelaySec), thisFrame, i])
+    
+    retVal.sort()
+    
+    return retVal
+
+def checkDupes(dupes):
+    """
+    Check a list of dedupe decisions for our traffic. Returns [false positives, false negatives, transmissions let through more than once].
+    """
+    
+    # When did we last let each frame through, and which transmissions did we let through?
+    lastTimes = {}
+    sentTx = set()
+    
+    falsePos = 0
+    falseNeg = 0
+    repeatTx = 0
+    
+    for i in range(0, len(traffic)):
+        arrivalTime, thisFrame, txNum = traffic[i]
+        
+        # Did we have a copy within the TTL?
+        inTTL = (thisFrame in lastTimes) and ((arrivalTime - lastTimes[thisFrame]) < ttlSec)
+        
+        if dupes[i]:
+            if not inTTL:
+                falsePos += 1
+        
+        else:
+            if inTTL:
+                falseNeg += 1
+            
+            if txNum in sentTx:
+                repeatTx += 1
+            
+            lastTimes[thisFrame] = arrivalTime
+            sentTx.add(txNum)
+    
+    return [falsePos, falseNeg, repeatTx]
+
+########
+# Main #
+########
+
+random.seed(1090)
+
+traffic = buildTraffic(loadSSR(ssrCorpus))
+
+print("Simulated %s frames over %s sec with a %s sec TTL." %(len(traffic), simSec, ttlSec))
+
+# Run our traffic through asDedupe on the simulated clock.
+dedupe = asDedupe(ttlSec, "ssr-", "local")
+
+startTime = time.time()
+dupes = [dedupe.seen(thisFrame, arrivalTime) for arrivalTime, thisFrame, txNum in traffic]
+runTime = time.time() - startTime
+
+falsePos, falseNeg, repeatTx = checkDupes(dupes)
+
+print("asDedupe (local): %10.0f frames/sec, %s duplicates, %s keys held at the end" %(len(traffic) / runTime, dedupe.dupeCount, dedupe.keyCount()))
+print("False positives: %s (%.4f%%), false negatives: %s, transmissions let through more than once: %s" %(falsePos, 100.0 * falsePos / len(traffic), falseNeg, repeatTx))
+
+# And on the real clock, which is how the handlers use it.
+dedupe = asDedupe(ttlSec, "ssr-", "local")
+
+startTime = time.time()
+
+for arrivalTime, thisFrame, txNum in traffic:
+    dedupe.seen(thisFrame)
+
+runTime = time.time() - startTime
+
+print("asDedupe (local, real clock): %10.0f frames/sec" %(len(traffic) / runTime))
+
+# Time the old Redis dedupe if we can.
+try:
+    dedupe = asDedupe(ttlSec, "ssrBench-", "redis", config.d1090Settings['dedupeHost'], config.d1090Settings['dedupePort'])
+    
+    startTime = time.time()
+    
+    for arrivalTime, thisFrame, txNum in traffic[0:redisFrames]:
+        dedupe.seen(thisFrame)
+    
+    runTime = time.time() - startTime
+    
+    print("asDedupe (redis): %10.0f frames/sec" %(redisFrames / runTime))
+
+except redis.ConnectionError:
+    print("asDedupe (redis): skipped, can't connect to %s:%s" %(config.d1090Settings['dedupeHost'], config.d1090Settings['dedupePort']))
+
+if (falseNeg == 0) and (repeatTx == 0):
+    print("No duplicates missed.")
+else:
+    print("Duplicates missed!")
@@ -0,0 +1,115 @@
+#!/usr/bin/python
+
+"""
+geoBatchTest by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Check airSuckUtil's numpy batch range and bearing calculations against getRange() and coords2Bearing() from one point to many points and between pairs of points, and compare their speed. Requires numpy.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+import random
+import time
+import numpy
+from libAirSuck import airSuckUtil
+
+#################
+# Configuration #
+#################
+
+# How many random positions do we check?
+randomPositions = 200000
+
+# How far off can a batch range be in km, or a batch bearing in degrees?
+tolerance = 1e-9
+
+# Where we measure one to many from. This is KPDX.
+myPos = [45.5895, -122.5951]
+
+########
+# Main #
+########
+
+asu = airSuckUtil()
+
+random.seed(360)
+
+# Random starting and ending positions.
+latA = [random.uniform(-85.0, 85.0) for i in range(0, randomPositions)]
+lonA = [random.uniform(-180.0, 180.0) for i in range(0, randomPositions)]
+latB = [random.uniform(-85.0, 85.0) for i in range(0, randomPositions)]
+lonB = [random.uniform(-180.0, 180.0) for i in range(0, randomPositions)]
+
+allGood = True
+
+def compare(name, singleResults, batchResults, wrap=False):
+    """
+    Compare results from the one at a time calculation against the batch calculation's results. If wrap is set the values are bearings and 0 and 360 are the same.
+    """
+    
+    global allGood
+    
+    bad = 0
+    
+    for i in range(0, len(singleResults)):
+        diff = abs(singleResults[i] - batchResults[i])
+        
+        if wrap:
+            diff = min(diff, 360.0 - diff)
+        
+        if diff > tolerance:
+            bad += 1
+            
+            if bad <= 10:
+                print("%s %s: single %s, batch %s" %(name, i, repr(singleResults[i]), repr(batchResults[i])))
+    
+    if bad > 0:
+        allGood = False
+    
+    print("%s: %s positions checked, %s bad" %(name, len(singleResults), bad))
+
+for name, singleMethod, batchMethod, wrap in [["getRange", asu.getRange, asu.getRangeBatch, False], ["coords2Bearing", asu.coords2Bearing, asu.coords2BearingBatch, True]]:
+    # One to many, one at a time.
+    startTime = time.time()
+    singleResults = [singleMethod(myPos, [latB[i], lonB[i]]) for i in range(0, randomPositions)]
+    singleTime = time.time() - startTime
+    
+    # And in a batch.
+    startTime = time.time()
+    batchResults = batchMethod(myPos[0], myPos[1], latB, lonB)
+    batchTime = time.time() - startTime
+    
+    compare("%sBatch (one to many)" %name, singleResults, batchResults, wrap)
+    print("Single: %10.0f positions/sec, batch: %10.0f positions/sec" %(randomPositions / singleTime, randomPositions / batchTime))
+    
+    # Pairwise, one at a time.
+    startTime = time.time()
+    singleResults = [singleMethod([latA[i], lonA[i]], [latB[i], lonB[i]]) for i in range(0, randomPositions)]
+    singleTime = time.time() - startTime
+    
+    # And in a batch, using numpy arrays this time.
+    latAArr = numpy.array(latA)
+    lonAArr = numpy.array(lonA)
+    latBArr = numpy.array(latB)
+    lonBArr = numpy.array(lonB)
+    
+    startTime = time.time()
+    batchResults = batchMethod(latAArr, lonAArr, latBArr, lonBArr)
+    batchTime = time.time() - startTime
+    
+    compare("%sBatch (pairwise)" %name, singleResults, batchResults, wrap)
+    print("Single: %10.0f pairs/sec, batch: %10.0f pairs/sec" %(randomPositions / singleTime, randomPositions / batchTime))
+
+if allGood:
+    print("All batch ranges and bearings match.")
+else:
+    print("Batch range and bearing mismatches found!")
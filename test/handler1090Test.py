@@ -0,0 +1,140 @@
+#!/usr/bin/python
+
+"""
+handler1090Test by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Make sure handler1090 only parses frames it's going to queue and keeps d1090Settings['parseCacheSize'] parsed frames. A duplicate frame caught by dedupe should never reach the parser, and once the cache is full the least recently used frame should be the one that has to be parsed again. Output goes to the local queues with nobody listening so this runs without Redis.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+import os
+import config
+
+#################
+# Configuration #
+#################
+
+# Where our corpus lives.
+testDir = os.path.dirname(os.path.abspath(__file__))
+ssrCorpus = os.path.join(testDir, "corpus", "ssrAvr.txt")
+
+# Keep everything in this process with in-memory dedupe, a small cache, and the full parse.
+config.connPub['transport'] = "local"
+config.connLocal['pubExternal'] = False
+config.d1090Settings['dedupeMode'] = "local"
+config.d1090Settings['thinConnector'] = False
+config.d1090Settings['parseCacheSize'] = 8
+
+from libAirSuck import handler1090
+
+###########
+# Helpers #
+###########
+
+def loadFrames(count):
+    """
+    Load the first count different frames from the corpus as hex strings.
+    """
+    
+    retVal = []
+    
+    with open(ssrCorpus) as corpusFile:
+        for thisLine in corpusFile:
+            thisLine = thisLine.strip()
+            
+            # Skip blank lines, comments, and MLAT data.
+            if thisLine.startswith("*"):
+                hexData = thisLine.strip("*;").lower()
+                
+                if hexData not in retVal:
+                    retVal.append(hexData)
+            
+            if len(retVal) == count:
+                break
+    
+    return retVal
+
+def send(h1090, hexData, mlat):
+    """
+    Send a frame through h1090 like dump1090ConnClt does, as MLAT data if mlat is True so it skips dedupe.
+    """
+    
+    if mlat:
+        line = "@000000000000%s;" %hexData
+    else:
+        line = "*%s;" %hexData
+    
+    h1090.handleADSBDict({'dataOrigin': 'dump1090', 'type': 'airSSR', 'dts': "2016-06-01 12:34:56.789012", 'src': "test", 'entryPoint': 'dump1090ConnClt', 'clientName': "test", 'data': line})
+
+def check(name, good, detail):
+    """
+    Print the result of a check and return whether it passed.
+    """
+    
+    if good:
+        print("%s: OK" %name)
+    else:
+        print("%s: failed, %s" %(name, detail))
+    
+    return good
+
+########
+# Main #
+########
+
+allGood = True
+cacheSize = config.d1090Settings['parseCacheSize']
+frames = loadFrames(cacheSize + 1)
+
+# A frame dedupe catches never gets as far as the parser.
+h1090 = handler1090("none")
+send(h1090, frames[0], False)
+before = h1090.parseStats()
+
+for i in range(0, 5):
+    send(h1090, frames[0], False)
+
+after = h1090.parseStats()
+allGood &= check("Dedupe hit", (before == {'frames': 1, 'parsed': 1}) and (after == before), "before %s, after %s" %(before, after))
+
+# MLAT frames skip dedupe, so a copy comes from the cache instead of being parsed again.
+h1090 = handler1090("none")
+send(h1090, frames[0], True)
+send(h1090, frames[0], True)
+stats = h1090.parseStats()
+allGood &= check("Cache hit", stats == {'frames': 2, 'parsed': 1}, "%s" %stats)
+
+# Fill the cache, then one more frame pushes out the least recently used one.
+h1090 = handler1090("none")
+
+for thisFrame in frames:
+    send(h1090, thisFrame, True)
+
+# The newest frames are still cached...
+parsed = h1090.parseStats()['parsed']
+
+for thisFrame in frames[1:]:
+    send(h1090, thisFrame, True)
+
+keptParsed = h1090.parseStats()['parsed'] - parsed
+
+# ...and the oldest one has to be parsed again.
+send(h1090, frames[0], True)
+evictParsed = h1090.parseStats()['parsed'] - parsed - keptParsed
+
+allGood &= check("LRU eviction", (parsed == cacheSize + 1) and (keptParsed == 0) and (evictParsed == 1), "parsed %s filling, %s of the newest %s again, %s of the oldest again" %(parsed, keptParsed, cacheSize, evictParsed))
+
+if allGood:
+    print("handler1090 parse cache works.")
+else:
+    print("handler1090 parse cache problems found!")
@@ -0,0 +1,80 @@
+#!/usr/bin/python
+
+"""
+identTest by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Check ssrParse's 12-bit pair table flight ID decoder against decoding one 6-bit character at a time, and compare their speed.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+import random
+import time
+from libAirSuck import ssrParse
+
+#################
+# Configuration #
+#################
+
+# How many random ident fields do we check?
+randomIDs = 100000
+
+########
+# Main #
+########
+
+# Set up our parser.
+parser = ssrParse()
+
+def refIDInfo(data):
+    """
+    Decode the flight ID one 6-bit character at a time.
+    """
+    
+    retVal = ""
+    
+    for i in range(0, 8):
+        retVal += parser.decode6BitChr(data >> (42-6*i) & 0x3F)
+    
+    return retVal.strip()
+
+random.seed(1090)
+
+# Every character pair in every position, and random ident fields.
+idents = []
+
+for i in range(0, 0x1000):
+    for shift in (0, 12, 24, 36):
+        idents.append(i << shift)
+
+for i in range(0, randomIDs):
+    idents.append(random.getrandbits(48))
+
+startTime = time.time()
+refIDs = [refIDInfo(thisID) for thisID in idents]
+refTime = time.time() - startTime
+
+startTime = time.time()
+tableIDs = [parser.getIDInfo(thisID) for thisID in idents]
+tableTime = time.time() - startTime
+
+bad = 0
+
+for i in range(0, len(idents)):
+    if refIDs[i] != tableIDs[i]:
+        bad += 1
+        print("Mismatch for %s: table %s, reference %s" %(hex(idents[i]), repr(tableIDs[i]), repr(refIDs[i])))
+
+print("%s flight IDs checked, %s bad, reference %.0f IDs/sec, table %.0f IDs/sec" %(len(idents), bad, len(idents) / refTime, len(idents) / tableTime))
+
+# Repeated IDs should be the same string object.
+print("Repeated flight ID is the same object: %s" %(parser.getIDInfo(0x1234567) is ssrParse().getIDInfo(0x1234567)))
@@ -0,0 +1,83 @@
+#!/usr/bin/python
+
+"""
+nlTableTest by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Check cprMath's NL transition table against the trig version for every latitude on a fine grid and for the floats right around each transition, then compare their speed.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+import time
+from libAirSuck import cprMath
+
+#################
+# Configuration #
+#################
+
+# Grid spacing in degrees for the sweep from -90 to 90.
+gridStep = 0.0001
+
+# How many floats on each side of each transition latitude we check.
+edgeSteps = 1000
+
+########
+# Main #
+########
+
+# Set up our decoder.
+cprDecoder = cprMath()
+
+nlTable = cprDecoder._cprMath__nl
+nlCalc = cprDecoder._cprMath__nlCalc
+
+# Latitudes to check, starting with the grid.
+lats = [(i * gridStep) - 90.0 for i in range(0, int(180.0 / gridStep) + 1)]
+
+# Add the area right around each transition on both sides of the equator. The spacing is a few ULPs.
+for transLat in cprMath._cprMath__nlTable:
+    for i in range(0 - edgeSteps, edgeSteps + 1):
+        thisLat = transLat + (i * transLat * 1e-16)
+        lats.append(thisLat)
+        lats.append(0 - thisLat)
+
+bad = 0
+
+for thisLat in lats:
+    tableVal = nlTable(thisLat)
+    refVal = nlCalc(thisLat)
+    
+    if tableVal != refVal:
+        bad += 1
+        
+        if bad <= 10:
+            print("NL(%s): table %s, reference %s" %(repr(thisLat), tableVal, refVal))
+
+print("NL: %s latitudes checked, %s bad" %(len(lats), bad))
+
+# Compare speed over the grid.
+gridLats = lats[0:int(180.0 / gridStep) + 1]
+
+for name, nlMethod in [["table", nlTable], ["trig", nlCalc]]:
+    startTime = time.time()
+    
+    for thisLat in gridLats:
+        nlMethod(thisLat)
+    
+    runTime = time.time() - startTime
+    
+    print("%-6s %10.0f lookups/sec" %(name, len(gridLats) / runTime))
+
+if bad == 0:
+    print("NL table matches.")
+else:
+    print("NL table mismatches found!")
@@ -0,0 +1,114 @@
+#!/usr/bin/python
+
+"""
+parseBatchTest by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Check the columns from ssrParse.parseBatch() against ssrParse() one frame at a time, and compare their speed. Requires numpy.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+import binascii
+import math
+import random
+import time
+from libAirSuck import ssrParse
+
+#################
+# Configuration #
+#################
+
+# How many random frames do we check?
+randomFrames = 50000
+
+# A dump1090 buffer with a mix of frames we see in normal traffic.
+someFrames = """*2610;
+*5da189a7b82d24;
+*8da15e719941be06306c00b1e7db;
+*8D75804B580FF2CF7E9BA6F701D0;
+*8D75804B580FF6B283EB7A157117;
+*8D7C6D2B2058F6B9CF9820000000;
+*8da11136e11c280000000074397e;
+*280010839b69fd;
+*20001838ca3804;
+@0000d0d1a1b28da15e719941be06306c00b1e7db;
+"""
+
+########
+# Main #
+########
+
+# Set up our parser.
+parser = ssrParse()
+
+# Columns we check and how we get the same value from ssrParse().
+def scalarVal(parsed, column):
+    """
+    Get the value we expect in column from the ssrParse() dictionary parsed.
+    """
+    
+    if column == 'aSquawkInt':
+        retVal = int(parsed['aSquawk'], 16) if 'aSquawk' in parsed else -1
+    
+    elif column == 'alt':
+        retVal = parsed['alt'] if 'alt' in parsed else None
+    
+    else:
+        retVal = parsed.get(column, -1)
+    
+    return retVal
+
+columns = ['len', 'df', 'frameCrc', 'cmpCrc', 'icaoAAInt', 'fmt', 'alt', 'aSquawkInt', 'evenOdd', 'rawLat', 'rawLon']
+
+# Make sure the buffer works.
+bufCols = parser.parseBatch(someFrames)
+print("Buffer: %s frames, DFs %s" %(len(bufCols['df']), list(bufCols['df'])))
+
+# Build random frames, with a bias toward DFs we decode.
+random.seed(1090)
+binFrames = []
+
+for i in range(0, randomFrames):
+    df = random.choice([0, 4, 5, 11, 16, 17, 18, 20, 21, 24])
+    frameLen = 7 if df in (0, 4, 5, 11) else 14
+    thisFrame = bytearray([random.randint(0, 255) for j in range(0, frameLen)])
+    thisFrame[0] = (df << 3) | (thisFrame[0] & 0x07)
+    binFrames.append(thisFrame)
+
+# Parse them one at a time.
+startTime = time.time()
+scalar = [parser.ssrParse(thisFrame) for thisFrame in binFrames]
+scalarTime = time.time() - startTime
+
+# And all at once.
+startTime = time.time()
+batch = parser.parseBatch(binFrames)
+batchTime = time.time() - startTime
+
+badCount = 0
+
+for i in range(0, len(binFrames)):
+    for column in columns:
+        expected = scalarVal(scalar[i], column)
+        got = batch[column][i]
+        
+        # Missing altitude is NaN.
+        if expected is None:
+            good = math.isnan(got)
+        else:
+            good = (got == expected)
+        
+        if not good:
+            badCount += 1
+            print("Mismatch in %s for %s: batch %s, ssrParse %s" %(column, binascii.hexlify(binFrames[i]), got, expected))
+
+print("%s frames checked, %s bad, ssrParse %.0f frames/sec, parseBatch %.0f frames/sec" %(len(binFrames), badCount, len(binFrames) / scalarTime, len(binFrames) / batchTime))
@@ -0,0 +1,291 @@
+#!/usr/bin/python
+
+"""
+pipelineBench by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Compare the single process pipeline airSuck.py runs with the connectors and state engines running as separate programs. A connector feeds MLAT frames built from test/corpus/ssrAvr.txt through handler1090 at a steady rate, and a state engine reads them with asConsumer and decodes them the way ssrStateEngine does. We time each message from when the connector got it to when the state engine decoded it, and record the peak RSS of each process. The single process run uses the "local" transport. The separate program run uses connPub['transport'], or "pubsub" if that's "local", and is skipped if the connector pub/sub Redis host in the config is down. The rest of the state engine's work is the same either way, so it's left out along with the Redis hashes it needs.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+import os
+import json
+import time
+import threading
+import redis
+import config
+from libAirSuck import asCodec
+from libAirSuck import asConsumer
+from libAirSuck import asLocalQueue
+from libAirSuck import asRedisPool
+from libAirSuck import handler1090
+from libAirSuck import ssrBatchDecoder
+from libAirSuck import ssrParse
+
+#################
+# Configuration #
+#################
+
+# Where our corpus lives.
+testDir = os.path.dirname(os.path.abspath(__file__))
+ssrCorpus = os.path.join(testDir, "corpus", "ssrAvr.txt")
+
+# How many messages do we send, and how many per second?
+msgCount = 20000
+msgRate = 4000
+
+# Use our own queue so we don't feed the real state engines, and keep the benchmark out of MongoDB.
+config.connPub['qName'] = "airSuckPipelineBench"
+config.connMongo['enabled'] = False
+config.connLocal['pubExternal'] = False
+
+# The transport we compare the local queues with.
+multiTransport = config.connPub['transport']
+
+if multiTransport == "local":
+    multiTransport = "pubsub"
+
+###########
+# Helpers #
+###########
+
+def peakRSS():
+    """
+    Get the peak RSS of this process in KB.
+    """
+    
+    retVal = 0
+    
+    with open("/proc/self/status") as statusFile:
+        for thisLine in statusFile:
+            if thisLine.startswith("VmHWM:"):
+                retVal = int(thisLine.split()[1])
+    
+    return retVal
+
+def mlatLines():
+    """
+    Build a line of dump1090 MLAT output for each message we send, so none of them get deduplicated.
+    """
+    
+    frames = []
+    
+    with open(ssrCorpus) as corpusFile:
+        for thisLine in corpusFile:
+            thisLine = thisLine.strip()
+            
+            if (thisLine != "") and not thisLine.startswith("#"):
+                frames.append(thisLine.strip("*@;"))
+    
+    return ["@%012x%s;" %(i, frames[i % len(frames)]) for i in range(0, msgCount)]
+
+def feed(h1090, lines):
+    """
+    Send lines through h1090 at msgRate messages/sec, stamping each with the time we got it. The last message tells the state engine we're done.
+    """
+    
+    startTime = time.time()
+    
+    for i in range(0, len(lines)):
+        # Wait until it's time for the next message.
+        waitSec = startTime + (float(i) / msgRate) - time.time()
+        
+        if waitSec > 0:
+            time.sleep(waitSec)
+        
+        thisEntry = {'dataOrigin': 'dump1090', 'type': 'airSSR', 'dts': str(time.time()), 'src': "bench", 'entryPoint': 'dump1090ConnClt', 'clientName': "bench", 'data': lines[i], 'benchTs': time.time(), 'benchDone': (i == len(lines) - 1)}
+        h1090.handleADSBDict(thisEntry)
+    
+    # Give the last batch time to go out.
+    time.sleep((config.connPubBatch['maxMs'] / 1000.0) * 4)
+
+def consume(results):
+    """
+    Read messages from the connector queue and decode them like ssrStateEngine does until we get the last one. The number of messages we got and their latencies in milliseconds go in the dict results.
+    """
+    
+    consumer = asConsumer([config.connPub['qName']], "pipelineBench")
+    codec = asCodec()
+    decoder = ssrBatchDecoder(ssrParse(), config.ssrStateEngine['parseCacheSize'])
+    
+    latencies = []
+    results.update({'count': 0, 'latencies': latencies})
+    
+    for workList in consumer.listenBatch():
+        msgList = [codec.decode(str(work['data'])) for work in workList]
+        decoder.decodeBatch(msgList)
+        
+        gotTime = time.time()
+        
+        for thisMsg in msgList:
+            latencies.append((gotTime - thisMsg['benchTs']) * 1000.0)
+            
+            if thisMsg['benchDone']:
+                results['count'] = len(latencies)
+                
+                return
+
+def runChild(target, *args):
+    """
+    Run target(*args) in a child process that sends us back the dict target returns. Returns [pid, pipe we read the results from].
+    """
+    
+    readFd, writeFd = os.pipe()
+    pid = os.fork()
+    
+    if pid == 0:
+        os.close(readFd)
+        
+        with os.fdopen(writeFd, "w") as resultFile:
+            resultFile.write(json.dumps(target(*args)))
+        
+        os._exit(0)
+    
+    os.close(writeFd)
+    
+    return [pid, os.fdopen(readFd)]
+
+def childResults(child):
+    """
+    Wait for a child from runChild() and get its results.
+    """
+    
+    retVal = json.loads(child[1].read())
+    child[1].close()
+    os.waitpid(child[0], 0)
+    
+    return retVal
+
+############
+# Children #
+############
+
+def idleProgram():
+    """
+    Do nothing, so we know what a program costs before it does any work.
+    """
+    
+    return {'rss': peakRSS()}
+
+def singleProcess(lines):
+    """
+    Run a connector and state engine in one process with the local queues.
+    """
+    
+    config.connPub['transport'] = "local"
+    
+    results = {}
+    reader = threading.Thread(target=consume, args=(results,))
+    reader.daemon = True
+    reader.start()
+    
+    # Give the state engine time to subscribe.
+    time.sleep(0.5)
+    
+    h1090 = handler1090("none")
+    feed(h1090, lines)
+    
+    reader.join(10.0)
+    
+    results['dropped'] = sum([stats[1] for stats in asLocalQueue().stats().values()])
+    results['rss'] = peakRSS()
+    
+    return results
+
+def stateEngine():
+    """
+    Run a state engine on its own.
+    """
+    
+    config.connPub['transport'] = multiTransport
+    
+    results = {}
+    consume(results)
+    results['rss'] = peakRSS()
+    
+    return results
+
+def connector(lines):
+    """
+    Run a connector on its own.
+    """
+    
+    config.connPub['transport'] = multiTransport
+    
+    h1090 = handler1090("none")
+    feed(h1090, lines)
+    
+    return {'rss': peakRSS()}
+
+###########
+# Reports #
+###########
+
+def latencyReport(latencies):
+    """
+    Summarize a list of latencies in milliseconds.
+    """
+    
+    latencies = sorted(latencies)
+    
+    if len(latencies) == 0:
+        return "no messages"
+    
+    return "median %6.2f ms, 99%% %6.2f ms, max %6.2f ms" %(latencies[len(latencies) / 2], latencies[int(0.99 * (len(latencies) - 1))], latencies[-1])
+
+########
+# Main #
+########
+
+allGood = True
+lines = mlatLines()
+
+print("Sending %s messages at %s msgs/sec, batches of %s messages or %s ms." %(msgCount, msgRate, config.connPubBatch['maxMsgs'], config.connPubBatch['maxMs']))
+
+idle = childResults(runChild(idleProgram))
+
+# Everything in one process.
+single = childResults(runChild(singleProcess, lines))
+
+if (single['count'] != msgCount) or (single['dropped'] > 0):
+    allGood = False
+
+print("Single process (local): %s, %s/%s messages, %s dropped, peak RSS %s KB" %(latencyReport(single['latencies']), single['count'], msgCount, single['dropped'], single['rss']))
+
+# Separate programs if we can.
+try:
+    asRedisPool().getRedis(config.connPub['host'], config.connPub['port']).ping()
+    
+    reader = runChild(stateEngine)
+    
+    # Give the state engine time to subscribe.
+    time.sleep(1.0)
+    
+    writer = runChild(connector, lines)
+    
+    connResults = childResults(writer)
+    stateResults = childResults(reader)
+    
+    print("Separate programs (%s): %s, %s/%s messages, peak RSS %s KB connector + %s KB state engine" %(multiTransport, latencyReport(stateResults['latencies']), stateResults['count'], msgCount, connResults['rss'], stateResults['rss']))
+    
+    # Clean up the stream if we made one.
+    asRedisPool().getRedis(config.connPub['host'], config.connPub['port']).delete(config.connPub['qName'])
+
+except redis.ConnectionError:
+    print("Separate programs (%s): skipped, can't connect to %s:%s" %(multiTransport, config.connPub['host'], config.connPub['port']))
+
+print("An idle program with libAirSuck loaded peaks at %s KB RSS, and a full install runs up to 8 Python programs under supervisor." %idle['rss'])
+
+if allGood:
+    print("Pipeline works.")
+else:
+    print("Pipeline problems found!")
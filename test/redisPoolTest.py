@@ -0,0 +1,99 @@
+#!/usr/bin/python
+
+"""
+redisPoolTest by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Make sure asRedisPool hands out clients that share one connection pool per Redis server and database, and that the settings in redisConn end up on the connections. If the connector pub/sub Redis host in the config is up we also compare the time for a round trip through a new client every time against one through asRedisPool, and over its Unix domain socket if redisConn['unixSockets'] has one for it.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+import time
+import redis
+import config
+from libAirSuck import asRedisPool
+
+#################
+# Configuration #
+#################
+
+# How many round trips do we time?
+pings = 5000
+
+########
+# Main #
+########
+
+allGood = True
+
+redisPool = asRedisPool()
+
+# Clients for the same server and database should share a pool, even from different asRedisPool objects.
+clientA = redisPool.getRedis(config.connPub['host'], config.connPub['port'])
+clientB = asRedisPool().getRedis(config.connPub['host'], config.connPub['port'])
+clientC = redisPool.getRedis(config.connPub['host'], config.connPub['port'], 1)
+
+if clientA.connection_pool is not clientB.connection_pool:
+    allGood = False
+    print("Clients for the same server got different pools.")
+
+if clientA.connection_pool is clientC.connection_pool:
+    allGood = False
+    print("Clients for different databases got the same pool.")
+
+# Make sure our settings made it to the connections.
+connArgs = clientA.connection_pool.connection_kwargs
+socketPath = config.redisConn['unixSockets'].get("%s:%s" %(config.connPub['host'], config.connPub['port']))
+
+if socketPath is not None:
+    if (clientA.connection_pool.connection_class is not redis.UnixDomainSocketConnection) or (connArgs['path'] != socketPath):
+        allGood = False
+        print("Unix domain socket not used: %s" %connArgs)
+
+else:
+    if (connArgs['socket_keepalive'] != config.redisConn['keepAlive']) or (connArgs['socket_connect_timeout'] != config.redisConn['connectTimeoutSec']):
+        allGood = False
+        print("TCP settings not used: %s" %connArgs)
+
+if connArgs['socket_timeout'] != config.redisConn['timeoutSec']:
+    allGood = False
+    print("Timeout not used: %s" %connArgs)
+
+print("%s pools for 3 clients" %redisPool.poolCount())
+
+# Time round trips if we can.
+try:
+    startTime = time.time()
+    
+    for i in range(0, pings):
+        redis.StrictRedis(host=config.connPub['host'], port=config.connPub['port']).ping()
+    
+    runTime = time.time() - startTime
+    
+    print("New client every time: %8.1f usec/ping" %(runTime * 1000000 / pings))
+    
+    startTime = time.time()
+    
+    for i in range(0, pings):
+        redisPool.getRedis(config.connPub['host'], config.connPub['port']).ping()
+    
+    runTime = time.time() - startTime
+    
+    print("asRedisPool:           %8.1f usec/ping, %s connections open" %(runTime * 1000000 / pings, len(clientA.connection_pool._available_connections)))
+
+except redis.ConnectionError:
+    print("Round trips skipped, can't connect to %s:%s" %(config.connPub['host'], config.connPub['port']))
+
+if allGood:
+    print("Pools look good.")
+else:
+    print("Pool problems found!")
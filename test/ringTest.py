@@ -0,0 +1,182 @@
+#!/usr/bin/python
+
+"""
+ringTest by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Check asRing with connector messages built from test/corpus/ssrAvr.txt: everything written comes back out the same, readers that fall behind count what they lost as overruns, and messages too big for a slot are refused. Then time a writer process and a reader process going through a ring the size set in connRing, and make sure every message the reader got is intact and in order.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+import os
+import shutil
+import tempfile
+import time
+import zlib
+import config
+from libAirSuck import asCodec
+from libAirSuck import asRing
+
+#################
+# Configuration #
+#################
+
+# Where our corpus lives.
+testDir = os.path.dirname(os.path.abspath(__file__))
+ssrCorpus = os.path.join(testDir, "corpus", "ssrAvr.txt")
+
+# How many slots do we use for the small ring?
+smallSlots = 64
+
+# How many messages does the writer process send?
+procMsgs = 500000
+
+############
+# Messages #
+############
+
+def ssrMessages():
+    """
+    Build thin connector messages from the SSR corpus.
+    """
+    
+    retVal = []
+    codec = asCodec(config.connPub['msgFormat'])
+    
+    with open(ssrCorpus) as corpusFile:
+        for thisLine in corpusFile:
+            thisLine = thisLine.strip()
+            
+            if (thisLine != "") and not thisLine.startswith("#"):
+                thisMsg = {'dataOrigin': 'dump1090', 'type': 'airSSR', 'dts': "2016-06-01 12:34:56.789012", 'src': "kpdx1", 'entryPoint': 'dump1090ConnClt', 'clientName': "dump1090-1", 'data': thisLine.strip("*@;").lower()}
+                retVal.append(codec.encode(thisMsg))
+    
+    return retVal
+
+def readAll(ring, maxMsgs):
+    """
+    Read from ring until it's empty.
+    """
+    
+    retVal = []
+    msgs = ring.read(maxMsgs)
+    
+    while len(msgs) > 0:
+        retVal.extend(msgs)
+        msgs = ring.read(maxMsgs)
+    
+    return retVal
+
+########
+# Main #
+########
+
+allGood = True
+ringDir = tempfile.mkdtemp()
+messages = ssrMessages()
+
+try:
+    # Everything we write in pieces smaller than the ring should come back.
+    writer = asRing(os.path.join(ringDir, "small.ring"), True, smallSlots, config.connRing['slotSize'])
+    reader = asRing(os.path.join(ringDir, "small.ring"))
+    got = []
+    
+    for i in range(0, len(messages), smallSlots / 2):
+        for thisMsg in messages[i:i + (smallSlots / 2)]:
+            writer.write(thisMsg)
+        
+        got.extend(readAll(reader, 10))
+    
+    if (got != messages) or (reader.overrunCount != 0):
+        allGood = False
+    
+    print("Wrote %s messages, read %s, %s match, %s overruns" %(writer.writeCount, reader.readCount, len([i for i in range(0, min(len(got), len(messages))) if got[i] == messages[i]]), reader.overrunCount))
+    
+    # A reader that falls more than a ring behind loses the oldest messages.
+    lateMsgs = messages[0:(smallSlots * 3) + 5]
+    
+    for thisMsg in lateMsgs:
+        writer.write(thisMsg)
+    
+    got = readAll(reader, 10)
+    
+    if (got != lateMsgs[-smallSlots:]) or (reader.overrunCount != (smallSlots * 2) + 5):
+        allGood = False
+    
+    print("Fell %s messages behind, read %s, %s overruns" %(len(lateMsgs), len(got), reader.overrunCount))
+    
+    # Messages that don't fit get refused.
+    if writer.write("X" * config.connRing['slotSize']) or (writer.tooBigCount != 1):
+        allGood = False
+    
+    print("%s messages too big for a slot" %writer.tooBigCount)
+    
+    writer.close()
+    reader.close()
+    
+    # Time a writer process and a reader process. Each message gets its number and a CRC so we can check it.
+    ringPath = os.path.join(ringDir, "proc.ring")
+    writer = asRing(ringPath, True, config.connRing['slots'], config.connRing['slotSize'])
+    reader = asRing(ringPath)
+    
+    startTime = time.time()
+    pid = os.fork()
+    
+    if pid == 0:
+        for i in range(0, procMsgs):
+            thisMsg = messages[i % len(messages)]
+            writer.write("%s %s %s" %(i, zlib.crc32(thisMsg), thisMsg))
+        
+        os._exit(0)
+    
+    lastNum = -1
+    bad = 0
+    writerDone = False
+    
+    while True:
+        msgs = reader.read(config.connPub['streamBatch'])
+        
+        # Once the writer is done and we've read everything we're done.
+        if len(msgs) == 0:
+            if writerDone:
+                break
+            
+            writerDone = (os.waitpid(pid, os.WNOHANG)[0] == pid)
+            
+            if not writerDone:
+                time.sleep(config.connRing['pollMs'] / 1000.0)
+        
+        for thisMsg in msgs:
+            msgNum, msgCrc, msgData = thisMsg.split(" ", 2)
+            
+            if (int(msgNum) <= lastNum) or (int(msgCrc) != zlib.crc32(msgData)):
+                bad += 1
+            
+            lastNum = int(msgNum)
+    
+    runTime = time.time() - startTime
+    
+    if (bad > 0) or ((reader.readCount + reader.overrunCount) != procMsgs):
+        allGood = False
+    
+    print("Two processes: %s messages, %s read, %s overruns, %s bad, %.0f msgs/sec" %(procMsgs, reader.readCount, reader.overrunCount, bad, procMsgs / runTime))
+    
+    reader.close()
+    writer.close()
+
+finally:
+    shutil.rmtree(ringDir)
+
+if allGood:
+    print("Ring works.")
+else:
+    print("Ring problems found!")
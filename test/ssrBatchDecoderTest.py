@@ -0,0 +1,152 @@
+#!/usr/bin/python
+
+"""
+ssrBatchDecoderTest by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Hammer one ssrBatchDecoder from several threads the way the dataSource threads share handler1090's, using frames from test/corpus/ssrAvr.txt and a parse cache smaller than the set of frames so it keeps evicting. Every thread should get the same fields we get parsing each frame without a cache, and nothing should blow up. Also make sure extended squitters with a bad CRC only get their header fields unless we ask for the full decode, while good ones always get the full decode.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+import binascii
+import os
+import random
+import threading
+from libAirSuck import ssrParse
+from libAirSuck import ssrBatchDecoder
+
+#################
+# Configuration #
+#################
+
+# Where our corpus lives.
+testDir = os.path.dirname(os.path.abspath(__file__))
+ssrCorpus = os.path.join(testDir, "corpus", "ssrAvr.txt")
+
+# How many threads, how many frames do they share, how big is the cache, and how many frames does each thread parse?
+threadCount = 6
+frameCount = 200
+cacheSize = 64
+parsesPerThread = 20000
+
+# DF17 airborne position with a good CRC, and header fields a bad CRC copy should get.
+goodFrame = "8D75804B580FF2CF7E9BA6F701D0"
+headerFields = set(['len', 'mode', 'df', 'frameCrc', 'cmpCrc', 'icaoAAHx', 'icaoAAInt', 'fmt'])
+
+###########
+# Helpers #
+###########
+
+def loadFrames():
+    """
+    Load the first frameCount frames from the corpus as bytearrays.
+    """
+    
+    retVal = []
+    
+    with open(ssrCorpus) as corpusFile:
+        for thisLine in corpusFile:
+            thisLine = thisLine.strip()
+            
+            # Skip blank lines, comments, and MLAT data.
+            if thisLine.startswith("*"):
+                retVal.append(bytearray(binascii.unhexlify(thisLine.strip("*;"))))
+            
+            if len(retVal) == frameCount:
+                break
+    
+    return retVal
+
+def worker(threadNum, decoder, frames, expected, errors):
+    """
+    Parse random frames with decoder and make sure we get the expected fields, adding anything that goes wrong to errors.
+    """
+    
+    rng = random.Random(threadNum)
+    
+    try:
+        for i in range(0, parsesPerThread):
+            frameNum = rng.randrange(0, len(frames))
+            
+            if decoder.parseFrame(frames[frameNum]) != expected[frameNum]:
+                errors.append("Thread %s got the wrong fields for %s" %(threadNum, binascii.hexlify(frames[frameNum])))
+    
+    except Exception as e:
+        errors.append("Thread %s: %s" %(threadNum, repr(e)))
+
+def check(name, good, detail):
+    """
+    Print the result of a check and return whether it passed.
+    """
+    
+    if good:
+        print("%s: OK" %name)
+    else:
+        print("%s: failed, %s" %(name, detail))
+    
+    return good
+
+########
+# Main #
+########
+
+# Switch threads as often as we can so they step on each other.
+sys.setcheckinterval(1)
+
+frames = loadFrames()
+
+# Parse each frame without a cache so we know what to expect.
+expected = [ssrBatchDecoder(ssrParse(), 0).parseFrame(thisFrame) for thisFrame in frames]
+
+decoder = ssrBatchDecoder(ssrParse(), cacheSize)
+errors = []
+
+threads = [threading.Thread(target=worker, args=(i, decoder, frames, expected, errors)) for i in range(0, threadCount)]
+
+for thisThread in threads:
+    thisThread.start()
+
+for thisThread in threads:
+    thisThread.join()
+
+for thisError in errors[:10]:
+    print(thisError)
+
+print("%s threads parsed %s frames (%s unique) with a %s frame cache: %s parsed, %s errors" %(threadCount, decoder.frameCount, len(frames), cacheSize, decoder.parseCount, len(errors)))
+allGood = check("Parse cache with threads", (len(errors) == 0) and (decoder.frameCount == threadCount * parsesPerThread), "%s errors" %len(errors))
+
+# Flip a few bits in the position so CRC correction couldn't fix it even if it was on.
+good = bytearray(binascii.unhexlify(goodFrame))
+bad = bytearray(good)
+bad[6] ^= 0x40
+bad[8] ^= 0x10
+bad[9] ^= 0x02
+
+fullGood = ssrParse().ssrParse(good)
+fullBad = ssrParse().ssrParse(bad)
+
+# By default a bad CRC gets the header fields and nothing else, and a good CRC gets everything.
+decoder = ssrBatchDecoder(ssrParse(), cacheSize)
+parsedGood = decoder.parseFrame(good)
+parsedBad = decoder.parseFrame(bad)
+allGood &= check("Bad CRC header only", (fullBad['frameCrc'] != fullBad['cmpCrc']) and (set(parsedBad.keys()) == headerFields) and (parsedGood == fullGood) and ('rawLat' in parsedGood), "bad CRC got %s, good CRC got %s" %(sorted(parsedBad.keys()), sorted(parsedGood.keys())))
+
+# Or we can decode bad CRCs fully like we used to.
+decoder = ssrBatchDecoder(ssrParse(), cacheSize, False)
+parsedGood = decoder.parseFrame(good)
+parsedBad = decoder.parseFrame(bad)
+allGood &= check("Bad CRC full decode", (parsedBad == fullBad) and ('rawLat' in parsedBad) and (parsedGood == fullGood), "bad CRC got %s" %sorted(parsedBad.keys()))
+
+if allGood:
+    print("ssrBatchDecoder works.")
+else:
+    print("ssrBatchDecoder problems found!")
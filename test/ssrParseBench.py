@@ -0,0 +1,99 @@
+#!/usr/bin/python
+
+"""
+ssrParseBench by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Compare the speed and size of ssrParse's dictionary output against the compact ssrFrame record and the lazy header-only decoder. Each method is timed several times taking turns with the others and we keep its best time, since a single run of one method after another swings by 20% or more from one run to the next.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+import binascii
+import time
+from libAirSuck import ssrParse
+
+#################
+# Configuration #
+#################
+
+# How many times do we run through our frames each round, and how many rounds do we time?
+passes = 20000
+rounds = 5
+
+# A mix of frames we see in normal traffic.
+someFrames = [
+    "2610", # Mode A Squawk 2610/ Mode C altitude 13300 ft.
+    "5da189a7b82d24", # DF11 All-call relpy.
+    "8da15e719941be06306c00b1e7db", # DF17, airborne veloicty
+    "8D75804B580FF2CF7E9BA6F701D0", # DF17, airborne position, even formation
+    "8D75804B580FF6B283EB7A157117", # DF17, airborne position, odd formation
+    "8D7C6D2B2058F6B9CF9820000000", # DF17, aircraft ID and category info, bad CRC
+    "8da11136e11c280000000074397e", # DF17, ES Should squawk 1330
+    "280010839b69fd", # DF 5, unknown squawk
+    "20001838ca3804" # DF 4, altitude
+]
+
+########
+# Main #
+########
+
+# Convert our frames to byte arrays once so we only measure decoding.
+binFrames = [bytearray(binascii.unhexlify(thisFrame)) for thisFrame in someFrames]
+frameCount = passes * len(binFrames)
+
+# Set up our parser.
+parser = ssrParse()
+
+def timeBench(decoder):
+    """
+    Decode all frames passes times with decoder and return how long it took.
+    """
+    
+    startTime = time.time()
+    
+    for i in range(0, passes):
+        for thisFrame in binFrames:
+            decoder(thisFrame)
+    
+    return time.time() - startTime
+
+def sizeBench(decoder):
+    """
+    Get the average size in bytes of the result container decoder returns for each of our frames so we can see what we hold on to per frame.
+    """
+    
+    totalBytes = 0
+    
+    for thisFrame in binFrames:
+        totalBytes += sys.getsizeof(decoder(thisFrame))
+    
+    return float(totalBytes) / len(binFrames)
+
+methods = [
+    ["ssrParse (dict)", parser.ssrParse],
+    ["ssrParseFrame", parser.ssrParseFrame],
+    ["ssrParseLazy (hdr)", parser.ssrParseLazy],
+    ["ssrParseLazy (full)", lambda thisFrame: parser.ssrParseLazy(thisFrame).toDict()]
+]
+
+print("Decoding %s frames per method, best of %s rounds..." %(frameCount, rounds))
+bestTimes = [None] * len(methods)
+
+for i in range(0, rounds):
+    for j in range(0, len(methods)):
+        runTime = timeBench(methods[j][1])
+        
+        if (bestTimes[j] is None) or (runTime < bestTimes[j]):
+            bestTimes[j] = runTime
+
+for j in range(0, len(methods)):
+    print("%-18s %10.0f frames/sec %6.0f bytes/frame" %(methods[j][0], frameCount / bestTimes[j], sizeBench(methods[j][1])))
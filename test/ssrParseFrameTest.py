@@ -0,0 +1,136 @@
+#!/usr/bin/python
+
+"""
+ssrParseFrameTest by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Make sure ssrParseFrame() and ssrParseLazy() records turn into the same dictionary ssrParse() returns for every frame in the test corpus with and without field names, and that airborne positions get the right NUC for each type code, including NUC 0 for type code 22.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+import binascii
+import os
+from libAirSuck import ssrParse
+
+#################
+# Configuration #
+#################
+
+# Where our corpus lives.
+testDir = os.path.dirname(os.path.abspath(__file__))
+ssrCorpus = os.path.join(testDir, "corpus", "ssrAvr.txt")
+
+# DF17 airborne position we change the type code of.
+airbornePos = "8D75804B580FF2CF7E9BA6F701D0"
+
+###########
+# Helpers #
+###########
+
+def loadFrames():
+    """
+    Load every frame in the corpus as a bytearray, dropping the MLAT timestamp from MLAT frames.
+    """
+    
+    retVal = []
+    
+    with open(ssrCorpus) as corpusFile:
+        for thisLine in corpusFile:
+            thisLine = thisLine.strip()
+            
+            # Skip blank lines and comments.
+            if thisLine.startswith("@"):
+                retVal.append(bytearray(binascii.unhexlify(thisLine[13:].strip(";"))))
+            elif thisLine.startswith("*"):
+                retVal.append(bytearray(binascii.unhexlify(thisLine.strip("*;"))))
+    
+    return retVal
+
+def withTypeCode(hexData, fmt):
+    """
+    Set the type code of an extended squitter to fmt and give it a good CRC.
+    """
+    
+    retVal = bytearray(binascii.unhexlify(hexData))
+    retVal[4] = (fmt << 3) | (retVal[4] & 0x07)
+    
+    crc = parser.getCrc(retVal[0:-3])
+    retVal[-3] = (crc >> 16) & 0xff
+    retVal[-2] = (crc >> 8) & 0xff
+    retVal[-1] = crc & 0xff
+    
+    return retVal
+
+def check(name, good, detail):
+    """
+    Print the result of a check and return whether it passed.
+    """
+    
+    if good:
+        print("%s: OK" %name)
+    else:
+        print("%s: failed, %s" %(name, detail))
+    
+    return good
+
+########
+# Main #
+########
+
+allGood = True
+parser = ssrParse()
+frames = loadFrames()
+
+# Every output format should give the same fields.
+for decodeNames in (True, False):
+    parser.setReturnNames(decodeNames)
+    frameBad = 0
+    lazyBad = 0
+    
+    for thisFrame in frames:
+        expect = parser.ssrParse(thisFrame)
+        
+        if parser.ssrParseFrame(thisFrame).toDict() != expect:
+            frameBad += 1
+        
+        if parser.ssrParseLazy(thisFrame).toDict() != expect:
+            lazyBad += 1
+    
+    nameStr = ["without", "with"][decodeNames]
+    allGood &= check("ssrParseFrame matches ssrParse %s names" %nameStr, (len(frames) > 0) and (frameBad == 0), "%s of %s frames differ" %(frameBad, len(frames)))
+    allGood &= check("ssrParseLazy matches ssrParse %s names" %nameStr, (len(frames) > 0) and (lazyBad == 0), "%s of %s frames differ" %(lazyBad, len(frames)))
+
+parser.setReturnNames(True)
+
+# Barometric positions have NUC 18 - TC, GNSS positions have NUC 29 - TC, and TC 22 has NUC 0.
+nucBad = []
+
+for fmt in range(9, 19) + range(20, 23):
+    if fmt <= 18:
+        expect = 18 - fmt
+    elif fmt <= 21:
+        expect = 29 - fmt
+    else:
+        expect = 0
+    
+    for decoder in (parser.ssrParse, parser.ssrParseFrame):
+        decoded = decoder(withTypeCode(airbornePos, fmt))
+        
+        if (decoded['fmt'] != fmt) or (decoded['nxc'] != expect):
+            nucBad.append([fmt, decoded['fmt'], decoded['nxc']])
+
+allGood &= check("Airborne position NUC", len(nucBad) == 0, "[type code, decoded type code, NUC] %s" %nucBad)
+
+if allGood:
+    print("ssrParse output formats work.")
+else:
+    print("ssrParse output format problems found!")
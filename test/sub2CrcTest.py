@@ -28,6 +28,7 @@ import threading
 import binascii
 from pprint import pprint
 from libAirSuck import ssrParse
+from libAirSuck import asCodec
 
 #################
 # Configuration #
@@ -51,6 +52,7 @@ class SubListener(threading.Thread):
         self.redis = r
         self.pubsub = self.redis.pubsub()
         self.pubsub.subscribe(channels)
+        self.__codec = asCodec()
     
     def crcInt2Hex(self, crcInt):
         """
@@ -67,7 +69,7 @@ class SubListener(threading.Thread):
         ssrJson = str(work['data'])
         
         # Get wrapped SSR data.
-        ssrWrapped = json.loads(ssrJson)
+        ssrWrapped = self.__codec.decode(ssrJson)
         
         # Make sure we got good data from json.loads
         if (type(ssrWrapped) == dict):
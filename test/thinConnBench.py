@@ -0,0 +1,198 @@
+#!/usr/bin/python
+
+"""
+thinConnBench by ThreeSixes (https://github.com/ThreeSixes)
+
+This project is licensed under GPLv3. See COPYING for dtails.
+
+This file is part of the airSuck project (https://github.com/ThreeSixes/airSUck).
+
+Compare full and thin connectors (d1090Settings['thinConnector']) using the frames in test/corpus/ssrAvr.txt heard by several simulated receivers. Full connectors parse every frame they hear and the state engine just decodes the messages. Thin connectors send the raw frame and the state engine parses it in batches like it does with connPub['streamBatch']. We print message size and the CPU time spent on each side per message, and make sure the state engine ends up with the same messages either way.
+"""
+
+############
+# Imports. #
+############
+
+import sys
+sys.path.append("..")
+
+import binascii
+import os
+import random
+import time
+import config
+from libAirSuck import asCodec
+from libAirSuck import ssrParse
+from libAirSuck import ssrBatchDecoder
+
+#################
+# Configuration #
+#################
+
+# Where our corpus lives.
+benchDir = os.path.dirname(os.path.abspath(__file__))
+ssrCorpus = os.path.join(benchDir, "corpus", "ssrAvr.txt")
+
+# How many receivers are there, and how many of them hear each frame?
+receivers = 4
+maxHeard = 3
+
+# How many times do we go through the corpus?
+passes = 10
+
+# How many messages does the state engine take at a time?
+batchSize = config.connPub['streamBatch']
+
+###########
+# Traffic #
+###########
+
+def loadSSR(fileName):
+    """
+    Load AVR formatted frames (*hex; or @mlathex;) from fileName.
+    
+    Returns a list of [hex frame, MLAT data or None].
+    """
+    
+    retVal = []
+    
+    with open(fileName) as corpusFile:
+        for thisLine in corpusFile:
+            thisLine = thisLine.strip()
+            
+            # Skip blank lines and comments.
+            if (thisLine == "") or thisLine.startswith("#"):
+                continue
+            
+            hexData = thisLine.strip("*@;").lower()
+            
+            if thisLine.startswith("@"):
+                retVal.append([hexData[12:], hexData[0:12]])
+            else:
+                retVal.append([hexData, None])
+    
+    return retVal
+
+def buildTraffic(frames):
+    """
+    Build a list of traffic for each receiver. Each entry is [hex frame, MLAT data or None].
+    """
+    
+    retVal = [[] for i in range(0, receivers)]
+    
+    for i in range(0, passes):
+        for thisFrame in frames:
+            for thisRx in random.sample(range(0, receivers), random.randint(1, maxHeard)):
+                retVal[thisRx].append(thisFrame)
+    
+    return retVal
+
+def newParser():
+    """
+    Get an SSR parser set up like a connector's.
+    """
+    
+    retVal = ssrParse()
+    retVal.setCrcFixBits(config.d1090Settings['crcFixBits'])
+    
+    return retVal
+
+##############
+# Connectors #
+##############
+
+def runConnector(rxNum, traffic, codec, thin):
+    """
+    Build and encode the messages one connector sends for its traffic like handler1090 does. Returns a list of encoded messages.
+    """
+    
+    retVal = []
+    decoder = ssrBatchDecoder(newParser(), config.d1090Settings['parseCacheSize'])
+    clientName = "dump1090-%s" %rxNum
+    
+    for hexData, mlatData in traffic:
+        thisMsg = {'dataOrigin': 'dump1090', 'type': 'airSSR', 'dts': "2016-06-01 12:34:56.789012", 'src': "rx%s" %rxNum, 'entryPoint': 'dump1090ConnClt', 'clientName': clientName, 'data': hexData}
+        
+        if mlatData is not None:
+            thisMsg['mlatData'] = mlatData
+        
+        if not thin:
+            thisMsg.update(decoder.parseFrame(bytearray(binascii.unhexlify(hexData))))
+        
+        retVal.append(codec.encode(thisMsg))
+    
+    return retVal
+
+def runStateEngine(encMsgs, codec):
+    """
+    Decode messages and parse frames from thin connectors in batches like ssrStateEngine does. Returns a list of messages.
+    """
+    
+    retVal = []
+    decoder = ssrBatchDecoder(newParser(), config.ssrStateEngine['parseCacheSize'])
+    
+    for i in range(0, len(encMsgs), batchSize):
+        batch = [codec.decode(thisMsg) for thisMsg in encMsgs[i:i + batchSize]]
+        decoder.decodeBatch(batch)
+        retVal.extend(batch)
+    
+    return retVal
+
+########
+# Main #
+########
+
+random.seed(1090)
+
+traffic = buildTraffic(loadSSR(ssrCorpus))
+msgCount = sum([len(rxTraffic) for rxTraffic in traffic])
+
+print("%s messages from %s receivers, state engine batches of %s." %(msgCount, receivers, batchSize))
+
+allGood = True
+
+for msgFormat in ("json", "binary"):
+    codec = asCodec(msgFormat)
+    results = {}
+    
+    for modeName, thin in [["full", False], ["thin", True]]:
+        # Run each connector, then put their messages together in the order the state engine might see them.
+        startTime = time.time()
+        connMsgs = [runConnector(i, traffic[i], codec, thin) for i in range(0, receivers)]
+        connTime = time.time() - startTime
+        
+        encMsgs = []
+        
+        for i in range(0, max([len(thisConn) for thisConn in connMsgs])):
+            for thisConn in connMsgs:
+                if i < len(thisConn):
+                    encMsgs.append(thisConn[i])
+        
+        startTime = time.time()
+        results[modeName] = runStateEngine(encMsgs, codec)
+        engineTime = time.time() - startTime
+        
+        avgSize = sum([len(thisMsg) for thisMsg in encMsgs]) / float(len(encMsgs))
+        
+        print("%-6s %s: %6.1f bytes/msg, connectors %5.1f usec/msg, state engine %5.1f usec/msg, total %5.1f usec/msg" %(msgFormat, modeName, avgSize, connTime * 1000000 / msgCount, engineTime * 1000000 / msgCount, (connTime + engineTime) * 1000000 / msgCount))
+    
+    # Compare what the state engine got.
+    bad = 0
+    
+    for i in range(0, msgCount):
+        if results['full'][i] != results['thin'][i]:
+            bad += 1
+            
+            if bad <= 10:
+                print("Full: %s\nThin: %s" %(results['full'][i], results['thin'][i]))
+    
+    if bad > 0:
+        allGood = False
+    
+    print("%-6s %s messages compared, %s different" %(msgFormat, msgCount, bad))
+
+if allGood:
+    print("Thin connector messages match.")
+else:
+    print("Thin connector message mismatches found!")